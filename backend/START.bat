@@ -28,7 +28,7 @@ REM Run the Flask app with auto-install
 echo Starting backend server with auto-dependency installation...
 echo.
 
-python run.py
+python run.py --install
 
 if errorlevel 1 (
     echo.
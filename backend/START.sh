@@ -27,7 +27,7 @@ echo "Starting backend server with auto-dependency installation..."
 echo ""
 
 cd "$(dirname "$0")"
-python3 run.py
+python3 run.py --install
 
 if [ $? -ne 0 ]; then
     echo ""
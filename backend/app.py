@@ -2,17 +2,16 @@
 # FLASK APPLICATION BOOTSTRAP
 # ========================
 
-# Auto-install dependencies on first run
-try:
-    from auto_install import install_dependencies, check_imports
-    print("Initializing environment...")
-    install_dependencies()
-    check_imports()
-except Exception as e:
-    print(f"Warning: Could not auto-install dependencies: {e}")
-    print("Please run: pip install -r requirement1.txt")
-
-from flask import Flask
+import time
+_startup_began = time.perf_counter()
+
+# Startup never runs pip; install with `python run.py --install`
+from auto_install import STAMP_FILE, check_imports, dependencies_current
+check_imports(verbose=False)
+if STAMP_FILE.exists() and not dependencies_current():
+    print("[WARNING] requirement1.txt changed since the last install. Run: python run.py --install")
+
+from flask import Flask, jsonify, request
 from flask_cors import CORS
 import os
 
@@ -20,6 +19,17 @@ import os
 app = Flask(__name__)
 CORS(app)
 
+# Largest request body accepted, here and by asgi.py; a full batch of
+# postings is well under the default
+app.config['MAX_CONTENT_LENGTH'] = int(os.getenv('MAX_CONTENT_LENGTH') or 16 * 1024 * 1024)
+BODY_TOO_LARGE = '413 Request Entity Too Large: The data value transmitted exceeds the capacity limit.'
+
+@app.before_request
+def reject_large_body():
+    # The routes turn every exception into a 500, so refuse before them
+    if (request.content_length or 0) > app.config['MAX_CONTENT_LENGTH']:
+        return jsonify({'error': BODY_TOO_LARGE}), 413
+
 # Register blueprints
 from routes.credibility_routes import credibility_bp
 from routes.sentiment_routes import sentiment_bp
@@ -27,9 +37,26 @@ from routes.sentiment_routes import sentiment_bp
 app.register_blueprint(credibility_bp, url_prefix='/api')
 app.register_blueprint(sentiment_bp, url_prefix='/api')
 
+# Start loading validation datasets in the background at startup, so the
+# first request neither waits for nor triggers the downloads
+from services.dataset_validator import get_dataset_validator
+from services.service_registry import registry
+from services.cse_budget import get_cse_budget
+registry.get('dataset_validator')
+
+STARTUP_MS = (time.perf_counter() - _startup_began) * 1000
+print(f"[INFO] App initialized in {STARTUP_MS:.0f} ms")
+
 @app.route('/health')
 def health_check():
-    return {'status': 'healthy', 'service': 'Internship Credibility API'}, 200
+    return {
+        'status': 'healthy',
+        'service': 'Internship Credibility API',
+        'startup_ms': round(STARTUP_MS, 1),
+        'datasets': get_dataset_validator().readiness(),
+        'services': registry.report(),
+        'google_cse': get_cse_budget().report()
+    }, 200
 
 if __name__ == '__main__':
     # Debug off and reloader disabled to prevent double-starts in subprocesses
@@ -0,0 +1,327 @@
+# ========================
+# ASGI APPLICATION
+# The credibility API for an async server: `uvicorn asgi:application`,
+# or `python run.py --prod --concurrency async`
+# ========================
+
+import asyncio
+import io
+import json
+import os
+import sys
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+from urllib.parse import parse_qs
+
+from app import BODY_TOO_LARGE, app as flask_app
+from routes import credibility_routes, sentiment_routes
+from routes.credibility_routes import batch_error, company_name_error, fill_job_description, wants_stream
+from services.async_http import close_async_client
+from services.cse_budget import BudgetDenied
+
+Send = Callable[[dict], Awaitable[None]]
+
+
+class RequestError(Exception):
+    """A body that request.get_json() would also have rejected"""
+
+
+class BodyTooLarge(RequestError):
+    """A body over the Flask app's MAX_CONTENT_LENGTH"""
+
+
+class CredibilityASGI:
+    """
+    Purpose: Serve the Flask app's endpoints from an ASGI server
+    Allowed: Routing, request/response framing, executor hand-off
+    Forbidden: Validation rules, scoring, loading models or datasets
+
+    The endpoints that wait on Google CSE and website probes are handled
+    here: POST /api/verify_company, /api/find_company_website, /api/predict
+    and /api/predict_batch. Their network I/O is awaited on the event loop,
+    so a slow verification holds a coroutine rather than a thread; their
+    CPU work runs on cpu_executor. Every other request is passed to the
+    Flask app on cpu_executor, so those responses are the WSGI servers'.
+    """
+
+    def __init__(self, wsgi_app, cpu_workers: int):
+        """
+        Args:
+            wsgi_app: The Flask app
+            cpu_workers: Threads for inference and Flask requests
+        """
+        self.wsgi_app = wsgi_app
+        self.cpu_executor = ThreadPoolExecutor(max_workers=cpu_workers, thread_name_prefix='asgi-cpu')
+        self.routes: Dict[str, Callable[[dict, bytes, Send], Awaitable[None]]] = {
+            '/api/verify_company': self.verify_company,
+            '/api/find_company_website': self.find_company_website,
+            '/api/predict': self.predict,
+            '/api/predict_batch': self.predict_batch,
+        }
+
+    async def __call__(self, scope: dict, receive, send: Send):
+        if scope['type'] == 'lifespan':
+            await self._lifespan(receive, send)
+            return
+        if scope['type'] != 'http':
+            return
+
+        try:
+            body = await self._read_body(scope, receive, self.wsgi_app.config['MAX_CONTENT_LENGTH'])
+        except BodyTooLarge as e:
+            await self._send_json(send, {'error': str(e)}, 413)
+            return
+        handler = self.routes.get(scope['path']) if scope['method'] == 'POST' else None
+        if handler is None:
+            await self._send_wsgi(scope, body, send)
+            return
+        await self._ensure_initialized()
+        await handler(scope, body, send)
+
+    # ---- endpoints ----
+
+    async def verify_company(self, scope: dict, body: bytes, send: Send):
+        """Endpoint: /api/verify_company (see credibility_routes.verify_company)"""
+        try:
+            data = self._json(scope, body)
+            error = company_name_error(data)
+            if error:
+                await self._send_json(send, {'error': error}, 400)
+                return
+            website = data.get('website', data.get('companyWebsite', None))
+            verification = await credibility_routes.company_verifier.verify_company_async(data['companyName'], website)
+            payload, status = {
+                'success': True,
+                'verification': verification,
+                'message': 'Company verification completed'
+            }, 200
+        except Exception as e:
+            payload, status = {'error': f'Failed to verify company: {str(e)}'}, 500
+        await self._send_json(send, payload, status)
+
+    async def find_company_website(self, scope: dict, body: bytes, send: Send):
+        """Endpoint: /api/find_company_website (see credibility_routes.find_company_website)"""
+        try:
+            data = self._json(scope, body)
+            error = company_name_error(data)
+            if error:
+                await self._send_json(send, {'error': error}, 400)
+                return
+            website = await credibility_routes.company_searcher.search_company_async(data['companyName'])
+            if website:
+                payload = {'success': True, 'website': website}
+            else:
+                payload = {'success': False, 'message': 'No website found'}
+            status = 200
+        except BudgetDenied as e:
+            payload, status = {'error': f'Failed to find company website: {str(e)}', 'retry_at': e.retry_at}, 503
+        except Exception as e:
+            payload, status = {'error': f'Failed to find company website: {str(e)}'}, 500
+        await self._send_json(send, payload, status)
+
+    async def predict(self, scope: dict, body: bytes, send: Send):
+        """Endpoint: /api/predict (see credibility_routes.predict_credibility)"""
+        try:
+            data = self._json(scope, body)
+            fill_job_description(data)
+            payload = await credibility_routes.engine.analyze_async(data, self.cpu_executor)
+            status = 200
+        except Exception as e:
+            print(f"[ERROR] Prediction failed: {e}")
+            payload, status = {'error': str(e)}, 500
+        await self._send_json(send, payload, status)
+
+    async def predict_batch(self, scope: dict, body: bytes, send: Send):
+        """
+        Endpoint: /api/predict_batch (see credibility_routes.predict_credibility_batch)
+
+        A streamed batch that fails after its first line ends with an
+        {"error": ...} line, since the 200 status has already been sent.
+        """
+        started = False
+        try:
+            data = self._json(scope, body)
+            error = batch_error(data)
+            if error:
+                await self._send_json(send, {'error': error}, 400)
+                return
+            postings = data['postings']
+            for posting in postings:
+                fill_job_description(posting)
+
+            query = parse_qs(scope.get('query_string', b'').decode('latin-1'))
+            results = credibility_routes.engine.analyze_batch_async(postings, executor=self.cpu_executor)
+            if wants_stream(data, query.get('stream', [None])[0]):
+                await self._start(send, 200, 'application/x-ndjson')
+                started = True
+                index = 0
+                async for result in results:
+                    line = json.dumps({'index': index, 'result': result}) + '\n'
+                    await send({'type': 'http.response.body', 'body': line.encode('utf-8'), 'more_body': True})
+                    index += 1
+                await send({'type': 'http.response.body', 'body': b''})
+                return
+
+            collected = [result async for result in results]
+            payload, status = {'results': collected, 'count': len(collected)}, 200
+        except Exception as e:
+            print(f"[ERROR] Batch prediction failed: {e}")
+            if started:
+                await self._end_stream(send, {'error': str(e)})
+                return
+            payload, status = {'error': str(e)}, 500
+        await self._send_json(send, payload, status)
+
+    # ---- plumbing ----
+
+    async def _ensure_initialized(self):
+        if credibility_routes.engine is None or sentiment_routes.analyzer is None:
+            loop = asyncio.get_running_loop()
+            await loop.run_in_executor(self.cpu_executor, credibility_routes._ensure_initialized)
+            await loop.run_in_executor(self.cpu_executor, sentiment_routes._ensure_initialized)
+
+    async def _lifespan(self, receive, send: Send):
+        while True:
+            message = await receive()
+            if message['type'] == 'lifespan.startup':
+                try:
+                    await self._ensure_initialized()
+                except Exception as e:
+                    await send({'type': 'lifespan.startup.failed', 'message': str(e)})
+                    return
+                await send({'type': 'lifespan.startup.complete'})
+            elif message['type'] == 'lifespan.shutdown':
+                await close_async_client()
+                self.cpu_executor.shutdown(wait=False)
+                await send({'type': 'lifespan.shutdown.complete'})
+                return
+
+    @staticmethod
+    async def _read_body(scope: dict, receive, limit: Optional[int]) -> bytes:
+        """The request body, refused once it is known to exceed limit bytes"""
+        declared = _header(scope, b'content-length').strip()
+        if limit is not None and declared.isdigit() and int(declared) > limit:
+            raise BodyTooLarge(BODY_TOO_LARGE)
+        chunks, size = [], 0
+        while True:
+            message = await receive()
+            if message['type'] == 'http.disconnect':
+                break
+            chunk = message.get('body', b'')
+            size += len(chunk)
+            # A chunked upload declares no length; stop reading it at the limit
+            if limit is not None and size > limit:
+                raise BodyTooLarge(BODY_TOO_LARGE)
+            chunks.append(chunk)
+            if not message.get('more_body'):
+                break
+        return b''.join(chunks)
+
+    @staticmethod
+    def _json(scope: dict, body: bytes) -> Any:
+        """The body as request.get_json() reads it, failing the same way"""
+        content_type = _header(scope, b'content-type').split(';')[0].strip().lower()
+        if content_type != 'application/json' and not (
+                content_type.startswith('application/') and content_type.endswith('+json')):
+            raise RequestError("415 Unsupported Media Type: Did not attempt to load JSON data because the "
+                               "request Content-Type was not 'application/json'.")
+        try:
+            return json.loads(body)
+        except ValueError:
+            raise RequestError("400 Bad Request: The browser (or proxy) sent a request that this server "
+                               "could not understand.")
+
+    @staticmethod
+    async def _start(send: Send, status: int, content_type: str, length: Optional[int] = None):
+        headers = [
+            (b'content-type', content_type.encode('latin-1')),
+            # What flask-cors adds to every response of the Flask app
+            (b'access-control-allow-origin', b'*'),
+        ]
+        if length is not None:
+            headers.append((b'content-length', str(length).encode('latin-1')))
+        await send({'type': 'http.response.start', 'status': status, 'headers': headers})
+
+    async def _send_json(self, send: Send, payload: Any, status: int):
+        body = (self.wsgi_app.json.dumps(payload) + '\n').encode('utf-8')
+        await self._start(send, status, 'application/json', len(body))
+        await send({'type': 'http.response.body', 'body': body})
+
+    @staticmethod
+    async def _end_stream(send: Send, payload: Any):
+        """Close a started NDJSON response with a last line; the client may already be gone"""
+        try:
+            line = json.dumps(payload) + '\n'
+            await send({'type': 'http.response.body', 'body': line.encode('utf-8'), 'more_body': False})
+        except Exception as e:
+            print(f"[WARNING] Could not end the batch stream: {e}")
+
+    async def _send_wsgi(self, scope: dict, body: bytes, send: Send):
+        """Answer the request with the Flask app, run on cpu_executor"""
+        environ = _wsgi_environ(scope, body)
+        started: List[Tuple[str, List[Tuple[str, str]]]] = []
+
+        def start_response(status, headers, exc_info=None):
+            started[:] = [(status, headers)]
+
+        def run() -> bytes:
+            response = self.wsgi_app(environ, start_response)
+            try:
+                return b''.join(response)
+            finally:
+                if hasattr(response, 'close'):
+                    response.close()
+
+        content = await asyncio.get_running_loop().run_in_executor(self.cpu_executor, run)
+        status, headers = started[0]
+        await send({
+            'type': 'http.response.start',
+            'status': int(status.split(' ', 1)[0]),
+            'headers': [(name.lower().encode('latin-1'), value.encode('latin-1')) for name, value in headers],
+        })
+        await send({'type': 'http.response.body', 'body': content})
+
+
+def _header(scope: dict, name: bytes) -> str:
+    for key, value in scope.get('headers', []):
+        if key.lower() == name:
+            return value.decode('latin-1')
+    return ''
+
+
+def _wsgi_environ(scope: dict, body: bytes) -> dict:
+    """PEP 3333 environ for an ASGI http scope"""
+    server = scope.get('server') or ('localhost', 80)
+    client = scope.get('client') or ('', 0)
+    environ = {
+        'REQUEST_METHOD': scope['method'],
+        'SCRIPT_NAME': scope.get('root_path', '').encode('utf-8').decode('latin-1'),
+        'PATH_INFO': scope['path'].encode('utf-8').decode('latin-1'),
+        'QUERY_STRING': scope.get('query_string', b'').decode('latin-1'),
+        'SERVER_NAME': str(server[0]),
+        'SERVER_PORT': str(server[1]),
+        'REMOTE_ADDR': str(client[0]),
+        'SERVER_PROTOCOL': f"HTTP/{scope.get('http_version', '1.1')}",
+        'wsgi.version': (1, 0),
+        'wsgi.url_scheme': scope.get('scheme', 'http'),
+        'wsgi.input': io.BytesIO(body),
+        'wsgi.errors': sys.stderr,
+        'wsgi.multithread': True,
+        'wsgi.multiprocess': False,
+        'wsgi.run_once': False,
+    }
+    for name, value in scope.get('headers', []):
+        name = name.decode('latin-1').upper().replace('-', '_')
+        value = value.decode('latin-1')
+        if name in ('CONTENT_TYPE', 'CONTENT_LENGTH'):
+            environ[name] = value
+            continue
+        key = f'HTTP_{name}'
+        environ[key] = f'{environ[key]},{value}' if key in environ else value
+    return environ
+
+
+application = CredibilityASGI(
+    flask_app,
+    cpu_workers=int(os.getenv('ASGI_CPU_WORKERS') or min(32, (os.cpu_count() or 1) + 4))
+)
@@ -1,24 +1,60 @@
 """
-Auto-Install Dependencies on Startup
-This module checks and installs missing packages automatically
+Dependency Installer and Startup Checks
+Installing runs only on request (python run.py --install); app startup
+only calls the cheap checks below
 """
 
 import subprocess
 import sys
 import os
+import hashlib
+import importlib.util
 from pathlib import Path
 
-def install_dependencies():
-    """Check and install missing dependencies from requirement1.txt"""
+BACKEND_DIR = Path(__file__).parent
+REQUIREMENTS_FILE = BACKEND_DIR / "requirement1.txt"
+# Fingerprint of the requirements file as of the last successful install
+STAMP_FILE = BACKEND_DIR / ".requirements.sha256"
+
+REQUIRED_MODULES = [
+    'flask',
+    'flask_cors',
+    'transformers',
+    'sklearn',
+    'requests',
+]
+
+def requirements_fingerprint():
+    """SHA-256 of the requirements file, or None if it is missing"""
+    try:
+        return hashlib.sha256(REQUIREMENTS_FILE.read_bytes()).hexdigest()
+    except OSError:
+        return None
+
+def dependencies_current():
+    """True if the requirements file is unchanged since the last install"""
+    try:
+        return STAMP_FILE.read_text().strip() == requirements_fingerprint()
+    except OSError:
+        return False
+
+def install_dependencies(force=False):
+    """
+    Install dependencies from requirement1.txt
     
-    # Get the backend directory
-    backend_dir = Path(__file__).parent
-    requirements_file = backend_dir / "requirement1.txt"
+    Skips pip when the requirements file is unchanged since the last
+    successful install, unless force is set.
+    """
+    requirements_file = REQUIREMENTS_FILE
     
     if not requirements_file.exists():
         print(f"ERROR: {requirements_file} not found!")
         return False
     
+    if not force and dependencies_current():
+        print(f"Dependencies up to date with {requirements_file.name}, skipping pip")
+        return True
+    
     print("\n" + "="*70)
     print("CHECKING & INSTALLING DEPENDENCIES")
     print("="*70)
@@ -35,6 +71,7 @@ def install_dependencies():
         )
         
         if result.returncode == 0:
+            STAMP_FILE.write_text(requirements_fingerprint() or '')
             print("\n" + "="*70)
             print("SUCCESS: All dependencies installed!")
             print("="*70 + "\n")
@@ -47,35 +84,34 @@ def install_dependencies():
         print(f"\nERROR: {e}")
         return False
 
-def check_imports():
-    """Verify critical imports are available"""
-    required_modules = [
-        'flask',
-        'flask_cors',
-        'transformers',
-        'sklearn',
-        'requests',
-    ]
+def check_imports(verbose=True):
+    """
+    Verify critical packages are importable without importing them
     
-    print("Verifying critical imports...")
+    Returns:
+        list: Missing module names
+    """
+    if verbose:
+        print("Verifying critical imports...")
     missing = []
     
-    for module in required_modules:
-        try:
-            __import__(module)
-            print(f"  ✓ {module}")
-        except ImportError:
-            print(f"  ✗ {module}")
+    for module in REQUIRED_MODULES:
+        if importlib.util.find_spec(module) is not None:
+            if verbose:
+                print(f"  ✓ {module}")
+        else:
+            if verbose:
+                print(f"  ✗ {module}")
             missing.append(module)
     
     if missing:
-        print(f"\nWARNING: {len(missing)} packages still missing")
-        return False
-    
-    print("\n✓ All critical imports available!")
-    return True
+        print(f"\nWARNING: {len(missing)} packages missing: {', '.join(missing)}")
+        print("Run: python run.py --install")
+    elif verbose:
+        print("\n✓ All critical imports available!")
+    return missing
 
 if __name__ == "__main__":
-    success = install_dependencies()
+    success = install_dependencies(force='--force' in sys.argv)
     if success:
         check_imports()
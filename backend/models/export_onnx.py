@@ -0,0 +1,190 @@
+#!/usr/bin/env python3
+# ========================
+# EXPORT SENTIMENT MODEL TO ONNX
+# Exports the DistilBERT sentiment model, quantizes it to int8
+# and checks its predictions against the PyTorch pipeline
+# ========================
+
+import sys
+import argparse
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+MODEL_NAME = 'distilbert-base-uncased-finetuned-sst-2-english'
+DEFAULT_OUTPUT = Path(__file__).parent / 'saved' / 'sentiment_onnx'
+
+PARITY_TEXTS = [
+    "We offer mentorship, hands-on projects and a monthly stipend.",
+    "Pay a registration fee of $99 to secure your internship spot now!!!",
+    "Guaranteed income with zero effort, no experience needed.",
+    "You will collaborate with senior engineers on production systems.",
+    "Send your bank account details to complete onboarding.",
+    "The role involves data analysis, reporting and client communication.",
+]
+
+
+def export(output_dir: Path, source: str = MODEL_NAME):
+    """Export fp32 ONNX graph, tokenizer and config to output_dir"""
+    import torch
+    from transformers import AutoTokenizer, AutoModelForSequenceClassification
+
+    print(f"Exporting {source} to ONNX...")
+    output_dir.mkdir(parents=True, exist_ok=True)
+
+    tokenizer = AutoTokenizer.from_pretrained(source)
+    model = AutoModelForSequenceClassification.from_pretrained(source)
+    model.eval()
+
+    dummy = tokenizer(["export sample text"], return_tensors='pt')
+    torch.onnx.export(
+        model,
+        (dummy['input_ids'], dummy['attention_mask']),
+        str(output_dir / 'model.onnx'),
+        input_names=['input_ids', 'attention_mask'],
+        output_names=['logits'],
+        dynamic_axes={
+            'input_ids': {0: 'batch', 1: 'sequence'},
+            'attention_mask': {0: 'batch', 1: 'sequence'},
+            'logits': {0: 'batch'}
+        },
+        opset_version=14
+    )
+
+    # Writes tokenizer.json (fast tokenizer) and config.json next to the graph
+    tokenizer.save_pretrained(str(output_dir))
+    model.config.save_pretrained(str(output_dir))
+    print(f"  ✓ ONNX model saved to {output_dir / 'model.onnx'}")
+
+
+def quantize(output_dir: Path):
+    """Dynamic int8 quantization of the exported graph"""
+    from onnxruntime.quantization import quantize_dynamic, QuantType
+
+    print("Quantizing to int8...")
+    quantize_dynamic(
+        str(output_dir / 'model.onnx'),
+        str(output_dir / 'model.int8.onnx'),
+        weight_type=QuantType.QInt8
+    )
+    print(f"  ✓ Quantized model saved to {output_dir / 'model.int8.onnx'}")
+
+
+def check_parity(output_dir: Path, source: str = MODEL_NAME, texts=None, long_texts=None,
+                 max_score_diff: float = 0.05) -> bool:
+    """
+    Compare ONNX predictions (fp32 and int8) with the PyTorch pipeline
+
+    Short texts go through each model whole. Long texts go through
+    SentimentAnalyzer's windowed path (token windows scored with
+    predict_ids, then aggregated) on both backends, so the window split
+    and the token-id inputs are checked as well.
+
+    Returns:
+        bool: True if every label and window count agrees and scores are
+        within max_score_diff
+    """
+    from transformers import pipeline
+    from services.onnx_sentiment import OnnxSentimentModel
+
+    texts = texts or _parity_texts()
+    long_texts = long_texts or _long_parity_texts()
+    torch_pipeline = pipeline('sentiment-analysis', model=source)
+    reference = torch_pipeline(texts, truncation=True)
+    windowed_reference = _windowed(torch_pipeline, long_texts)
+    windows = [r['windows'] for r in windowed_reference]
+    print(f"  Long texts: {len(long_texts)}, {min(windows)}-{max(windows)} windows each")
+
+    ok = True
+    for quantized in (False, True):
+        name = 'int8' if quantized else 'fp32'
+        model = OnnxSentimentModel(str(output_dir), quantized=quantized)
+        windowed = _windowed(model, long_texts)
+        same_windows = all(r['windows'] == c['windows'] for r, c in zip(windowed_reference, windowed))
+        passed = _compare(name, reference, model(texts), max_score_diff)
+        passed = _compare(f'{name} windowed', windowed_reference, windowed, max_score_diff) and passed
+        if not same_windows:
+            print(f"  ✗ {name} windowed: window counts differ from PyTorch")
+        ok = ok and passed and same_windows
+    return ok
+
+
+def _windowed(model, texts):
+    """Results of SentimentAnalyzer's chunked path with model plugged in"""
+    from services.sentiment_analyzer import SentimentAnalyzer
+
+    analyzer = SentimentAnalyzer()
+    analyzer.model = model
+    analyzer.chunking = True
+    return analyzer._run_model(texts)
+
+
+def _compare(name: str, reference, candidate, max_score_diff: float) -> bool:
+    """Print and return whether candidate labels agree and scores are close"""
+    agree = sum(r['label'] == c['label'] for r, c in zip(reference, candidate))
+    max_diff = max(
+        abs(r['score'] - c['score']) for r, c in zip(reference, candidate) if r['label'] == c['label']
+    ) if agree else 1.0
+    passed = agree == len(reference) and max_diff <= max_score_diff
+
+    print(f"  {'✓' if passed else '✗'} {name}: {agree}/{len(reference)} labels agree, "
+          f"max score diff {max_diff:.4f}")
+    return passed
+
+
+def _parity_texts():
+    """Fixed sentences plus the job descriptions from the pipeline test cases"""
+    from tests.test_datasets import test_cases
+    return PARITY_TEXTS + [case['jobDescription'] for case in test_cases.values()]
+
+
+def _long_parity_texts():
+    """
+    Texts past one 510-token window: a few windows, a genuine posting with
+    a scam ending, and one long enough that only max_windows are scored
+    """
+    from tests.test_datasets import test_cases
+    descriptions = ' '.join(case['jobDescription'] for case in test_cases.values())
+    genuine = ' '.join(PARITY_TEXTS[i] for i in (0, 3, 5))
+    scam = ' '.join(PARITY_TEXTS[i] for i in (1, 2, 4))
+    return [
+        ' '.join(PARITY_TEXTS * 10),
+        ' '.join([genuine] * 15 + [scam] * 5),
+        ' '.join([descriptions] * 4),
+        ' '.join([descriptions] * 30),
+    ]
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Export the sentiment model to ONNX')
+    parser.add_argument('--output', type=Path, default=DEFAULT_OUTPUT, help='Output model directory')
+    parser.add_argument('--source', default=MODEL_NAME, help='HuggingFace model name or local path')
+    parser.add_argument('--check-only', action='store_true', help='Only run the parity check')
+    args = parser.parse_args()
+
+    print()
+    print("=" * 60)
+    print("  ONNX SENTIMENT MODEL EXPORT")
+    print("=" * 60)
+    print()
+
+    try:
+        if not args.check_only:
+            export(args.output, args.source)
+            quantize(args.output)
+
+        print("Checking parity against PyTorch...")
+        if not check_parity(args.output, args.source):
+            print("\n✗ Parity check failed")
+            sys.exit(1)
+
+        print()
+        print("=" * 60)
+        print("  SUCCESS")
+        print("=" * 60)
+        print()
+        print(f"Set SENTIMENT_BACKEND=onnx and SENTIMENT_MODEL_DIR={args.output} to use it.")
+        print()
+    except Exception as e:
+        print(f"\n✗ Error: {e}")
+        sys.exit(1)
@@ -2,9 +2,12 @@
 # RANDOM FOREST INFERENCE
 # ========================
 
-import joblib
-import numpy as np
 import os
+from typing import TYPE_CHECKING
+
+# joblib/sklearn and numpy load with the model, not at import
+if TYPE_CHECKING:
+    import numpy as np
 
 class RandomForestPredictor:
     """
@@ -23,6 +26,7 @@ class RandomForestPredictor:
         """Load pre-trained model"""
         if os.path.exists(self.model_path):
             try:
+                import joblib
                 checkpoint = joblib.load(self.model_path)
                 self.model = checkpoint['model']
                 self.scaler = checkpoint['scaler']
@@ -34,7 +38,7 @@ class RandomForestPredictor:
         else:
             print(f"Model not found at {self.model_path}")
     
-    def predict(self, features: np.ndarray) -> int:
+    def predict(self, features: 'np.ndarray') -> int:
         """
         Predict credibility class
         
@@ -64,7 +68,7 @@ class RandomForestPredictor:
             print(f"Prediction error: {e}")
             return 1
     
-    def predict_proba(self, features: np.ndarray) -> np.ndarray:
+    def predict_proba(self, features: 'np.ndarray') -> 'np.ndarray':
         """
         Predict probability distribution
         
@@ -74,6 +78,8 @@ class RandomForestPredictor:
         Returns:
             np.ndarray: Probability for each class
         """
+        import numpy as np
+        
         if self.model is None:
             return np.array([0.5, 0.5])
         
@@ -95,7 +101,8 @@ class RandomForestPredictor:
         Batch prediction
         
         Args:
-            features_list: List of feature vectors
+            features_list: List of feature vectors, or a structured array
+                from URLFeatureExtractor.extract_batch (columns in field order)
         
         Returns:
             list: Predictions
@@ -104,7 +111,12 @@ class RandomForestPredictor:
             return [1] * len(features_list)
         
         try:
-            features_array = np.array(features_list)
+            import numpy as np
+            if getattr(features_list, 'dtype', None) is not None and features_list.dtype.names:
+                from numpy.lib.recfunctions import structured_to_unstructured
+                features_array = structured_to_unstructured(features_list, dtype=np.float64)
+            else:
+                features_array = np.array(features_list)
             features_scaled = self.scaler.transform(features_array)
             predictions = self.model.predict(features_scaled)
             
@@ -6,15 +6,22 @@ import numpy as np
 import pickle
 import os
 
-# TensorFlow is optional (may not be available in PyInstaller bundle)
-try:
-    import tensorflow as tf
-    from tensorflow.keras.models import load_model
-    from tensorflow.keras.preprocessing.sequence import pad_sequences
-    HAS_TENSORFLOW = True
-except ImportError:
-    HAS_TENSORFLOW = False
-    print("⚠ TensorFlow not available; Text CNN will use fallback predictions")
+# TensorFlow is optional (may not be available in PyInstaller bundle) and
+# slow to import, so it is only imported when a model is loaded
+_tensorflow = None
+
+
+def _import_tensorflow():
+    """Import TensorFlow once; returns None when it is unavailable"""
+    global _tensorflow
+    if _tensorflow is None:
+        try:
+            import tensorflow
+            _tensorflow = tensorflow
+        except ImportError:
+            _tensorflow = False
+            print("⚠ TensorFlow not available; Text CNN will use fallback predictions")
+    return _tensorflow or None
 
 class TextCNNPredictor:
     """
@@ -32,14 +39,15 @@ class TextCNNPredictor:
     
     def _load_model(self):
         """Load pre-trained CNN model"""
-        if not HAS_TENSORFLOW:
+        tf = _import_tensorflow()
+        if tf is None:
             print("⚠ Skipping CNN model load (TensorFlow unavailable)")
             self.model = None
             return
             
         if os.path.exists(self.model_path):
             try:
-                self.model = load_model(self.model_path)
+                self.model = tf.keras.models.load_model(self.model_path)
                 
                 # Load tokenizer
                 tokenizer_path = self.model_path.replace('.h5', '_tokenizer.pkl')
@@ -66,13 +74,14 @@ class TextCNNPredictor:
         if self.model is None or self.tokenizer is None:
             return 0.5  # Fallback: neutral score if model unavailable
         
-        if not HAS_TENSORFLOW:
+        tf = _import_tensorflow()
+        if tf is None:
             return 0.5
         
         try:
             # Tokenize and pad
             sequence = self.tokenizer.texts_to_sequences([text])
-            padded = pad_sequences(sequence, maxlen=self.max_len)
+            padded = tf.keras.preprocessing.sequence.pad_sequences(sequence, maxlen=self.max_len)
             
             # Predict
             prediction = self.model.predict(padded, verbose=0)[0][0]
@@ -97,8 +106,9 @@ class TextCNNPredictor:
             return [0.5] * len(texts)
         
         try:
+            tf = _import_tensorflow()
             sequences = self.tokenizer.texts_to_sequences(texts)
-            padded = pad_sequences(sequences, maxlen=self.max_len)
+            padded = tf.keras.preprocessing.sequence.pad_sequences(sequences, maxlen=self.max_len)
             
             predictions = self.model.predict(padded, verbose=0)
             
@@ -122,6 +132,8 @@ class TextCNNPredictor:
             return np.zeros(64)
         
         try:
+            tf = _import_tensorflow()
+            
             # Create embedding model (up to pooling layer)
             embedding_model = tf.keras.Model(
                 inputs=self.model.input,
@@ -129,7 +141,7 @@ class TextCNNPredictor:
             )
             
             sequence = self.tokenizer.texts_to_sequences([text])
-            padded = pad_sequences(sequence, maxlen=self.max_len)
+            padded = tf.keras.preprocessing.sequence.pad_sequences(sequence, maxlen=self.max_len)
             
             embedding = embedding_model.predict(padded, verbose=0)[0]
             
@@ -0,0 +1,63 @@
+# ========================
+# SHARED DOCUMENT CONTEXT
+# ========================
+
+from functools import cached_property
+from typing import Tuple
+
+from preprocessing.text_cleaner import TextCleaner
+
+_default_cleaner = TextCleaner()
+
+
+class DocumentContext:
+    """
+    Purpose: Text views of one job description, shared by every analysis step
+    Allowed: Lowercasing, splitting, cleaning
+    Forbidden: Scoring, pattern matching, model usage
+
+    Built once per request. Each view is computed on first access and then
+    reused, so the parser, cleaner, validator and offer quality checks stop
+    lowercasing and splitting the same text separately.
+    Instances are read-only.
+    """
+
+    def __init__(self, text: str, cleaner: TextCleaner = None):
+        """
+        Args:
+            text: Raw job description
+            cleaner: TextCleaner used for the cleaned view
+        """
+        object.__setattr__(self, 'text', text)
+        object.__setattr__(self, '_cleaner', cleaner or _default_cleaner)
+
+    def __setattr__(self, name, value):
+        raise AttributeError('DocumentContext is read-only')
+
+    @cached_property
+    def lower(self) -> str:
+        """Lowercased text"""
+        return self.text.lower()
+
+    @cached_property
+    def lines(self) -> Tuple[str, ...]:
+        """Stripped non-empty lines"""
+        return tuple(line for line in (raw.strip() for raw in self.text.split('\n')) if line)
+
+    @cached_property
+    def lines_lower(self) -> Tuple[str, ...]:
+        """Lowercase form of each entry in lines"""
+        return tuple(line.lower() for line in self.lines)
+
+    @cached_property
+    def cleaned(self) -> str:
+        """Text as returned by TextCleaner.clean"""
+        if not self.text or not isinstance(self.text, str):
+            return ""
+        return self._cleaner.clean_lowered(self.lower)
+
+    def line_at(self, pos: int) -> str:
+        """Stripped line of the original text containing offset pos"""
+        start = self.text.rfind('\n', 0, pos) + 1
+        end = self.text.find('\n', pos)
+        return self.text[start:end if end >= 0 else len(self.text)].strip()
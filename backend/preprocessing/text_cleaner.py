@@ -6,6 +6,11 @@ import re
 import string
 from typing import List
 
+URL_PATTERN = re.compile(r'http\S+|www\S+|https\S+')
+EMAIL_PATTERN = re.compile(r'\S+@\S+')
+HTML_TAG_PATTERN = re.compile(r'<.*?>')
+PUNCTUATION_TABLE = str.maketrans('', '', string.punctuation)
+
 class TextCleaner:
     """
     Purpose: Text normalization
@@ -33,19 +38,29 @@ class TextCleaner:
             return ""
         
         # Convert to lowercase
-        text = text.lower()
+        return self.clean_lowered(text.lower())
+    
+    def clean_lowered(self, text: str) -> str:
+        """
+        Clean text that is already lowercase (see DocumentContext)
+        
+        Args:
+            text: Lowercased text
         
+        Returns:
+            str: Cleaned text
+        """
         # Remove URLs
-        text = re.sub(r'http\S+|www\S+|https\S+', '', text)
+        text = URL_PATTERN.sub('', text)
         
         # Remove email addresses
-        text = re.sub(r'\S+@\S+', '', text)
+        text = EMAIL_PATTERN.sub('', text)
         
         # Remove HTML tags
-        text = re.sub(r'<.*?>', '', text)
+        text = HTML_TAG_PATTERN.sub('', text)
         
         # Remove punctuation
-        text = text.translate(str.maketrans('', '', string.punctuation))
+        text = text.translate(PUNCTUATION_TABLE)
         
         # Remove extra whitespace
         text = ' '.join(text.split())
@@ -2,13 +2,15 @@
 # CREDIBILITY PREDICTION ROUTES
 # ========================
 
-from flask import Blueprint, request, jsonify
-from services.credibility_engine import CredibilityEngine
-from services.url_feature_extractor import URLFeatureExtractor
-from services.info_parser import InternshipInfoParser
-from services.company_verifier import CompanyVerifier
-from services.company_search import CompanySearcher
+from flask import Blueprint, request, jsonify, Response
+from services.cse_budget import BudgetDenied
+from services.service_registry import get_service
 import re
+import json
+from typing import Optional
+
+# Upper bound on postings accepted by /api/predict_batch
+MAX_BATCH_SIZE = 1000
 
 credibility_bp = Blueprint('credibility', __name__)
 engine = None
@@ -18,18 +20,52 @@ company_verifier = None
 company_searcher = None
 
 def _ensure_initialized():
-    """Lazy initialize services on first request"""
+    """Lazy initialize services on first request; instances are shared process-wide"""
     global engine, url_extractor, info_parser, company_verifier, company_searcher
     if engine is None:
-        engine = CredibilityEngine()
+        engine = get_service('credibility_engine')
     if url_extractor is None:
-        url_extractor = URLFeatureExtractor()
+        url_extractor = get_service('url_extractor')
     if info_parser is None:
-        info_parser = InternshipInfoParser()
+        info_parser = get_service('info_parser')
     if company_verifier is None:
-        company_verifier = CompanyVerifier()
+        company_verifier = get_service('company_verifier')
     if company_searcher is None:
-        company_searcher = CompanySearcher()
+        company_searcher = get_service('company_searcher')
+
+
+# Request checks shared with the ASGI app (asgi.py); each returns an error message or None
+
+def company_name_error(data) -> Optional[str]:
+    if not data or 'companyName' not in data:
+        return 'Missing companyName field'
+    company_name = data['companyName']
+    if not company_name or not str(company_name).strip():
+        return 'Company name cannot be empty'
+    return None
+
+
+def fill_job_description(posting: dict):
+    """Use rawInternshipInfo as the jobDescription when none is given"""
+    if not posting.get('jobDescription') and posting.get('rawInternshipInfo'):
+        posting['jobDescription'] = posting['rawInternshipInfo']
+
+
+def wants_stream(data: dict, query_value: Optional[str]) -> bool:
+    """stream from the body (true, '1' or 'true') or the query string ('1' or 'true')"""
+    body_value = data.get('stream')
+    return body_value is True or body_value in ('1', 'true') or query_value in ('1', 'true')
+
+
+def batch_error(data) -> Optional[str]:
+    if not data or not isinstance(data.get('postings'), list):
+        return 'Missing or invalid postings array'
+    postings = data['postings']
+    if len(postings) > MAX_BATCH_SIZE:
+        return f'Batch too large (max {MAX_BATCH_SIZE} postings)'
+    if not all(isinstance(p, dict) for p in postings):
+        return 'Each posting must be an object'
+    return None
 
 
 @credibility_bp.route('/find_company_website', methods=['POST'])
@@ -43,20 +79,20 @@ def find_company_website():
     _ensure_initialized()
     try:
         data = request.get_json()
-        if not data or 'companyName' not in data:
-            return jsonify({'error': 'Missing companyName field'}), 400
-
-        company_name = data['companyName']
-        if not company_name or not str(company_name).strip():
-            return jsonify({'error': 'Company name cannot be empty'}), 400
+        error = company_name_error(data)
+        if error:
+            return jsonify({'error': error}), 400
 
-        website = company_searcher.search_company(company_name)
+        website = company_searcher.search_company(data['companyName'])
 
         if not website:
             return jsonify({'success': False, 'message': 'No website found'}), 200
 
         return jsonify({'success': True, 'website': website}), 200
 
+    except BudgetDenied as e:
+        # Rate limit, daily quota or circuit breaker; retry_at is epoch seconds
+        return jsonify({'error': f'Failed to find company website: {str(e)}', 'retry_at': e.retry_at}), 503
     except Exception as e:
         return jsonify({'error': f'Failed to find company website: {str(e)}'}), 500
 
@@ -107,14 +143,11 @@ def verify_company():
         data = request.get_json()
         
         # Validate input exists
-        if 'companyName' not in data:
-            return jsonify({'error': 'Missing companyName field'}), 400
+        error = company_name_error(data)
+        if error:
+            return jsonify({'error': error}), 400
         
         company_name = data['companyName']
-        
-        if not company_name or not str(company_name).strip():
-            return jsonify({'error': 'Company name cannot be empty'}), 400
-        
         website = data.get('website', data.get('companyWebsite', None))
         
         # Verify the company
@@ -145,9 +178,7 @@ def predict_credibility():
         print(f"[DEBUG] Received keys: {list(data.keys())}")
         
         # Ensure jobDescription is populated
-        if not data.get('jobDescription') and data.get('rawInternshipInfo'):
-            print(f"[DEBUG] No jobDescription, using rawInternshipInfo")
-            data['jobDescription'] = data['rawInternshipInfo']
+        fill_job_description(data)
         
         job_desc_len = len(data.get('jobDescription', ''))
         print(f"[DEBUG] jobDescription length: {job_desc_len}")
@@ -170,6 +201,48 @@ def predict_credibility():
         return jsonify({'error': str(e)}), 500
 
 
+@credibility_bp.route('/predict_batch', methods=['POST'])
+def predict_credibility_batch():
+    """
+    Endpoint: /api/predict_batch
+    Purpose: Predict credibility for many postings in one call
+    Input: postings (list of /api/predict payloads), stream (optional bool)
+    Output: results in input order; NDJSON lines of {index, result} when streaming
+    """
+    _ensure_initialized()
+    try:
+        data = request.get_json()
+        
+        error = batch_error(data)
+        if error:
+            return jsonify({'error': error}), 400
+        
+        # Same jobDescription fallback as /api/predict
+        postings = data['postings']
+        for posting in postings:
+            fill_job_description(posting)
+        
+        if wants_stream(data, request.args.get('stream')):
+            def generate():
+                # The 200 is already sent, so a failure ends the stream with an error line
+                try:
+                    for index, result in enumerate(engine.analyze_batch(postings)):
+                        yield json.dumps({'index': index, 'result': result}) + '\n'
+                except Exception as e:
+                    print(f"[ERROR] Batch prediction failed: {e}")
+                    yield json.dumps({'error': str(e)}) + '\n'
+            
+            return Response(generate(), mimetype='application/x-ndjson')
+        
+        results = list(engine.analyze_batch(postings))
+        
+        return jsonify({'results': results, 'count': len(results)}), 200
+        
+    except Exception as e:
+        print(f"[ERROR] Batch prediction failed: {e}")
+        return jsonify({'error': str(e)}), 500
+
+
 @credibility_bp.route('/extract_url_features', methods=['POST'])
 def extract_url_features():
     """
@@ -235,11 +308,8 @@ def test_sentiment():
         data = request.get_json()
         text = data.get('text', '')
         
-        from services.sentiment_analyzer import SentimentAnalyzer
-        from preprocessing.text_cleaner import TextCleaner
-        
-        analyzer = SentimentAnalyzer()
-        cleaner = TextCleaner()
+        analyzer = get_service('sentiment_analyzer')
+        cleaner = get_service('text_cleaner')
         
         cleaned = cleaner.clean(text)
         sentiment = analyzer.analyze(cleaned)
@@ -3,16 +3,16 @@
 # ========================
 
 from flask import Blueprint, request, jsonify
-from services.sentiment_analyzer import SentimentAnalyzer
+from services.service_registry import get_service
 
 sentiment_bp = Blueprint('sentiment', __name__)
 analyzer = None
 
 def _ensure_initialized():
-    """Lazy initialize analyzer on first request"""
+    """Lazy initialize analyzer on first request; shared with the credibility engine"""
     global analyzer
     if analyzer is None:
-        analyzer = SentimentAnalyzer()
+        analyzer = get_service('sentiment_analyzer')
 
 @sentiment_bp.route('/sentiment', methods=['POST'])
 def analyze_sentiment():
@@ -58,3 +58,14 @@ def batch_sentiment():
         
     except Exception as e:
         return jsonify({'error': str(e)}), 500
+
+
+@sentiment_bp.route('/sentiment/stats', methods=['GET'])
+def sentiment_stats():
+    """
+    Endpoint: /api/sentiment/stats
+    Purpose: Inference batching metrics
+    Output: queue depth, batch counts, batch-size histogram
+    """
+    _ensure_initialized()
+    return jsonify(analyzer.get_stats()), 200
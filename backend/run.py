@@ -1,15 +1,49 @@
 """
-STARTUP SCRIPT - Run this to start the API with auto-dependency installation
-Usage: python run.py
+STARTUP SCRIPT - Run this to start the API
+Usage: python run.py [--install] [--prod [--workers N] [--threads N] [--concurrency process|thread|async]]
+
+--install installs requirement1.txt first (skipped when unchanged since the
+last install). Plain startup never runs pip.
+
+--prod serves with server.py instead of Flask's development server: models
+and datasets are loaded and warmed up once, then shared by preforked worker
+processes, each with a pool of request threads (or served from one threaded
+process with --concurrency thread, or from one asyncio process via asgi.py
+with --concurrency async).
 """
 
 import subprocess
 import sys
 import os
+import time
+import argparse
 from pathlib import Path
 
 def main():
-    """Run the Flask application with auto-install"""
+    """Run the Flask application, installing dependencies first if asked"""
+    parser = argparse.ArgumentParser(description='Start the backend API')
+    parser.add_argument('--install', action='store_true',
+                        help='Install requirement1.txt before starting')
+    parser.add_argument('--force-install', action='store_true',
+                        help='With --install, run pip even if requirements are unchanged')
+    parser.add_argument('--prod', action='store_true',
+                        help='Use the production server instead of the development server')
+    parser.add_argument('--host', default='0.0.0.0', help='With --prod, interface to bind (default: 0.0.0.0)')
+    parser.add_argument('--port', type=int, default=5000, help='With --prod, port to bind (default: 5000)')
+    parser.add_argument('--workers', type=int, default=os.cpu_count() or 1,
+                        help='With --prod, worker processes to fork (default: CPU count)')
+    parser.add_argument('--threads', type=int, default=64,
+                        help='With --prod, request threads per worker process (default: 64)')
+    parser.add_argument('--concurrency', choices=['process', 'thread', 'async'], default='process',
+                        help='With --prod, preforked processes, one threaded process or one asyncio '
+                             'process (default: process)')
+    parser.add_argument('--no-warmup', action='store_true',
+                        help='With --prod, skip the warmup inference before accepting traffic')
+    parser.add_argument('--graceful-timeout', type=float, default=30,
+                        help='With --prod, seconds in-flight requests get to finish on shutdown (default: 30)')
+    parser.add_argument('--dataset-timeout', type=float, default=None,
+                        help='With --prod, seconds to wait for datasets before serving (default: until loaded)')
+    args = parser.parse_args()
     
     print("\n" + "="*70)
     print("INTERNSHIP CREDIBILITY CHECKER - BACKEND")
@@ -22,6 +56,32 @@ def main():
         print(f"ERROR: {app_file} not found!")
         sys.exit(1)
     
+    if args.install:
+        from auto_install import install_dependencies, check_imports
+        started = time.perf_counter()
+        if not install_dependencies(force=args.force_install):
+            sys.exit(1)
+        check_imports()
+        print(f"Dependency installation took {time.perf_counter() - started:.1f} s")
+    
+    if args.prod:
+        # Served in this process so the preloaded models are shared by the workers
+        os.chdir(backend_dir.resolve())
+        sys.path.insert(0, str(backend_dir.resolve()))
+        from server import serve
+        print(f"\nStarting production server ({args.concurrency} concurrency)...")
+        serve(
+            host=args.host,
+            port=args.port,
+            workers=args.workers,
+            threads=args.threads,
+            concurrency=args.concurrency,
+            warmup=not args.no_warmup,
+            graceful_timeout=args.graceful_timeout,
+            dataset_timeout=args.dataset_timeout
+        )
+        return
+    
     print(f"\nStarting backend server...")
     print(f"Location: {backend_dir}")
     print(f"App: {app_file.name}\n")
@@ -0,0 +1,332 @@
+# ========================
+# PRODUCTION SERVER
+# Preforked WSGI workers sharing what the master loaded before fork
+# ========================
+
+import os
+import signal
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Optional
+
+from werkzeug.serving import BaseWSGIServer, make_server
+
+# Posting pushed through every stage once before traffic is accepted
+WARMUP_POSTING = {
+    'companyName': 'Infosys Limited',
+    'companyWebsite': 'https://www.infosys.com',
+    'contactEmail': 'careers@infosys.com',
+    'jobDescription': (
+        'Infosys Limited is hiring a Software Engineering Intern for its Bangalore office. '
+        'The internship runs for 6 months with a stipend of Rs 25,000 per month. '
+        'Apply through the careers portal; there is no registration fee.'
+    )
+}
+
+
+def preload(warmup: bool = True, dataset_timeout: Optional[float] = None):
+    """
+    Import the app and load everything workers share
+
+    Datasets, compiled pattern indexes and models are loaded here, in the
+    master, so forked workers inherit them copy-on-write instead of each
+    loading its own copy.
+
+    Args:
+        warmup: Run one inference through every stage before returning
+        dataset_timeout: Seconds to wait for datasets; None waits until loaded
+
+    Returns:
+        Flask: The application
+    """
+    started = time.perf_counter()
+    from app import app
+    from routes import credibility_routes, sentiment_routes
+    from services.dataset_validator import get_dataset_validator
+
+    if not get_dataset_validator().wait_until_loaded(dataset_timeout):
+        print("[WARNING] Datasets still loading; workers will finish loading them on their own")
+    credibility_routes._ensure_initialized()
+    sentiment_routes._ensure_initialized()
+
+    if warmup:
+        warmup_stages(credibility_routes)
+
+    print(f"[INFO] Preloaded in {(time.perf_counter() - started) * 1000:.0f} ms")
+    return app
+
+
+def warmup_stages(routes) -> Dict[str, float]:
+    """
+    Run the warmup posting through each stage and time it
+
+    Stages are called directly rather than through engine.analyze, so the
+    master never starts the stage thread pool. Online company verification
+    is skipped; it only warms caches that are per worker anyway.
+
+    Returns:
+        dict: Milliseconds per stage
+    """
+    from preprocessing.document_context import DocumentContext
+
+    engine = routes.engine
+    posting = WARMUP_POSTING
+    document = DocumentContext(posting['jobDescription'], engine.text_cleaner)
+    stages = {
+        'parse': lambda: routes.info_parser.parse(posting['jobDescription'], document=document),
+        'datasets': lambda: engine._run_dataset_stage(
+            posting['companyName'], posting['contactEmail'], posting['jobDescription'], document
+        ),
+        'url': lambda: engine._run_url_stage(posting['companyWebsite']),
+        'sentiment': lambda: engine.sentiment_analyzer._run_model([document.cleaned]),
+    }
+
+    timings = {}
+    for name, stage in stages.items():
+        began = time.perf_counter()
+        try:
+            stage()
+        except Exception as e:
+            print(f"[WARNING] Warmup of {name} stage failed: {e}")
+        timings[name] = (time.perf_counter() - began) * 1000
+    print("[INFO] Warmup: " + ', '.join(f"{name} {ms:.0f} ms" for name, ms in timings.items()))
+    return timings
+
+
+def _stop_on_signals(server, graceful_timeout: float):
+    """Let SIGTERM/SIGINT finish in-flight requests, then force exit after graceful_timeout"""
+    def handle(signum, frame):
+        # shutdown() waits for serve_forever, so it cannot run on this thread
+        threading.Thread(target=server.shutdown, daemon=True).start()
+        watchdog = threading.Timer(graceful_timeout, os._exit, (1,))
+        watchdog.daemon = True
+        watchdog.start()
+
+    signal.signal(signal.SIGTERM, handle)
+    signal.signal(signal.SIGINT, handle)
+
+
+def serve_threaded(app, host: str, port: int, graceful_timeout: float = 30):
+    """One process, one thread per request"""
+    server = make_server(host, port, app, threaded=True)
+    # Non-daemon request threads are joined on close, so shutdown is graceful
+    server.daemon_threads = False
+    _stop_on_signals(server, graceful_timeout)
+    print(f"[INFO] Serving on http://{host}:{port} (threads)")
+    server.serve_forever()
+    print("[INFO] Server stopped")
+
+
+def serve_async(host: str, port: int, graceful_timeout: float = 30):
+    """
+    One process, one event loop (asgi.py under uvicorn)
+
+    Waiting on Google CSE and website probes holds no thread, so one process
+    keeps thousands of slow verifications in flight; CPU work runs on the
+    ASGI app's executor.
+    """
+    import uvicorn
+    from asgi import application
+
+    config = uvicorn.Config(
+        application, host=host, port=port, lifespan='on',
+        timeout_graceful_shutdown=graceful_timeout, log_level='warning'
+    )
+    print(f"[INFO] Serving on http://{host}:{port} (asyncio)")
+    # Handles SIGTERM/SIGINT itself: stops accepting, then waits for in-flight requests
+    uvicorn.Server(config).run()
+    print("[INFO] Server stopped")
+
+
+class PooledWSGIServer(BaseWSGIServer):
+    """
+    WSGI server handling requests on a fixed pool of threads
+
+    A connection is accepted only while a thread is free, so a worker
+    whose threads all wait on slow verifications leaves new connections
+    to the other workers instead of queueing them behind its own.
+    """
+
+    # Seconds between shutdown checks while every thread is busy
+    slot_poll_interval = 0.5
+
+    def __init__(self, host: str, port: int, app, threads: int):
+        super().__init__(host, port, app)
+        self.threads = max(1, threads)
+        self._slots = threading.BoundedSemaphore(self.threads)
+        # No threads start until the first request, so forking after this is safe
+        self._pool = ThreadPoolExecutor(max_workers=self.threads, thread_name_prefix='request')
+        self._slot_pending = False
+        self._stopping = threading.Event()
+
+    def shutdown(self):
+        # serve_forever may be waiting for a slot rather than in select()
+        self._stopping.set()
+        super().shutdown()
+
+    def _handle_request_noblock(self):
+        while not self._slots.acquire(timeout=self.slot_poll_interval):
+            if self._stopping.is_set():
+                # Leave the connection to another worker, or to the backlog
+                return
+        self._slot_pending = True
+        try:
+            super()._handle_request_noblock()
+        finally:
+            # Still pending when the accept was lost to another worker
+            if self._slot_pending:
+                self._slot_pending = False
+                self._slots.release()
+
+    def process_request(self, request, client_address):
+        self._slot_pending = False
+        self._pool.submit(self._process, request, client_address)
+
+    def _process(self, request, client_address):
+        try:
+            self.finish_request(request, client_address)
+        except Exception:
+            self.handle_error(request, client_address)
+        finally:
+            self.shutdown_request(request)
+            self._slots.release()
+
+    def drain(self):
+        """Wait for the requests already accepted to finish"""
+        self._pool.shutdown(wait=True)
+
+
+class PreforkServer:
+    """
+    Purpose: Run N forked worker processes on one listening socket
+    Allowed: Forking, signal handling, respawning
+    Forbidden: Request handling, loading models or datasets
+
+    The socket is bound in the master and inherited by every worker. Each
+    worker serves up to `threads` requests at once, so requests waiting on
+    Google CSE or a website probe do not hold a whole process; idle
+    workers race to accept and the losers go back to waiting. Workers that
+    die are replaced. On SIGTERM/SIGINT workers finish their current
+    requests and exit; any still running after graceful_timeout are killed.
+    """
+
+    def __init__(self, app, host: str, port: int, workers: int, threads: int = 64,
+                 graceful_timeout: float = 30):
+        self.app = app
+        self.host = host
+        self.port = port
+        self.workers = max(1, workers)
+        self.graceful_timeout = graceful_timeout
+        self.server = PooledWSGIServer(host, port, app, threads)
+        # Idle workers all wake on a new connection; only one accept succeeds
+        self.server.socket.setblocking(False)
+        self._children: Dict[int, float] = {}
+        self._stopping = threading.Event()
+
+    def _spawn(self):
+        pid = os.fork()
+        if pid == 0:
+            code = 0
+            try:
+                _stop_on_signals(self.server, self.graceful_timeout)
+                self.server.serve_forever()
+                self.server.drain()
+            except BaseException as e:
+                print(f"[ERROR] Worker {os.getpid()} crashed: {e}")
+                code = 1
+            finally:
+                # Never return into the master's code
+                os._exit(code)
+        self._children[pid] = time.monotonic()
+
+    def _reap(self) -> list:
+        """Collect exited workers; returns (pid, lifetime seconds) for each"""
+        exited = []
+        while self._children:
+            try:
+                pid, _ = os.waitpid(-1, os.WNOHANG)
+            except ChildProcessError:
+                break
+            if pid == 0:
+                break
+            started = self._children.pop(pid, None)
+            if started is not None:
+                exited.append((pid, time.monotonic() - started))
+        return exited
+
+    def serve_forever(self):
+        signal.signal(signal.SIGTERM, lambda signum, frame: self._stopping.set())
+        signal.signal(signal.SIGINT, lambda signum, frame: self._stopping.set())
+
+        for _ in range(self.workers):
+            self._spawn()
+        print(f"[INFO] Serving on http://{self.host}:{self.port} "
+              f"({self.workers} worker processes x {self.server.threads} threads)")
+
+        while not self._stopping.wait(0.5):
+            for pid, lifetime in self._reap():
+                print(f"[WARNING] Worker {pid} exited after {lifetime:.1f} s, starting a new one")
+                # Back off when workers die right away rather than fork in a loop
+                if lifetime < 1 and self._stopping.wait(1):
+                    break
+                self._spawn()
+
+        self.stop()
+
+    def stop(self):
+        """Stop workers gracefully, then forcibly after graceful_timeout"""
+        print("[INFO] Shutting down workers...")
+        for pid in list(self._children):
+            try:
+                os.kill(pid, signal.SIGTERM)
+            except ProcessLookupError:
+                pass
+
+        deadline = time.monotonic() + self.graceful_timeout
+        while self._children and time.monotonic() < deadline:
+            self._reap()
+            time.sleep(0.05)
+
+        for pid in list(self._children):
+            print(f"[WARNING] Worker {pid} did not stop in time, killing it")
+            try:
+                os.kill(pid, signal.SIGKILL)
+                os.waitpid(pid, 0)
+            except (ProcessLookupError, ChildProcessError):
+                pass
+            self._children.pop(pid, None)
+
+        self.server.server_close()
+        print("[INFO] Server stopped")
+
+
+def serve(host: str = '0.0.0.0', port: int = 5000, workers: int = None, concurrency: str = 'process',
+          threads: int = 64, warmup: bool = True, graceful_timeout: float = 30,
+          dataset_timeout: Optional[float] = None):
+    """
+    Preload, warm up, then serve
+
+    Args:
+        host: Interface to bind
+        port: Port to bind
+        workers: Worker processes (process concurrency only; default CPU count)
+        threads: Request threads per worker process (process concurrency only)
+        concurrency: 'process' for preforked workers, 'thread' for one threaded process,
+            'async' for one asyncio process
+        warmup: Run a warmup inference before accepting traffic
+        graceful_timeout: Seconds in-flight requests get to finish on shutdown
+        dataset_timeout: Seconds to wait for datasets before forking; None waits until loaded
+    """
+    if concurrency == 'process' and not hasattr(os, 'fork'):
+        print("[WARNING] os.fork is unavailable on this platform; using thread concurrency")
+        concurrency = 'thread'
+
+    app = preload(warmup=warmup, dataset_timeout=dataset_timeout)
+
+    if concurrency == 'thread':
+        serve_threaded(app, host, port, graceful_timeout)
+    elif concurrency == 'async':
+        serve_async(host, port, graceful_timeout)
+    else:
+        PreforkServer(app, host, port, workers or os.cpu_count() or 1, threads, graceful_timeout).serve_forever()
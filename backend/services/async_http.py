@@ -0,0 +1,55 @@
+# ========================
+# SHARED ASYNC HTTP CLIENT
+# Outbound calls made from the ASGI serving path
+# ========================
+
+import asyncio
+import os
+from typing import TYPE_CHECKING, Optional
+
+if TYPE_CHECKING:
+    import httpx
+
+_client: Optional['httpx.AsyncClient'] = None
+_client_loop: Optional[asyncio.AbstractEventLoop] = None
+
+
+def _after_fork_in_child():
+    # The parent's connections and event loop are not usable here
+    global _client, _client_loop
+    _client = None
+    _client_loop = None
+
+
+os.register_at_fork(after_in_child=_after_fork_in_child)
+
+
+def get_async_client() -> 'httpx.AsyncClient':
+    """
+    Return the keep-alive client of the running event loop
+
+    The async counterpart of http_session.get_session: Google CSE queries
+    and website probes awaited by the ASGI app share one connection pool.
+    A client is bound to the loop it was created on, so a new loop gets a
+    new client. Only one event loop thread uses it, so no lock is needed.
+    """
+    global _client, _client_loop
+    loop = asyncio.get_running_loop()
+    if _client is None or _client_loop is not loop:
+        import httpx
+
+        pool_size = int(os.getenv('HTTP_POOL_SIZE', '32'))
+        _client = httpx.AsyncClient(limits=httpx.Limits(
+            max_connections=int(os.getenv('ASYNC_HTTP_MAX_CONNECTIONS', '512')),
+            max_keepalive_connections=pool_size
+        ))
+        _client_loop = loop
+    return _client
+
+
+async def close_async_client():
+    """Close the running loop's client, if it has one"""
+    global _client, _client_loop
+    if _client is not None and _client_loop is asyncio.get_running_loop():
+        client, _client, _client_loop = _client, None, None
+        await client.aclose()
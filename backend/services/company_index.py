@@ -0,0 +1,263 @@
+# ========================
+# KNOWN COMPANIES INDEX
+# ========================
+
+import json
+import os
+import re
+import threading
+from collections import deque
+from typing import Dict, Iterable, List, Optional
+
+# pyahocorasick is optional; the pure-Python automaton below is used without it
+try:
+    import ahocorasick
+    HAS_PYAHOCORASICK = True
+except ImportError:
+    HAS_PYAHOCORASICK = False
+
+_NON_ALNUM = re.compile(r'[^a-z0-9]+')
+
+
+def normalize_name(name: str) -> str:
+    """Lowercase and collapse punctuation/whitespace to single spaces"""
+    return _NON_ALNUM.sub(' ', str(name or '').lower()).strip()
+
+
+class AhoCorasick:
+    """
+    Multi-pattern substring matcher
+
+    Finds every pattern occurring in a text in one pass, independent of
+    how many patterns were added. Each pattern carries a payload.
+    """
+
+    def __init__(self, patterns: Iterable = (), native: bool = True):
+        """
+        Args:
+            patterns: Iterable of (pattern, payload) pairs
+            native: Use pyahocorasick when installed; False always builds the
+                pure-Python tables (needed for tables())
+        """
+        self._goto = [{}]
+        self._fail = [0]
+        self._out = [[]]
+        self._automaton = None
+
+        items = [(p, payload) for p, payload in patterns if p]
+        if HAS_PYAHOCORASICK and native:
+            self._automaton = ahocorasick.Automaton()
+            for pattern, payload in items:
+                existing = self._automaton.get(pattern, None)
+                self._automaton.add_word(pattern, (existing or []) + [(len(pattern), payload)])
+            if items:
+                self._automaton.make_automaton()
+            else:
+                self._automaton = None
+            return
+
+        for pattern, payload in items:
+            self._add(pattern, payload)
+        self._build()
+
+    def _add(self, pattern: str, payload):
+        state = 0
+        for ch in pattern:
+            nxt = self._goto[state].get(ch)
+            if nxt is None:
+                nxt = len(self._goto)
+                self._goto[state][ch] = nxt
+                self._goto.append({})
+                self._fail.append(0)
+                self._out.append([])
+            state = nxt
+        self._out[state].append((len(pattern), payload))
+
+    def _build(self):
+        """Compute failure links breadth-first and merge outputs along them"""
+        queue = deque(self._goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for ch, nxt in self._goto[state].items():
+                queue.append(nxt)
+                fallback = self._fail[state]
+                while fallback and ch not in self._goto[fallback]:
+                    fallback = self._fail[fallback]
+                target = self._goto[fallback].get(ch, 0)
+                self._fail[nxt] = target if target != nxt else 0
+                if self._out[self._fail[nxt]]:
+                    self._out[nxt] = self._out[nxt] + self._out[self._fail[nxt]]
+
+    def tables(self) -> dict:
+        """
+        Pure-Python transition, failure and output tables, JSON-serializable
+        when payloads are
+        """
+        if self._automaton is not None:
+            raise ValueError('tables() needs an automaton built with native=False')
+        return {'goto': self._goto, 'fail': self._fail, 'out': self._out}
+
+    @classmethod
+    def from_tables(cls, tables: dict) -> 'AhoCorasick':
+        """Rebuild an automaton from tables(), skipping construction"""
+        automaton = cls()
+        automaton._goto = tables['goto']
+        automaton._fail = tables['fail']
+        automaton._out = [[tuple(entry) for entry in out] for out in tables['out']]
+        return automaton
+
+    def iter_matches(self, text: str):
+        """
+        Yield (start, end, payload) for every pattern occurrence in text
+        """
+        if self._automaton is not None:
+            for end, payloads in self._automaton.iter(text):
+                for length, payload in payloads:
+                    yield end + 1 - length, end + 1, payload
+            return
+
+        goto, fail, out = self._goto, self._fail, self._out
+        state = 0
+        for i, ch in enumerate(text):
+            while state and ch not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(ch, 0)
+            for length, payload in out[state]:
+                yield i + 1 - length, i + 1, payload
+
+    def first_match(self, text: str):
+        """Return the payload of the first match in text, or None"""
+        for _, _, payload in self.iter_matches(text):
+            return payload
+        return None
+
+
+class CompanyIndex:
+    """
+    Purpose: Constant-time lookups against the known-companies database
+    Allowed: Loading, normalizing and indexing company names
+    Forbidden: Scoring, network calls
+
+    The JSON file is parsed once and rebuilt only when its mtime changes.
+    A name matches when it equals a known company, contains one (Aho-Corasick),
+    or is a contiguous run of words inside one (token inverted index).
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._mtime = None
+        self._lock = threading.Lock()
+        # (names, padded normalized names, exact map, token postings, automaton),
+        # replaced as a whole so readers never see a half-built index
+        self._state = ([], [], {}, {}, AhoCorasick())
+
+    def __len__(self) -> int:
+        self._ensure_current()
+        return len(self._state[0])
+
+    def _ensure_current(self):
+        """Rebuild the index if the source file appeared, changed or vanished"""
+        try:
+            mtime = os.stat(self.path).st_mtime_ns
+        except OSError:
+            mtime = None
+        if mtime == self._mtime:
+            return
+
+        with self._lock:
+            if mtime == self._mtime:
+                return
+            names = self._read_names() if mtime is not None else []
+            self._build(names)
+            self._mtime = mtime
+
+    def _read_names(self) -> List[str]:
+        """Read company names from the list or {'companies': [...]} JSON formats"""
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            if isinstance(data, dict):
+                data = data.get('companies', [])
+            if not isinstance(data, list):
+                return []
+            return [item if isinstance(item, str) else item.get('name', '') for item in data]
+        except Exception as e:
+            print(f"[ERROR] Failed to load known companies: {e}")
+            return []
+
+    def _build(self, raw_names: List[str]):
+        """Build all structures first, then swap them in together"""
+        names = []
+        normalized = []
+        exact = {}
+        tokens = {}
+        for raw in raw_names:
+            name = normalize_name(raw)
+            if not name or name in exact:
+                continue
+            idx = len(names)
+            names.append(raw)
+            normalized.append(f' {name} ')
+            exact[name] = idx
+            for token in name.split():
+                tokens.setdefault(token, set()).add(idx)
+
+        automaton = AhoCorasick((f' {name} ', idx) for name, idx in exact.items())
+        self._state = (names, normalized, exact, tokens, automaton)
+        print(f"[INFO] Indexed {len(names)} known companies from {os.path.basename(self.path)}")
+
+    def match(self, company_name: str) -> Optional[str]:
+        """
+        Find a known company matching the given name
+
+        Args:
+            company_name: Company name as submitted
+
+        Returns:
+            str: Matching known company name, or None
+        """
+        self._ensure_current()
+        query = normalize_name(company_name)
+        if not query:
+            return None
+
+        names, normalized, exact, tokens, automaton = self._state
+
+        idx = exact.get(query)
+        if idx is not None:
+            return names[idx]
+
+        # Known name contained in the submitted one (word-aligned)
+        idx = automaton.first_match(f' {query} ')
+        if idx is not None:
+            return names[idx]
+
+        # Submitted name is a run of words inside a known name
+        query_tokens = query.split()
+        postings = [tokens.get(t) for t in query_tokens]
+        if not all(postings):
+            return None
+        postings.sort(key=len)
+        candidates = postings[0].intersection(*postings[1:]) if len(postings) > 1 else postings[0]
+        padded = f' {query} '
+        for idx in candidates:
+            if padded in normalized[idx]:
+                return names[idx]
+        return None
+
+
+_indexes: Dict[str, CompanyIndex] = {}
+_indexes_lock = threading.Lock()
+
+
+def get_company_index(path: str) -> CompanyIndex:
+    """Shared index per data file, so every verifier reuses the same structures"""
+    path = os.path.abspath(path)
+    index = _indexes.get(path)
+    if index is None:
+        with _indexes_lock:
+            index = _indexes.get(path)
+            if index is None:
+                index = CompanyIndex(path)
+                _indexes[path] = index
+    return index
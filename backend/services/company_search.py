@@ -7,9 +7,10 @@ Requires environment variables:
 
 import os
 import re
-import requests
 from typing import Optional
 
+from services import google_cse
+
 
 class CompanySearcher:
     """Search for a company website using Google Custom Search API."""
@@ -35,21 +36,21 @@ class CompanySearcher:
             raise RuntimeError("Google CSE API key or CX not configured")
 
         query = f"{company_name} official website"
-        params = {
-            "key": self.api_key,
-            "cx": self.cx,
-            "q": query,
-            "num": 5,
-        }
-
-        resp = requests.get(
-            "https://www.googleapis.com/customsearch/v1",
-            params=params,
-            timeout=10,
-        )
+        resp = google_cse.search(query, self.api_key, self.cx, num=5, timeout=10)
+        resp.raise_for_status()
+        return self._best_link(resp.json(), company_name)
+
+    async def search_company_async(self, company_name: str) -> Optional[str]:
+        """search_company() for the ASGI path, over the shared async client."""
+        if not self.api_key or not self.cx:
+            raise RuntimeError("Google CSE API key or CX not configured")
+
+        query = f"{company_name} official website"
+        resp = await google_cse.search_async(query, self.api_key, self.cx, num=5, timeout=10)
         resp.raise_for_status()
-        data = resp.json()
+        return self._best_link(resp.json(), company_name)
 
+    def _best_link(self, data: dict, company_name: str) -> Optional[str]:
         items = data.get("items", [])
         if not items:
             return None
@@ -4,11 +4,20 @@
 
 import re
 import os
-import requests
+import copy
+import asyncio
 from urllib.parse import quote
-from typing import Dict, Any
+from typing import Dict, Any, List, Tuple, Callable
+from concurrent.futures import FIRST_COMPLETED, wait
 import time
 
+from services import google_cse
+from services.verification_cache import VerificationCache, get_default_cache
+from services.company_index import get_company_index
+from services.website_prober import get_website_prober
+
+KNOWN_COMPANIES_PATH = os.path.join(os.path.dirname(__file__), '..', 'data', 'legitimate_companies.json')
+
 class CompanyVerifier:
     """
     Verifies company legitimacy by searching online sources.
@@ -16,12 +25,20 @@ class CompanyVerifier:
     Uses Google Custom Search API for real verification.
     """
     
-    def __init__(self):
+    def __init__(self, cache: VerificationCache = None):
+        self.cache = cache or get_default_cache()
+        # Indexed once per process and reloaded only when the file changes
+        self.known_companies = get_company_index(KNOWN_COMPANIES_PATH)
         self.headers = {
             'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36'
         }
         self.timeout = 10
         
+        # Stop the scam-query fan-out once this many indicators are found
+        self.early_stop_indicators = int(os.getenv('GOOGLE_CSE_EARLY_STOP_INDICATORS', '3'))
+        # Scam queries sent at once; the rest wait, so an early stop never sends them
+        self.max_queries_in_flight = max(1, int(os.getenv('GOOGLE_CSE_MAX_IN_FLIGHT') or 2))
+        
         # Load API keys from environment
         self.google_api_key = os.getenv('GOOGLE_CSE_API_KEY', '')
         self.google_cse_id = os.getenv('GOOGLE_CSE_ENGINE_ID', '')
@@ -46,6 +63,7 @@ class CompanyVerifier:
     def verify_company(self, company_name: str, website: str = None) -> Dict[str, Any]:
         """
         Verify company safety by checking multiple online sources.
+        Results are served from the verification cache when available.
         
         Args:
             company_name (str): Name of the company to verify
@@ -54,6 +72,88 @@ class CompanyVerifier:
         Returns:
             Dict: Verification results with safety score and details
         """
+        key = VerificationCache.make_key(company_name, website)
+        cached, state = self.cache.get(key)
+        
+        if cached is None:
+            results, positive = self._verify_for_cache(company_name, website)
+            if positive is not None:
+                self.cache.set(key, results, positive)
+        else:
+            results = cached
+            if state == 'stale':
+                # Serve the old result now and recompute it off the request path
+                self.cache.refresh_async(key, lambda: self._verify_for_cache(company_name, website))
+        
+        return self._served(results, cached, state)
+    
+    async def verify_company_async(self, company_name: str, website: str = None) -> Dict[str, Any]:
+        """
+        verify_company() for the ASGI path
+        
+        Google CSE queries and the website probe are awaited on the event
+        loop, concurrently, instead of holding a thread. Stale entries are
+        still refreshed on the cache's own threads, and cache calls that
+        reach SQLite run off the loop.
+        """
+        key = VerificationCache.make_key(company_name, website)
+        cached, state = await self._cache_call(self.cache.get, key)
+        
+        if cached is None:
+            results, positive = self._classify(await self._verify_company_uncached_async(company_name, website))
+            if positive is not None:
+                await self._cache_call(self.cache.set, key, results, positive)
+        else:
+            results = cached
+            if state == 'stale':
+                self.cache.refresh_async(key, lambda: self._verify_for_cache(company_name, website))
+        
+        return self._served(results, cached, state)
+    
+    async def _cache_call(self, func, *args):
+        """Call a cache method, on a thread when it may run a SQLite query"""
+        if self.cache.persistent:
+            return await asyncio.to_thread(func, *args)
+        return func(*args)
+    
+    def _served(self, results: Dict[str, Any], cached, state: str) -> Dict[str, Any]:
+        # Copy so callers never mutate the cached entry
+        results = copy.deepcopy(results)
+        results['cache'] = dict(self.cache.stats(), status='hit' if cached is not None else 'miss', state=state)
+        return results
+    
+    def _verify_for_cache(self, company_name: str, website: str = None):
+        """Run a full verification; returns (results, positive) with positive None for errors"""
+        return self._classify(self._verify_company_uncached(company_name, website))
+    
+    @staticmethod
+    def _classify(results: Dict[str, Any]):
+        if results.get('verification_status') == 'ERROR':
+            return results, None
+        if results.get('google_cse_skipped'):
+            # Cached only briefly, so the full check runs once Google CSE is back
+            return results, False
+        return results, results.get('verification_status') in ('SAFE', 'LIKELY_SAFE')
+    
+    async def _verify_company_uncached_async(self, company_name: str, website: str = None) -> Dict[str, Any]:
+        """Run the network checks concurrently, then score as _verify_company_uncached does"""
+        try:
+            checks = [self._check_scam_reports_async(company_name)]
+            if website:
+                checks.append(self._verify_website_async(website))
+            scam_check, *website_check = await asyncio.gather(*checks)
+        except Exception as e:
+            return self._verification_error(company_name, e)
+        return self._verify_company_uncached(company_name, website, scam_check, website_check[0] if website_check else None)
+    
+    def _verify_company_uncached(self, company_name: str, website: str = None,
+                                 scam_check: Dict[str, Any] = None, website_check: Dict[str, Any] = None) -> Dict[str, Any]:
+        """
+        Check all online sources for the company without consulting the cache
+        
+        scam_check and website_check, when given, are used instead of
+        running those checks (the async path runs them itself).
+        """
         try:
             print(f"[DEBUG] Verifying company: '{company_name}'")  # Debug logging
             
@@ -71,9 +171,13 @@ class CompanyVerifier:
             }
             
             # 1. Check for scam keywords in search results
-            scam_check = self._check_scam_reports(company_name)
+            if scam_check is None:
+                scam_check = self._check_scam_reports(company_name)
             results['checks_performed'].append('scam_report_check')
             results['scam_reports_found'] = scam_check['has_scam_reports']
+            if scam_check.get('api_skipped'):
+                # Pattern-only because of the Google CSE budget or breaker
+                results['google_cse_skipped'] = scam_check['api_skipped']
             
             if scam_check['has_scam_reports']:
                 results['negative_indicators'].extend(scam_check['indicators'])
@@ -85,7 +189,8 @@ class CompanyVerifier:
             
             # 2. Check website validity
             if website:
-                website_check = self._verify_website(website)
+                if website_check is None:
+                    website_check = self._verify_website(website)
                 results['checks_performed'].append('website_verification')
                 results['has_official_website'] = website_check['is_valid']
                 
@@ -138,16 +243,32 @@ class CompanyVerifier:
             return results
             
         except Exception as e:
-            return {
-                'company_name': company_name,
-                'error': str(e),
-                'safety_score': 0.5,
-                'verification_status': 'ERROR',
-                'warnings': ['Unable to complete verification']
-            }
+            return self._verification_error(company_name, e)
+    
+    @staticmethod
+    def _verification_error(company_name: str, error: Exception) -> Dict[str, Any]:
+        return {
+            'company_name': company_name,
+            'error': str(error),
+            'safety_score': 0.5,
+            'verification_status': 'ERROR',
+            'warnings': ['Unable to complete verification']
+        }
     
-    def _check_scam_reports(self, company_name: str) -> Dict[str, Any]:
-        """Check for scam reports using Google Custom Search API or patterns"""
+    async def _check_scam_reports_async(self, company_name: str) -> Dict[str, Any]:
+        """_check_scam_reports with the Google CSE queries awaited"""
+        api_results = None
+        if self.google_api_key and self.google_cse_id:
+            api_results = await self._search_google_cse_async(company_name)
+        return self._check_scam_reports(company_name, api_results)
+    
+    def _check_scam_reports(self, company_name: str, api_results: Dict[str, Any] = None) -> Dict[str, Any]:
+        """
+        Check for scam reports using Google Custom Search API or patterns
+        
+        api_results, when given, is used instead of running the Google CSE
+        queries.
+        """
         try:
             indicators = []
             has_scam_reports = False
@@ -178,33 +299,43 @@ class CompanyVerifier:
                 indicators.append('Company name has repeated words (unusual pattern)')
             
             # Try Google Custom Search API if available
+            skipped = None
             if self.google_api_key and self.google_cse_id:
-                api_results = self._search_google_cse(company_name)
-                if api_results['found_scam_reports']:
-                    indicators.extend(api_results['indicators'])
-                    has_scam_reports = True
-                    print(f"[API] Google CSE found potential scam reports for {company_name}")
-                else:
-                    print(f"[API] Google CSE search completed for {company_name}")
-                
-                return {
-                    'has_scam_reports': has_scam_reports,
-                    'indicators': indicators,
-                    'search_query': f'"{company_name}" scam fraud complaint',
-                    'api_used': 'google_cse',
-                    'checked_patterns': len(suspicious_patterns),
-                    'search_results': api_results.get('result_count', 0)
-                }
+                if api_results is None:
+                    api_results = self._search_google_cse(company_name)
+                skipped = api_results.get('skipped')
+                if not skipped:
+                    if api_results['found_scam_reports']:
+                        indicators.extend(api_results['indicators'])
+                        has_scam_reports = True
+                        print(f"[API] Google CSE found potential scam reports for {company_name}")
+                    else:
+                        print(f"[API] Google CSE search completed for {company_name}")
+                    
+                    return {
+                        'has_scam_reports': has_scam_reports,
+                        'indicators': indicators,
+                        'search_query': f'"{company_name}" scam fraud complaint',
+                        'api_used': 'google_cse',
+                        'checked_patterns': len(suspicious_patterns),
+                        'search_results': api_results.get('result_count', 0)
+                    }
+            
+            # Fallback to pattern-based detection
+            if skipped:
+                print(f"[WARNING] Google CSE unavailable ({skipped}). Using pattern-based detection for {company_name}")
             else:
-                # Fallback to pattern-based detection
                 print(f"[WARNING] Google CSE API not configured. Using pattern-based detection for {company_name}")
-                return {
-                    'has_scam_reports': has_scam_reports,
-                    'indicators': indicators,
-                    'search_query': f'"{company_name}" scam fraud complaint',
-                    'api_used': 'patterns_only',
-                    'checked_patterns': len(suspicious_patterns)
-                }
+            result = {
+                'has_scam_reports': has_scam_reports,
+                'indicators': indicators,
+                'search_query': f'"{company_name}" scam fraud complaint',
+                'api_used': 'patterns_only',
+                'checked_patterns': len(suspicious_patterns)
+            }
+            if skipped:
+                result['api_skipped'] = skipped
+            return result
             
         except Exception as e:
             print(f"[ERROR] Scam report check failed: {e}")
@@ -217,115 +348,141 @@ class CompanyVerifier:
     def _search_google_cse(self, company_name: str) -> Dict[str, Any]:
         """Search for company information using Google Custom Search API"""
         try:
-            search_queries = [
-                f'"{company_name}" scam',
-                f'"{company_name}" fraud',
-                f'"{company_name}" internship scam complaint',
-                f'"{company_name}" fake internship'
-            ]
-            
-            all_indicators = []
-            total_results = 0
-            scam_keywords = ['scam', 'fraud', 'fake', 'complaint', 'warning', 'avoid', 'beware']
-            
-            for query in search_queries:
-                try:
-                    url = 'https://www.googleapis.com/customsearch/v1'
-                    params = {
-                        'q': query,
-                        'key': self.google_api_key,
-                        'cx': self.google_cse_id,
-                        'num': 5  # Limit to 5 results per query to save quota
-                    }
-                    
-                    response = requests.get(url, params=params, timeout=self.timeout)
-                    
-                    if response.status_code == 200:
-                        data = response.json()
-                        
-                        if 'items' in data:
-                            total_results += len(data.get('items', []))
-                            
-                            # Analyze search results
-                            for item in data.get('items', []):
-                                title = item.get('title', '').lower()
-                                snippet = item.get('snippet', '').lower()
-                                
-                                # Check for scam indicators in results
-                                for keyword in scam_keywords:
-                                    if keyword in title or keyword in snippet:
-                                        indicator = f"Found '{keyword}' in search result: {item.get('title', 'N/A')[:60]}"
-                                        if indicator not in all_indicators:
-                                            all_indicators.append(indicator)
-                                        break
-                        
-                        print(f"[DEBUG] Google CSE query '{query}' returned {len(data.get('items', []))} results")
-                    
-                    elif response.status_code == 403:
-                        print("[WARNING] Google CSE API quota exceeded or invalid credentials")
-                        break
-                    elif response.status_code == 400:
-                        print(f"[WARNING] Invalid Google CSE query: {response.text}")
+            import requests
+            
+            # Rate limit, quota or breaker would refuse every query
+            blocked = google_cse.blocked_reason()
+            if blocked:
+                return {'skipped': blocked}
+            
+            search = _ScamSearch(self, company_name, requests.exceptions.Timeout, lambda query: (
+                google_cse.fanout_pool.submit(
+                    google_cse.search, query, self.google_api_key, self.google_cse_id,
+                    5,  # Limit to 5 results per query to save quota
+                    self.timeout
+                )
+            ))
+            try:
+                while search.pending:
+                    done, _ = wait(search.pending, return_when=FIRST_COMPLETED)
+                    search.collect(done)
+            finally:
+                search.cancel()
+            return search.result()
+        
+        except Exception as e:
+            return self._cse_error(e)
+    
+    async def _search_google_cse_async(self, company_name: str) -> Dict[str, Any]:
+        """_search_google_cse with the queries awaited instead of run on the fan-out pool"""
+        try:
+            import httpx
+            
+            blocked = await google_cse.blocked_reason_async()
+            if blocked:
+                return {'skipped': blocked}
+            
+            search = _ScamSearch(self, company_name, httpx.TimeoutException, lambda query: (
+                asyncio.ensure_future(google_cse.search_async(
+                    query, self.google_api_key, self.google_cse_id, 5, self.timeout
+                ))
+            ))
+            try:
+                while search.pending:
+                    done, _ = await asyncio.wait(search.pending, return_when=asyncio.FIRST_COMPLETED)
+                    search.collect(done)
+            finally:
+                search.cancel()
+            return search.result()
+        
+        except Exception as e:
+            return self._cse_error(e)
+    
+    @staticmethod
+    def _cse_error(error: Exception) -> Dict[str, Any]:
+        print(f"[ERROR] Google CSE search failed: {error}")
+        return {
+            'found_scam_reports': False,
+            'indicators': [],
+            'error': str(error)
+        }
+    
+    @staticmethod
+    def _scam_queries(company_name: str) -> List[str]:
+        return [
+            f'"{company_name}" scam',
+            f'"{company_name}" fraud',
+            f'"{company_name}" internship scam complaint',
+            f'"{company_name}" fake internship'
+        ]
+    
+    def _read_cse_response(self, query: str, response, all_indicators: List[str]) -> Tuple[int, bool]:
+        """
+        Collect scam indicators from one Google CSE response
+        
+        Args:
+            query: Query the response answers
+            response: requests or httpx response
+            all_indicators: Indicators found so far; new ones are appended
+        
+        Returns:
+            tuple: (results in the response, whether the quota or rate limit is exhausted)
+        """
+        scam_keywords = ['scam', 'fraud', 'fake', 'complaint', 'warning', 'avoid', 'beware']
+        
+        if response.status_code == 200:
+            data = response.json()
+            items = data.get('items', [])
+            
+            # Analyze search results
+            for item in items:
+                title = item.get('title', '').lower()
+                snippet = item.get('snippet', '').lower()
                 
-                except requests.exceptions.Timeout:
-                    print(f"[WARNING] Google CSE API timeout for query: {query}")
-                except Exception as e:
-                    print(f"[WARNING] Google CSE API error for query '{query}': {e}")
+                # Check for scam indicators in results
+                for keyword in scam_keywords:
+                    if keyword in title or keyword in snippet:
+                        indicator = f"Found '{keyword}' in search result: {item.get('title', 'N/A')[:60]}"
+                        if indicator not in all_indicators:
+                            all_indicators.append(indicator)
+                        break
             
-            return {
-                'found_scam_reports': len(all_indicators) > 0,
-                'indicators': all_indicators,
-                'result_count': total_results,
-                'queries_executed': len(search_queries)
-            }
+            print(f"[DEBUG] Google CSE query '{query}' returned {len(items)} results")
+            return len(items), False
         
-        except Exception as e:
-            print(f"[ERROR] Google CSE search failed: {e}")
-            return {
-                'found_scam_reports': False,
-                'indicators': [],
-                'error': str(e)
-            }
+        if response.status_code == 403:
+            print("[WARNING] Google CSE API quota exceeded or invalid credentials")
+            return 0, True
+        if response.status_code == 429:
+            print("[WARNING] Google CSE API rate limit exceeded")
+            return 0, True
+        if response.status_code == 400:
+            print(f"[WARNING] Invalid Google CSE query: {response.text}")
+        return 0, False
     
     def _verify_website(self, website: str) -> Dict[str, Any]:
         """Verify if website is accessible and valid"""
-        try:
-            # Ensure URL has scheme
-            if not website.startswith(('http://', 'https://')):
-                website = 'https://' + website
-            
-            # Try to access the website
-            response = requests.head(website, headers=self.headers, timeout=self.timeout, allow_redirects=True)
-            
-            return {
-                'is_valid': response.status_code == 200,
-                'has_https': website.startswith('https://'),
-                'status_code': response.status_code,
-                'accessible': True
-            }
-            
-        except requests.exceptions.SSLError:
-            # SSL error might indicate security issue
-            return {
-                'is_valid': False,
-                'has_https': False,
-                'error': 'SSL Certificate Error',
-                'accessible': False
-            }
-        except requests.exceptions.Timeout:
-            return {
-                'is_valid': False,
-                'has_https': website.startswith('https://') if website else False,
-                'error': 'Timeout',
-                'accessible': False
-            }
-        except Exception as e:
-            return {
-                'is_valid': False,
-                'has_https': False,
-                'error': str(e),
-                'accessible': False
-            }
+        return self._website_result(get_website_prober().probe(website))
+    
+    @staticmethod
+    def _website_result(probe: Dict[str, Any]) -> Dict[str, Any]:
+        result = {
+            'is_valid': probe['status_code'] == 200,
+            'has_https': probe['url'].startswith('https://') and probe['tls_valid'] is not False,
+            'accessible': probe['accessible'],
+            'tls_valid': probe['tls_valid'],
+            'redirects': probe['redirects'],
+            'final_url': probe['final_url']
+        }
+        if probe['accessible']:
+            result['status_code'] = probe['status_code']
+        else:
+            result['error'] = probe['error']
+        return result
+    
+    async def _verify_website_async(self, website: str) -> Dict[str, Any]:
+        """_verify_website over the async client"""
+        return self._website_result(await get_website_prober().probe_async(website))
     
     def _check_online_presence(self, company_name: str) -> Dict[str, Any]:
         """Check for company's online presence"""
@@ -333,21 +490,16 @@ class CompanyVerifier:
             # WITHOUT API: We cannot verify actual online presence
             # Be conservative and return low scores unless we have real data
             
-            # Load known legitimate companies from local database
-            known_companies = self._load_known_companies()
-            
             # Check if company is in our verified database
-            company_lower = company_name.lower()
-            for known in known_companies:
-                if known.lower() in company_lower or company_lower in known.lower():
-                    print(f"[INFO] {company_name} found in verified companies database")
-                    return {
-                        'result_count': 10,
-                        'confidence': 'very_high',
-                        'legitimate_indicators': 3,
-                        'search_performed': True,
-                        'verified_source': 'local_database'
-                    }
+            if self.known_companies.match(company_name):
+                print(f"[INFO] {company_name} found in verified companies database")
+                return {
+                    'result_count': 10,
+                    'confidence': 'very_high',
+                    'legitimate_indicators': 3,
+                    'search_performed': True,
+                    'verified_source': 'local_database'
+                }
             
             # If NOT in database and NO API configured, be very conservative
             if not (self.google_api_key and self.google_cse_id):
@@ -383,18 +535,14 @@ class CompanyVerifier:
             # WITHOUT API: We cannot verify actual platform presence
             # Only return platforms if company is in our verified database
             
-            known_companies = self._load_known_companies()
-            company_lower = company_name.lower()
-            
             # Only assign platforms if company is verified
-            for known in known_companies:
-                if known.lower() in company_lower or company_lower in known.lower():
-                    return {
-                        'found_on_platforms': True,
-                        'platforms': ['LinkedIn'],
-                        'confidence': 'verified',
-                        'platforms_checked': ['LinkedIn', 'Glassdoor', 'Indeed', 'Naukri']
-                    }
+            if self.known_companies.match(company_name):
+                return {
+                    'found_on_platforms': True,
+                    'platforms': ['LinkedIn'],
+                    'confidence': 'verified',
+                    'platforms_checked': ['LinkedIn', 'Glassdoor', 'Indeed', 'Naukri']
+                }
             
             # Unknown companies get NO platform verification
             print(f"[WARNING] {company_name} not found in verified database - no platform confirmation")
@@ -412,22 +560,83 @@ class CompanyVerifier:
                 'platforms': [],
                 'error': str(e)
             }
+
+
+class _ScamSearch:
+    """
+    Purpose: Plan the Google CSE scam queries for one company and merge their answers
+    Allowed: Query order, in-flight cap, early stop, result assembly
+    Forbidden: Sending requests, waiting
+
+    Queries go out in order, at most max_queries_in_flight at a time, and
+    are handled as they come back; once stopping, the unsent ones are never
+    sent. The caller only submits queries (send returns a future or task)
+    and waits on pending, so the thread and asyncio paths share this.
+    """
     
-    def _load_known_companies(self) -> list:
-        """Load list of known legitimate companies from local database"""
-        try:
-            import json
-            data_path = os.path.join(os.path.dirname(__file__), '..', 'data', 'legitimate_companies.json')
-            if os.path.exists(data_path):
-                with open(data_path, 'r', encoding='utf-8') as f:
-                    data = json.load(f)
-                    # Handle both list and dict formats
-                    if isinstance(data, list):
-                        return [item if isinstance(item, str) else item.get('name', '') for item in data]
-                    elif isinstance(data, dict) and 'companies' in data:
-                        return [item if isinstance(item, str) else item.get('name', '') for item in data['companies']]
-                    return []
-            return []
-        except Exception as e:
-            print(f"[ERROR] Failed to load known companies: {e}")
-            return []
+    def __init__(self, verifier: 'CompanyVerifier', company_name: str, timeout_error: type,
+                 send: Callable[[str], Any]):
+        self.verifier = verifier
+        self.timeout_error = timeout_error
+        self.send = send
+        self.queries = iter(verifier._scam_queries(company_name))
+        # Future or task -> query
+        self.pending = {}
+        self.indicators = []
+        self.total_results = 0
+        self.executed = 0
+        self.answered = 0
+        self.denied = None
+        for _ in range(verifier.max_queries_in_flight):
+            self._send_next()
+    
+    def collect(self, done):
+        """Handle finished queries, then send the next ones or stop"""
+        stop = False
+        for future in done:
+            query = self.pending.pop(future)
+            self.executed += 1
+            try:
+                result_count, quota_exceeded = self.verifier._read_cse_response(query, future.result(), self.indicators)
+                self.answered += 1
+                self.total_results += result_count
+                stop = stop or quota_exceeded
+            except google_cse.BudgetDenied as e:
+                print(f"[WARNING] Google CSE query not sent: {e}")
+                self.denied = e.reason
+                stop = True
+            except self.timeout_error:
+                print(f"[WARNING] Google CSE API timeout for query: {query}")
+            except Exception as e:
+                print(f"[WARNING] Google CSE API error for query '{query}': {e}")
+        
+        # Enough evidence already - skip the queries that have not been sent
+        if len(self.indicators) >= self.verifier.early_stop_indicators:
+            print(f"[DEBUG] Google CSE early stop after {self.executed} queries")
+            stop = True
+        if stop:
+            self.cancel()
+        else:
+            for _ in done:
+                self._send_next()
+    
+    def cancel(self):
+        """Drop the queries still in flight"""
+        for future in self.pending:
+            future.cancel()
+        self.pending.clear()
+    
+    def result(self) -> Dict[str, Any]:
+        if self.denied and not self.answered:
+            return {'skipped': self.denied}
+        return {
+            'found_scam_reports': len(self.indicators) > 0,
+            'indicators': self.indicators,
+            'result_count': self.total_results,
+            'queries_executed': self.executed
+        }
+    
+    def _send_next(self):
+        query = next(self.queries, None)
+        if query is not None:
+            self.pending[self.send(query)] = query
@@ -2,14 +2,139 @@
 # CREDIBILITY ENGINE
 # ========================
 
-from services.url_feature_extractor import URLFeatureExtractor
-from services.sentiment_analyzer import SentimentAnalyzer
-from services.company_verifier import CompanyVerifier
-from services.dataset_validator import DatasetValidator
-from models.random_forest_inference import RandomForestPredictor
-from preprocessing.text_cleaner import TextCleaner
+from services.service_registry import get_service
+from services.verification_cache import VerificationCache
+from preprocessing.document_context import DocumentContext
 
-from typing import Dict, Any, Optional
+from concurrent.futures import Executor, Future
+from typing import TYPE_CHECKING, Dict, Any, Optional, Tuple, List, Callable, Iterator, AsyncIterator
+import asyncio
+import copy
+import os
+import queue
+import threading
+import time
+
+if TYPE_CHECKING:
+    import numpy as np
+
+# Per-stage deadlines in seconds (override with CREDIBILITY_DEADLINE_<STAGE>)
+STAGE_DEADLINES = {
+    'dataset_validation': 2.0,
+    'company_verification': 8.0,
+    'url_features': 1.0,
+    'sentiment': 5.0
+}
+DEFAULT_STAGE_DEADLINE = 5.0
+
+# Results used when a stage fails or misses its deadline
+STAGE_FALLBACKS = {
+    'dataset_validation': {
+        'dataset_score': 0.5,
+        'warnings': ['Dataset validation unavailable'],
+        'checks_performed': [],
+        'matching_patterns': []
+    },
+    'company_verification': {
+        'company_verification_score': 0.0,
+        'warnings': ['Company verification unavailable'],
+        'positive_indicators': [],
+        'cache': None
+    },
+    'url_features': {'url_score': 0.0},
+    'sentiment': {
+        'sentiment_score': 0.5,  # Same credit as a failed model run
+        'sentiment_label': 'UNKNOWN',
+        'sentiment_confidence': 0.0
+    }
+}
+
+class _StagePool:
+    """
+    Purpose: Run analysis stages on a fixed number of threads
+    Allowed: Thread bookkeeping, futures
+    Forbidden: Stage logic, deadlines
+
+    Like ThreadPoolExecutor, except that a running stage can be detached
+    once its caller has given up on it. A Python thread cannot be stopped,
+    so the detached stage finishes on its own thread, which then exits, and
+    a replacement thread takes its place. Abandoned stages therefore do not
+    starve the stages queued behind them, up to max_detached of them at a
+    time; past that, detach() leaves the stage holding its thread.
+    """
+
+    def __init__(self, max_workers: int, max_detached: Optional[int] = None):
+        self.max_workers = max_workers
+        self.max_detached = max_workers * 4 if max_detached is None else max_detached
+        self._queue = queue.SimpleQueue()
+        self._lock = threading.Lock()
+        self._workers = 0
+        # Released by a thread each time it finishes a stage, as in ThreadPoolExecutor
+        self._idle = threading.Semaphore(0)
+        self._detached = 0
+        # Running future -> [detached] flag of the thread running it
+        self._running = {}
+
+    def submit(self, func: Callable, *args) -> Future:
+        future = Future()
+        self._queue.put((future, func, args))
+        if not self._idle.acquire(blocking=False):
+            with self._lock:
+                if self._workers < self.max_workers:
+                    self._start_worker()
+        return future
+
+    def detach(self, future: Future) -> bool:
+        """Give a running stage's thread slot to a new thread; False if not possible"""
+        with self._lock:
+            flag = self._running.get(future)
+            if flag is None or flag[0] or self._detached >= self.max_detached:
+                return False
+            flag[0] = True
+            self._detached += 1
+            self._workers -= 1
+            self._start_worker()
+            return True
+
+    def _start_worker(self):
+        """Start one worker thread (lock held)"""
+        self._workers += 1
+        threading.Thread(target=self._work, name='credibility-stage', daemon=True).start()
+
+    def _work(self):
+        detached = [False]
+        while True:
+            future, func, args = self._queue.get()
+            with self._lock:
+                if not future.set_running_or_notify_cancel():
+                    self._idle.release()
+                    continue
+                self._running[future] = detached
+            try:
+                result = func(*args)
+            except BaseException as e:
+                future.set_exception(e)
+            else:
+                future.set_result(result)
+            with self._lock:
+                del self._running[future]
+                if detached[0]:
+                    self._detached -= 1
+                    return
+            self._idle.release()
+
+
+# Shared by every engine instance so concurrent requests reuse the same threads
+_stage_pool = _StagePool(int(os.getenv('CREDIBILITY_STAGE_WORKERS', '16')))
+
+
+def _after_fork_in_child():
+    # Pool threads do not survive fork; give each worker process its own
+    global _stage_pool
+    _stage_pool = _StagePool(int(os.getenv('CREDIBILITY_STAGE_WORKERS', '16')))
+
+
+os.register_at_fork(after_in_child=_after_fork_in_child)
 
 class CredibilityEngine:
     """
@@ -19,19 +144,30 @@ class CredibilityEngine:
     """
     
     def __init__(self):
-        self.url_extractor = URLFeatureExtractor()
-        self.sentiment_analyzer = SentimentAnalyzer()
-        self.company_verifier = CompanyVerifier()
-        self.dataset_validator = DatasetValidator()
-        self.rf_predictor = RandomForestPredictor()
-        self.text_cleaner = TextCleaner()
+        # Shared with the routes; see services/service_registry.py
+        self.url_extractor = get_service('url_extractor')
+        self.sentiment_analyzer = get_service('sentiment_analyzer')
+        self.company_verifier = get_service('company_verifier')
+        self.dataset_validator = get_service('dataset_validator')
+        self.rf_predictor = get_service('rf_predictor')
+        self.text_cleaner = get_service('text_cleaner')
+        
+        # Run independent stages concurrently unless explicitly disabled
+        self.concurrent_stages = os.getenv('CREDIBILITY_CONCURRENT_STAGES', '1') != '0'
+        self.stage_deadlines = {
+            name: float(os.getenv(f'CREDIBILITY_DEADLINE_{name.upper()}', default))
+            for name, default in STAGE_DEADLINES.items()
+        }
+        # Company stages one analyze_batch chunk may hold on the stage pool at once
+        self.batch_company_stages = int(os.getenv('CREDIBILITY_BATCH_COMPANY_STAGES') or 8)
     
-    def analyze(self, data: dict) -> dict:
+    def analyze(self, data: dict, precomputed: Optional[Dict[str, Tuple[dict, str]]] = None) -> dict:
         """
         Comprehensive credibility analysis
         
         Args:
             data: Internship data from frontend
+            precomputed: Optional stage name -> (result, status) computed by analyze_batch
         
         Returns:
             dict: Credibility score and breakdown
@@ -45,13 +181,11 @@ class CredibilityEngine:
             parsed = data.get('parsed', {})
             
             # Get all critical fields
-            company_name = data.get('companyName') or parsed.get('companyName')
+            company_name, job_desc, website = self._stage_inputs(data)
             contact_email = data.get('contactEmail') or parsed.get('contactEmail')
-            job_desc = data.get('jobDescription') or parsed.get('jobDescription')
             position = data.get('position') or parsed.get('position')
             salary = data.get('salary') or parsed.get('salary')
             duration = data.get('duration') or parsed.get('duration')
-            website = data.get('companyWebsite') or parsed.get('companyWebsite')
             
             print(f"[DEBUG] === INPUT DATA ===")
             print(f"[DEBUG] Company: {company_name}")
@@ -61,24 +195,11 @@ class CredibilityEngine:
             print(f"[DEBUG] Has Parsed Data: {has_parsed_data}")
             
             # INTELLIGENT VALIDATION: Allow analysis even if some optional fields are missing
-            missing_critical_fields = []
-            
-            # CRITICAL: Company name (must have something meaningful)
-            company_valid = (company_name and str(company_name).strip() and 
-                           str(company_name).strip().lower() not in ['unknown company', 'unknown', 'n/a'])
-            if not company_valid:
-                missing_critical_fields.append('Company Name')
-            
-            # CRITICAL: Job description (at least 20 characters for meaningful analysis)
-            job_desc_valid = (job_desc and str(job_desc).strip() and 
-                            len(str(job_desc).strip()) >= 20)
-            if not job_desc_valid:
-                missing_critical_fields.append('Job Description')
+            missing_critical_fields = self._missing_critical_fields(company_name, job_desc)
             
             # Return 0% if company is "Unknown Company" OR if BOTH company and job desc are missing
             # This prevents analyzing scams with invalid company names
-            if (str(company_name).strip().lower() == 'unknown company' or 
-                len(missing_critical_fields) >= 2):
+            if self._is_incomplete(company_name, missing_critical_fields):
                 return {
                     'credibility_score': 0.0,
                     'credibility_level': 'VERY_LOW',
@@ -137,39 +258,52 @@ class CredibilityEngine:
             # All fields present - proceed with full analysis
             scores = {}
             
-            # 0. Dataset validation against HuggingFace and Kaggle
-            try:
-                dataset_validation = self.dataset_validator.validate_against_datasets(
-                    company_name, 
-                    contact_email, 
-                    job_desc
+            # Lowercased/cleaned views of the job description, shared by the stages below
+            document = DocumentContext(str(job_desc), self.text_cleaner) if job_desc else None
+            
+            # Stages 0-3 are independent of each other, so they run on the shared
+            # stage pool (or inline when concurrency is disabled) under their own
+            # deadlines. A stage that misses its deadline keeps its default score.
+            stages = {
+                'dataset_validation': (
+                    lambda: self._run_dataset_stage(company_name, contact_email, job_desc, document),
+                    'dataset_validation'
+                ),
+                'company_verification': (
+                    lambda: self._run_company_stage(company_name, website),
+                    'company_verification'
                 )
-                scores['dataset_score'] = dataset_validation.get('dataset_confidence_score', 0.5)
-                dataset_warnings = dataset_validation.get('warnings', [])
-                dataset_checks = dataset_validation.get('checks_performed', [])
-                dataset_patterns = dataset_validation.get('matching_patterns', [])
-            except Exception as e:
-                print(f"[WARNING] Dataset validation failed: {e}")
-                scores['dataset_score'] = 0.5
-                dataset_warnings = ['Dataset validation unavailable']
-                dataset_checks = []
-                dataset_patterns = []
+            }
+            if website:
+                stages['url_features'] = (lambda: self._run_url_stage(website), 'url_features')
+            if job_desc:
+                stages['sentiment'] = (lambda: self._run_sentiment_stage(job_desc, document), 'sentiment')
+            
+            # Batch callers hand in stages they already computed for many postings at once
+            precomputed = precomputed or {}
+            stage_results, stage_status = self._run_stages(
+                {name: stage for name, stage in stages.items() if name not in precomputed}
+            )
+            for name in stages:
+                if name in precomputed:
+                    stage_results[name], stage_status[name] = precomputed[name]
+            
+            # 0. Dataset validation against HuggingFace and Kaggle
+            dataset_stage = stage_results['dataset_validation']
+            scores['dataset_score'] = dataset_stage['dataset_score']
+            dataset_warnings = dataset_stage['warnings']
+            dataset_checks = dataset_stage['checks_performed']
+            dataset_patterns = dataset_stage['matching_patterns']
             
             # 1. Company verification
-            try:
-                company_verification = self.company_verifier.verify_company(company_name, website)
-                scores['company_verification_score'] = company_verification.get('safety_score', 0.0)
-                verification_warnings = company_verification.get('warnings', [])
-                verification_positive = company_verification.get('positive_indicators', [])
-            except Exception:
-                scores['company_verification_score'] = 0.0
-                verification_warnings = ['Company verification unavailable']
-                verification_positive = []
+            company_stage = stage_results['company_verification']
+            scores['company_verification_score'] = company_stage['company_verification_score']
+            verification_warnings = company_stage['warnings']
+            verification_positive = company_stage['positive_indicators']
             
             # 1. URL-based features
             if website:
-                url_features = self.url_extractor.extract(website)
-                scores['url_score'] = self._score_url_features(url_features)
+                scores['url_score'] = stage_results['url_features']['url_score']
             else:
                 scores['url_score'] = 0.0  # No website provided
             
@@ -181,22 +315,15 @@ class CredibilityEngine:
             
             # 3. Sentiment analysis of job description
             if job_desc:
-                cleaned_text = self.text_cleaner.clean(job_desc)
-                print(f"[DEBUG] Analyzing sentiment for job description (length: {len(job_desc)}, cleaned: {len(cleaned_text)})")
-                sentiment = self.sentiment_analyzer.analyze(cleaned_text)
-                print(f"[DEBUG] Sentiment result: {sentiment}")
-                sentiment_score = self._score_sentiment(sentiment)
-                print(f"[DEBUG] Sentiment score: {sentiment_score}")
-                scores['sentiment_score'] = sentiment_score
-                # Store raw sentiment for debugging
-                scores['sentiment_label'] = sentiment.get('label', 'UNKNOWN')
-                scores['sentiment_confidence'] = sentiment.get('score', 0.0)
+                scores.update(stage_results['sentiment'])
             else:
                 print(f"[DEBUG] No job description provided")
                 scores['sentiment_score'] = 0.0  # Required field missing
                 scores['sentiment_label'] = 'NONE'
                 scores['sentiment_confidence'] = 0.0
             
+            scores['stage_status'] = stage_status
+            
             # 4. Verification score based on data quality
             verification_score = 0.0
             if has_parsed_data:
@@ -215,7 +342,7 @@ class CredibilityEngine:
             offer_quality_score = 0.0
             if job_desc:
                 # Check for key components in job description
-                job_desc_lower = job_desc.lower()
+                job_desc_lower = document.lower
                 
                 # Check for important offer components
                 has_responsibilities = any(word in job_desc_lower for word in ['responsibility', 'responsible', 'coordinating', 'managing', 'analyzing', 'leading', 'developing'])
@@ -310,7 +437,8 @@ class CredibilityEngine:
                 'red_flags': red_flags,
                 'company_verification': {
                     'warnings': verification_warnings,
-                    'positive_indicators': verification_positive
+                    'positive_indicators': verification_positive,
+                    'cache': company_stage['cache']
                 },
                 'dataset_validation': {
                     'checks_performed': dataset_checks,
@@ -337,7 +465,388 @@ class CredibilityEngine:
                 'credibility_level': 'ERROR'
             }
     
-    def _score_url_features(self, features: dict) -> float:
+    async def analyze_async(self, data: dict, executor: Optional[Executor] = None) -> dict:
+        """
+        analyze() for the ASGI path
+        
+        Company verification is awaited on the event loop under its stage
+        deadline; everything else is CPU work and runs as analyze() on
+        executor, with the verification handed in as precomputed.
+        
+        Args:
+            data: Internship data from frontend
+            executor: Pool for the CPU work; None uses the loop's default
+        
+        Returns:
+            dict: Credibility score and breakdown
+        """
+        inputs = self._chunk_inputs([data])
+        precomputed = {}
+        if self._complete_postings(inputs):
+            company_name, _, website = inputs[0]
+            precomputed['company_verification'] = await self._run_company_stage_async(company_name, website)
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(executor, lambda: self.analyze(data, precomputed=precomputed))
+    
+    def analyze_batch(self, items: List[dict], chunk_size: int = 32) -> Iterator[dict]:
+        """
+        Analyze many postings, yielding results in input order
+        
+        Postings are processed in chunks. Within a chunk, incomplete postings
+        are left to analyze() alone; for the rest, sentiment runs as one
+        batch_analyze call, each distinct company/website pair is verified once
+        (at most CREDIBILITY_BATCH_COMPANY_STAGES at a time) and the distinct
+        websites' URL features come from one extract_batch call. Every posting
+        then goes through analyze() with those stages precomputed.
+        
+        Args:
+            items: Internship data dicts, as accepted by analyze()
+            chunk_size: Postings per chunk; results of a chunk are yielded together
+        
+        Yields:
+            dict: Credibility result for each posting
+        """
+        for start in range(0, len(items), chunk_size):
+            yield from self._analyze_chunk(items[start:start + chunk_size])
+    
+    async def analyze_batch_async(self, items: List[dict], chunk_size: int = 32,
+                                  executor: Optional[Executor] = None) -> AsyncIterator[dict]:
+        """
+        analyze_batch() for the ASGI path
+        
+        Each chunk's distinct companies are verified concurrently on the
+        event loop, at most CREDIBILITY_BATCH_COMPANY_STAGES at a time as in
+        analyze_batch(); the rest of the chunk runs on executor.
+        """
+        loop = asyncio.get_running_loop()
+        # Acquired before a stage starts, so its deadline does not run while it waits
+        company_slots = asyncio.Semaphore(self.batch_company_stages)
+        
+        async def verify(company_name: str, website: str) -> Tuple[dict, str]:
+            async with company_slots:
+                return await self._run_company_stage_async(company_name, website)
+        
+        for start in range(0, len(items), chunk_size):
+            chunk = items[start:start + chunk_size]
+            inputs = self._chunk_inputs(chunk)
+            companies = {}
+            for i in self._complete_postings(inputs):
+                company_name, _, website = inputs[i]
+                companies.setdefault(VerificationCache.make_key(company_name, website), (company_name, website))
+            verified = await asyncio.gather(*(verify(*inputs) for inputs in companies.values()))
+            company_stages = dict(zip(companies, verified))
+            for result in await loop.run_in_executor(executor, lambda: list(self._analyze_chunk(chunk, company_stages))):
+                yield result
+    
+    def _analyze_chunk(self, chunk: List[dict],
+                       company_stages: Optional[Dict[str, Tuple[dict, str]]] = None) -> Iterator[dict]:
+        """
+        analyze_batch() for one chunk
+        
+        Args:
+            chunk: Internship data dicts
+            company_stages: Optional (result, status) of the company stage by
+                VerificationCache key, computed by the caller
+        """
+        inputs = self._chunk_inputs(chunk)
+        precomputed = [{} for _ in chunk]
+        # analyze() scores incomplete postings 0% without running any stage,
+        # and returns its error result for malformed ones
+        complete = self._complete_postings(inputs)
+        
+        # Sentiment: one model call for the whole chunk
+        with_desc = [i for i in complete if inputs[i][1]]
+        if with_desc:
+            try:
+                cleaned = self.text_cleaner.batch_clean([inputs[i][1] for i in with_desc])
+                sentiments = self.sentiment_analyzer.batch_analyze(cleaned)
+                for i, sentiment in zip(with_desc, sentiments):
+                    precomputed[i]['sentiment'] = (self._sentiment_stage_result(sentiment), 'ok')
+            except Exception as e:
+                print(f"[WARNING] Batch sentiment failed: {e}")
+                for i in with_desc:
+                    precomputed[i]['sentiment'] = (copy.deepcopy(STAGE_FALLBACKS['sentiment']), 'error')
+        
+        # Company verification: once per distinct company/website pair
+        pending_companies = {}
+        for i in complete:
+            company_name, _, website = inputs[i]
+            key = VerificationCache.make_key(company_name, website)
+            if company_stages is None and key not in pending_companies:
+                pending_companies[key] = (
+                    lambda c=company_name, w=website: self._run_company_stage(c, w),
+                    'company_verification'
+                )
+        
+        if company_stages is None:
+            company_results, company_status = self._run_stages(pending_companies, self.batch_company_stages)
+            company_stages = {key: (company_results[key], company_status[key]) for key in company_results}
+        
+        # URL features: one extract_batch call over the distinct websites
+        url_stages = self._run_url_batch_stage(list(dict.fromkeys(inputs[i][2] for i in complete if inputs[i][2])))
+        
+        for i in complete:
+            company_name, _, website = inputs[i]
+            result, status = company_stages[VerificationCache.make_key(company_name, website)]
+            precomputed[i]['company_verification'] = (copy.deepcopy(result), status)
+            if website:
+                result, status = url_stages[website]
+                precomputed[i]['url_features'] = (dict(result), status)
+        
+        for data, stages in zip(chunk, precomputed):
+            yield self.analyze(data, precomputed=stages)
+    
+    def _run_stages(self, stages: Dict[str, Tuple[Callable[[], dict], str]],
+                    max_in_flight: Optional[int] = None) -> Tuple[Dict[str, dict], Dict[str, str]]:
+        """
+        Run independent analysis stages and collect their results
+        
+        Args:
+            stages: Mapping of name to (callable, stage type); the stage type
+                selects the deadline and the fallback result
+            max_in_flight: Most stages submitted to the stage pool at once;
+                None submits them all
+        
+        Returns:
+            tuple: (results by name, status by name - 'ok', 'error' or 'timed_out')
+        """
+        results = {}
+        status = {}
+        
+        if not self.concurrent_stages:
+            for name, (func, stage_type) in stages.items():
+                try:
+                    results[name] = func()
+                    status[name] = 'ok'
+                except Exception as e:
+                    print(f"[WARNING] Stage {name} failed: {e}")
+                    results[name] = copy.deepcopy(STAGE_FALLBACKS[stage_type])
+                    status[name] = 'error'
+            return results, status
+        
+        # A stage's deadline runs from when it starts on the pool, but no
+        # stage outlives the call's own limit, counted from submission: the
+        # largest budget among the stages for every max_in_flight of them.
+        # Stages still queued at that point are cancelled, and late stages
+        # are detached so they stop holding a pool thread.
+        budgets = {
+            name: self.stage_deadlines.get(stage_type, DEFAULT_STAGE_DEADLINE)
+            for name, (_, stage_type) in stages.items()
+        }
+        limit = max_in_flight or len(stages)
+        waves = -(-len(stages) // limit) if stages else 0
+        call_deadline = time.monotonic() + max(budgets.values(), default=0.0) * waves
+        
+        changed = threading.Condition()
+        started_at = {}
+        
+        def run(name, func):
+            with changed:
+                started_at[name] = time.monotonic()
+                changed.notify_all()
+            return func()
+        
+        def notify(_future):
+            with changed:
+                changed.notify_all()
+        
+        def timed_out(name):
+            print(f"[WARNING] Stage {name} missed its deadline, using default score")
+            results[name] = copy.deepcopy(STAGE_FALLBACKS[stages[name][1]])
+            status[name] = 'timed_out'
+        
+        queued = list(stages)
+        futures = {}
+        with changed:
+            while queued or futures:
+                now = time.monotonic()
+                if now >= call_deadline:
+                    for name in queued:
+                        timed_out(name)
+                    queued = []
+                while queued and len(futures) < limit:
+                    name = queued.pop(0)
+                    futures[name] = _stage_pool.submit(run, name, stages[name][0])
+                    futures[name].add_done_callback(notify)
+                
+                next_deadline = None
+                for name, future in list(futures.items()):
+                    if future.done() and not future.cancelled():
+                        del futures[name]
+                        try:
+                            results[name] = future.result()
+                            status[name] = 'ok'
+                        except Exception as e:
+                            print(f"[WARNING] Stage {name} failed: {e}")
+                            results[name] = copy.deepcopy(STAGE_FALLBACKS[stages[name][1]])
+                            status[name] = 'error'
+                        continue
+                    deadline = call_deadline
+                    if name in started_at:
+                        deadline = min(deadline, started_at[name] + budgets[name])
+                    if now < deadline:
+                        next_deadline = deadline if next_deadline is None else min(next_deadline, deadline)
+                        continue
+                    # A queued stage never starts; a running one finishes
+                    # off the pool and its result is dropped
+                    if not future.cancel():
+                        _stage_pool.detach(future)
+                    del futures[name]
+                    timed_out(name)
+                
+                if futures and not (queued and len(futures) < limit):
+                    # Woken by a stage starting or finishing, or by the next deadline
+                    changed.wait(max(0.0, next_deadline - now))
+        
+        # Report in the callers' stage order rather than completion order
+        return {name: results[name] for name in stages}, {name: status[name] for name in stages}
+    
+    @staticmethod
+    def _missing_critical_fields(company_name, job_desc) -> List[str]:
+        """Critical fields analyze() cannot do without"""
+        missing = []
+        
+        # CRITICAL: Company name (must have something meaningful)
+        company_valid = (company_name and str(company_name).strip() and 
+                       str(company_name).strip().lower() not in ['unknown company', 'unknown', 'n/a'])
+        if not company_valid:
+            missing.append('Company Name')
+        
+        # CRITICAL: Job description (at least 20 characters for meaningful analysis)
+        job_desc_valid = (job_desc and str(job_desc).strip() and 
+                        len(str(job_desc).strip()) >= 20)
+        if not job_desc_valid:
+            missing.append('Job Description')
+        return missing
+    
+    @staticmethod
+    def _is_incomplete(company_name, missing_critical_fields: List[str]) -> bool:
+        """True if analyze() scores the posting 0% without running any stage"""
+        return str(company_name).strip().lower() == 'unknown company' or len(missing_critical_fields) >= 2
+    
+    def _complete_postings(self, inputs: List[Optional[Tuple[Any, Any, Any]]]) -> List[int]:
+        """Indexes of the _stage_inputs that analyze() runs stages for"""
+        return [
+            i for i, posting in enumerate(inputs)
+            if posting is not None
+            and not self._is_incomplete(posting[0], self._missing_critical_fields(posting[0], posting[1]))
+        ]
+    
+    def _chunk_inputs(self, chunk: List[dict]) -> List[Optional[Tuple[Any, Any, Any]]]:
+        """_stage_inputs per posting; None for a malformed one, which analyze() reports on its own"""
+        inputs = []
+        for data in chunk:
+            try:
+                inputs.append(self._stage_inputs(data))
+            except Exception as e:
+                print(f"[WARNING] Skipping batch stages for a malformed posting: {e}")
+                inputs.append(None)
+        return inputs
+    
+    @staticmethod
+    def _stage_inputs(data: dict) -> Tuple[Any, Any, Any]:
+        """Company name, job description and website as analyze() reads them"""
+        parsed = data.get('parsed', {})
+        company_name = data.get('companyName') or parsed.get('companyName')
+        job_desc = data.get('jobDescription') or parsed.get('jobDescription')
+        website = data.get('companyWebsite') or parsed.get('companyWebsite')
+        return company_name, job_desc, website
+    
+    def _run_dataset_stage(self, company_name: str, contact_email: str, job_desc: str,
+                           document: Optional[DocumentContext] = None) -> dict:
+        """Validate against HuggingFace/Kaggle/local datasets"""
+        dataset_validation = self.dataset_validator.validate_against_datasets(
+            company_name, 
+            contact_email, 
+            job_desc,
+            document=document
+        )
+        return {
+            'dataset_score': dataset_validation.get('dataset_confidence_score', 0.5),
+            'warnings': dataset_validation.get('warnings', []),
+            'checks_performed': dataset_validation.get('checks_performed', []),
+            'matching_patterns': dataset_validation.get('matching_patterns', [])
+        }
+    
+    def _run_company_stage(self, company_name: str, website: Optional[str]) -> dict:
+        """Verify company through online sources"""
+        return self._company_stage_result(self.company_verifier.verify_company(company_name, website))
+    
+    @staticmethod
+    def _company_stage_result(company_verification: dict) -> dict:
+        return {
+            'company_verification_score': company_verification.get('safety_score', 0.0),
+            'warnings': company_verification.get('warnings', []),
+            'positive_indicators': company_verification.get('positive_indicators', []),
+            'cache': company_verification.get('cache')
+        }
+    
+    async def _run_company_stage_async(self, company_name: str, website: Optional[str]) -> Tuple[dict, str]:
+        """
+        _run_company_stage awaited under its deadline, as (result, status)
+        
+        As on the stage pool, a verification that misses its deadline keeps
+        running, so its result still reaches the verification cache.
+        """
+        task = asyncio.ensure_future(self.company_verifier.verify_company_async(company_name, website))
+        deadline = self.stage_deadlines.get('company_verification', DEFAULT_STAGE_DEADLINE)
+        try:
+            verification = await asyncio.wait_for(asyncio.shield(task), deadline)
+        except asyncio.TimeoutError:
+            print("[WARNING] Stage company_verification missed its deadline, using default score")
+            return copy.deepcopy(STAGE_FALLBACKS['company_verification']), 'timed_out'
+        except Exception as e:
+            print(f"[WARNING] Stage company_verification failed: {e}")
+            return copy.deepcopy(STAGE_FALLBACKS['company_verification']), 'error'
+        return self._company_stage_result(verification), 'ok'
+    
+    def _run_url_stage(self, website: str) -> dict:
+        """Score URL-based features"""
+        url_features = self.url_extractor.extract(website)
+        return {'url_score': self._score_url_features(url_features)}
+    
+    def _run_url_batch_stage(self, websites: List[str]) -> Dict[str, Tuple[dict, str]]:
+        """
+        _run_url_stage for many websites, as (result, status) by website
+        
+        Features come from one extract_batch call and are scored column-wise
+        by _score_url_matrix. If the batch cannot be extracted (a website
+        that is not a string, say) each website goes through _run_url_stage.
+        """
+        if not websites:
+            return {}
+        try:
+            matrix = self.url_extractor.feature_matrix(self.url_extractor.extract_batch(websites))
+            scores = self._score_url_matrix(matrix)
+        except Exception as e:
+            print(f"[WARNING] Batch URL features failed: {e}")
+            results, status = self._run_stages(
+                {website: (lambda w=website: self._run_url_stage(w), 'url_features') for website in websites}
+            )
+            return {website: (results[website], status[website]) for website in websites}
+        return {website: ({'url_score': float(score)}, 'ok') for website, score in zip(websites, scores)}
+    
+    def _run_sentiment_stage(self, job_desc: str, document: Optional[DocumentContext] = None) -> dict:
+        """Clean the job description and score its sentiment"""
+        cleaned_text = document.cleaned if document else self.text_cleaner.clean(job_desc)
+        print(f"[DEBUG] Analyzing sentiment for job description (length: {len(job_desc)}, cleaned: {len(cleaned_text)})")
+        sentiment = self.sentiment_analyzer.analyze(cleaned_text)
+        print(f"[DEBUG] Sentiment result: {sentiment}")
+        return self._sentiment_stage_result(sentiment)
+    
+    def _sentiment_stage_result(self, sentiment: dict) -> dict:
+        """Turn a raw sentiment result into the breakdown fields"""
+        sentiment_score = self._score_sentiment(sentiment)
+        print(f"[DEBUG] Sentiment score: {sentiment_score}")
+        return {
+            'sentiment_score': sentiment_score,
+            # Store raw sentiment for debugging
+            'sentiment_label': sentiment.get('label', 'UNKNOWN'),
+            'sentiment_confidence': sentiment.get('score', 0.0)
+        }
+    
+    @staticmethod
+    def _score_url_features(features: dict) -> float:
         """Score URL features (0-1)"""
         if 'error' in features:
             return 0.0
@@ -352,6 +861,26 @@ class CredibilityEngine:
         
         return min(score, 1.0)
     
+    @staticmethod
+    def _score_url_matrix(matrix: 'np.ndarray') -> 'np.ndarray':
+        """
+        _score_url_features for each row of URLFeatureExtractor.feature_matrix
+        
+        extract_batch leaves rows of URLs that extract() rejects at zero, so a
+        zero url_length marks the rows _score_url_features scores 0.0.
+        """
+        import numpy as np
+        from services.url_feature_extractor import FEATURE_NAMES
+        
+        column = dict(zip(FEATURE_NAMES, matrix.T))
+        # Same terms in the same order as _score_url_features, so the sums match exactly
+        score = np.where(column['has_https'] != 0, 0.2, 0.0)
+        score = score + np.where(column['has_ip_address'] == 0, 0.1, 0.0)
+        score = score + np.where(column['domain_entropy'] < 4.0, 0.1, 0.0)
+        score = score + np.where(column['num_hyphens'] <= 1, 0.05, 0.0)
+        score = score + np.where(column['num_digits'] <= 2, 0.05, 0.0)
+        return np.where(column['url_length'] > 0, np.minimum(score, 1.0), 0.0)
+    
     def _score_email_match(self, email: str, url: str) -> float:
         """Check if email domain matches website"""
         try:
@@ -0,0 +1,366 @@
+# ========================
+# GOOGLE CSE RATE LIMIT, QUOTA AND CIRCUIT BREAKER
+# ========================
+
+import os
+import sqlite3
+import tempfile
+import threading
+import time
+from datetime import datetime, timedelta, timezone, tzinfo
+from typing import Any, Dict, Optional, Tuple
+
+DEFAULT_DB_PATH = os.path.join(tempfile.gettempdir(), 'google_cse_budget.sqlite3')
+
+# Statuses that trip the breaker: 403 is Google's daily quota (or a key it
+# refuses), 429 its per-minute rate limit
+TRIP_STATUSES = {403, 429}
+
+
+class BudgetDenied(RuntimeError):
+    """A Google CSE query that was not sent, because of the rate limit, daily quota or breaker"""
+
+    def __init__(self, reason: str, retry_at: Optional[float] = None):
+        """
+        Args:
+            reason: 'rate_limited', 'quota_exhausted' or 'circuit_open'
+            retry_at: Epoch seconds when a query may be allowed again, if known
+        """
+        message = f"Google CSE unavailable: {reason.replace('_', ' ')}"
+        if retry_at is not None:
+            message += f" until {datetime.fromtimestamp(retry_at, timezone.utc).isoformat(timespec='seconds')}"
+        super().__init__(message)
+        self.reason = reason
+        self.retry_at = retry_at
+
+
+def _quota_timezone(name: str) -> tzinfo:
+    try:
+        from zoneinfo import ZoneInfo
+        return ZoneInfo(name)
+    except Exception as e:
+        print(f"[WARNING] Time zone {name!r} unavailable, counting Google CSE quota days in UTC: {e}")
+        return timezone.utc
+
+
+class CSEBudget:
+    """
+    Purpose: Decide whether a Google CSE query may be sent
+    Allowed: Token bucket, daily quota count, circuit breaker, SQLite state
+    Forbidden: HTTP calls, parsing search results
+
+    The state lives in one SQLite row, updated in IMMEDIATE transactions
+    (status checks read it with a plain SELECT), so every worker process
+    on the host draws from the same bucket and the same daily quota. A query reserves a token before it is sent; when the
+    bucket is empty the query is booked for the next token, provided that
+    is no more than max_wait seconds away. Quota days start at midnight in
+    quota_tz, as Google's do.
+
+    The breaker trips on a 403 or 429 response. After a 429 it stays open
+    for cooldown seconds; after a 403 until the quota day ends. Once that
+    passes, a single trial query is let through (half-open): success closes
+    the breaker, another 403/429 opens it again. reset() closes it by hand,
+    e.g. after replacing a rejected API key.
+    """
+
+    def __init__(self, db_path: str = DEFAULT_DB_PATH, daily_quota: int = 100, rate: float = 1.5,
+                 burst: int = 10, max_wait: float = 2.0, cooldown: float = 300,
+                 trial_timeout: float = 30, quota_tz: str = 'America/Los_Angeles'):
+        """
+        Args:
+            db_path: SQLite file shared by the worker processes
+            daily_quota: Queries allowed per quota day
+            rate: Queries per second the bucket refills at
+            burst: Bucket capacity
+            max_wait: Longest a query may wait for a token before it is refused
+            cooldown: Seconds the breaker stays open after a 429
+            trial_timeout: Seconds a half-open trial may take before another is allowed
+            quota_tz: Time zone whose midnight starts a quota day
+        """
+        self.db_path = db_path
+        self.daily_quota = daily_quota
+        self.rate = rate
+        self.burst = burst
+        self.max_wait = max_wait
+        self.cooldown = cooldown
+        self.trial_timeout = trial_timeout
+        self.quota_tz = _quota_timezone(quota_tz)
+
+        self._lock = threading.Lock()
+        # Breaker state seen by this process's last transaction; lets
+        # record() skip the database for the common success
+        self._last_state = 'closed'
+        self.denied = 0
+
+        self._db = None
+        self._open_db()
+
+    @classmethod
+    def from_env(cls) -> 'CSEBudget':
+        """Build a budget from GOOGLE_CSE_* environment variables"""
+        return cls(
+            db_path=os.getenv('GOOGLE_CSE_BUDGET_DB') or DEFAULT_DB_PATH,
+            daily_quota=int(os.getenv('GOOGLE_CSE_DAILY_QUOTA', '100')),
+            rate=float(os.getenv('GOOGLE_CSE_RATE', '1.5')),
+            burst=int(os.getenv('GOOGLE_CSE_BURST', '10')),
+            max_wait=float(os.getenv('GOOGLE_CSE_MAX_WAIT', '2')),
+            cooldown=float(os.getenv('GOOGLE_CSE_BREAKER_COOLDOWN', '300')),
+            quota_tz=os.getenv('GOOGLE_CSE_QUOTA_TZ', 'America/Los_Angeles')
+        )
+
+    def _open_db(self):
+        """Open (and create if needed) the shared state, falling back to this process alone"""
+        try:
+            directory = os.path.dirname(self.db_path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            self._db = self._connect(self.db_path)
+        except Exception as e:
+            print(f"[WARNING] Google CSE budget DB unavailable, limiting this process only: {e}")
+            self._db = self._connect(':memory:')
+            self.db_path = None
+
+    def _connect(self, path: str) -> sqlite3.Connection:
+        # Autocommit, so each transaction is the explicit BEGIN IMMEDIATE below
+        db = sqlite3.connect(path, timeout=5, isolation_level=None, check_same_thread=False)
+        # WAL without a sync per commit: a crash may lose the last few counts,
+        # which the next 403 corrects, and a reservation costs far less
+        db.execute('PRAGMA journal_mode=WAL')
+        db.execute('PRAGMA synchronous=NORMAL')
+        db.execute(
+            'CREATE TABLE IF NOT EXISTS cse_budget ('
+            'id INTEGER PRIMARY KEY CHECK (id = 1), tokens REAL NOT NULL, refilled_at REAL NOT NULL, '
+            'day TEXT NOT NULL, used INTEGER NOT NULL, state TEXT NOT NULL, state_until REAL NOT NULL, '
+            'reason TEXT, trips INTEGER NOT NULL)'
+        )
+        db.execute(
+            "INSERT OR IGNORE INTO cse_budget VALUES (1, ?, ?, '', 0, 'closed', 0, NULL, 0)",
+            (float(self.burst), time.time())
+        )
+        return db
+
+    def reopen_after_fork(self):
+        """
+        Give a forked child its own SQLite connection and lock
+
+        The inherited connection is kept referenced but never used or closed,
+        since SQLite connections must not cross fork.
+        """
+        self._lock = threading.Lock()
+        _inherited_connections.append(self._db)
+        self._db = None
+        if self.db_path is None:
+            # Nothing shared to rejoin; the child starts a budget of its own
+            self._db = self._connect(':memory:')
+        else:
+            self._open_db()
+
+    def _transaction(self, update):
+        """
+        Run update(row, now) on the shared row in one IMMEDIATE transaction
+
+        update returns (changes, result): changes is a dict of columns to
+        write (or None), result is passed back to the caller.
+        """
+        with self._lock:
+            self._db.execute('BEGIN IMMEDIATE')
+            try:
+                # Read the clock only once the row is ours; BEGIN may have waited
+                now = time.time()
+                row = self._read_row()
+                changes, result = update(row, now)
+                if changes:
+                    row.update(changes)
+                    self._db.execute(
+                        f"UPDATE cse_budget SET {', '.join(f'{column} = ?' for column in changes)} WHERE id = 1",
+                        list(changes.values())
+                    )
+                self._db.execute('COMMIT')
+            except BaseException:
+                self._db.execute('ROLLBACK')
+                raise
+            self._last_state = row['state']
+            return result
+
+    def _quota_day(self, now: float) -> Tuple[str, float]:
+        """(quota day of now, epoch seconds when the next one starts)"""
+        local = datetime.fromtimestamp(now, self.quota_tz)
+        midnight = datetime.combine(local.date() + timedelta(days=1), datetime.min.time(), self.quota_tz)
+        return local.date().isoformat(), midnight.timestamp()
+
+    def reserve(self) -> float:
+        """
+        Take a token and a unit of the day's quota for one query
+
+        Returns:
+            float: Seconds to wait before sending the query
+
+        Raises:
+            BudgetDenied: The breaker is open, the quota is spent, or the
+                next token is more than max_wait away
+        """
+        def update(row, now):
+            changes = {}
+            day, next_day = self._quota_day(now)
+            if row['day'] != day:
+                changes.update(day=day, used=0)
+                row['used'] = 0
+
+            if row['state'] == 'open':
+                if now < row['state_until']:
+                    return changes, BudgetDenied('circuit_open', row['state_until'])
+                changes.update(state='half_open', state_until=now + self.trial_timeout)
+            elif row['state'] == 'half_open':
+                if now < row['state_until']:
+                    # A trial query is on the wire; wait for its outcome
+                    return changes, BudgetDenied('circuit_open', row['state_until'])
+                changes.update(state_until=now + self.trial_timeout)
+
+            if row['used'] >= self.daily_quota:
+                return changes, BudgetDenied('quota_exhausted', next_day)
+
+            tokens = min(float(self.burst), row['tokens'] + (now - row['refilled_at']) * self.rate)
+            delay = max(0.0, (1 - tokens) / self.rate)
+            if delay > self.max_wait:
+                return changes, BudgetDenied('rate_limited', now + delay)
+            # Tokens go negative to book future slots, so waiting queries keep their order
+            changes.update(tokens=tokens - 1, refilled_at=now, used=row['used'] + 1)
+            return changes, delay
+
+        try:
+            result = self._transaction(update)
+        except sqlite3.Error as e:
+            # A budget that cannot be read must not take search down with it
+            print(f"[WARNING] Google CSE budget check failed, sending anyway: {e}")
+            return 0.0
+        if isinstance(result, BudgetDenied):
+            with self._lock:
+                self.denied += 1
+            raise result
+        return result
+
+    def record(self, status_code: int):
+        """Feed a query's response status to the breaker"""
+        if status_code not in TRIP_STATUSES:
+            if self._last_state == 'closed':
+                return
+
+            def close(row, now):
+                # Only a trial closes it; a success sent before another
+                # process tripped the breaker says nothing about now
+                if row['state'] != 'half_open':
+                    return None, None
+                print("[INFO] Google CSE circuit breaker closed")
+                return {'state': 'closed', 'state_until': 0, 'reason': None}, None
+
+            self._record(close)
+            return
+
+        def trip(row, now):
+            if status_code == 429:
+                reason, until = 'rate limit (429)', now + self.cooldown
+            else:
+                reason, until = 'quota exceeded or key rejected (403)', self._quota_day(now)[1]
+            if row['state'] == 'open' and row['state_until'] >= until:
+                return None, None
+            print(f"[WARNING] Google CSE circuit breaker open: {reason}; using pattern-only checks")
+            return {'state': 'open', 'state_until': until, 'reason': reason, 'trips': row['trips'] + 1}, None
+
+        self._record(trip)
+
+    def _record(self, update):
+        try:
+            self._transaction(update)
+        except sqlite3.Error as e:
+            print(f"[WARNING] Google CSE breaker update failed: {e}")
+
+    def blocked_reason(self) -> Optional[str]:
+        """
+        'circuit_open' or 'quota_exhausted' if no query could be sent now, else None
+
+        Takes nothing from the budget. Lets callers pick pattern-only checks
+        up front instead of starting a fan-out that would all be refused.
+        """
+        try:
+            row, now = self._snapshot()
+        except sqlite3.Error:
+            return None
+        if row['state'] == 'open' and now < row['state_until']:
+            return 'circuit_open'
+        if row['day'] == self._quota_day(now)[0] and row['used'] >= self.daily_quota:
+            return 'quota_exhausted'
+        return None
+
+    def _read_row(self) -> Dict[str, Any]:
+        cursor = self._db.execute('SELECT * FROM cse_budget WHERE id = 1')
+        return dict(zip([column[0] for column in cursor.description], cursor.fetchone()))
+
+    def _snapshot(self) -> Tuple[Dict[str, Any], float]:
+        """
+        Read the shared row without taking the write lock
+
+        In autocommit mode the SELECT is its own WAL read transaction, so
+        status checks never queue behind (or block) another worker's reserve.
+        """
+        with self._lock:
+            now = time.time()
+            row = self._read_row()
+            self._last_state = row['state']
+            return row, now
+
+    def reset(self):
+        """Close the breaker by hand, e.g. after replacing a rejected API key"""
+        self._transaction(lambda row, now: ({'state': 'closed', 'state_until': 0, 'reason': None}, None))
+
+    def report(self) -> Dict[str, Any]:
+        """Budget and breaker state for /health"""
+        try:
+            row, now = self._snapshot()
+        except sqlite3.Error as e:
+            return {'error': str(e), 'denied_here': self.denied}
+        day, next_day = self._quota_day(now)
+        used = row['used'] if row['day'] == day else 0
+        tokens = min(float(self.burst), row['tokens'] + (now - row['refilled_at']) * self.rate)
+        return {
+            'quota_day': day,
+            'daily_quota': self.daily_quota,
+            'used': used,
+            'remaining': max(0, self.daily_quota - used),
+            'quota_resets_in_s': round(next_day - now),
+            'tokens': round(tokens, 2),
+            'rate_per_s': self.rate,
+            'burst': self.burst,
+            'breaker': {
+                'state': row['state'],
+                'reason': row['reason'],
+                'open_for_s': round(max(0.0, row['state_until'] - now)) if row['state'] == 'open' else 0,
+                'trips': row['trips']
+            },
+            'denied_here': self.denied,
+            'shared': self.db_path is not None
+        }
+
+
+_budget = None
+_budget_lock = threading.Lock()
+_inherited_connections = []
+
+
+def _after_fork_in_child():
+    global _budget_lock
+    _budget_lock = threading.Lock()
+    if _budget is not None:
+        _budget.reopen_after_fork()
+
+
+os.register_at_fork(after_in_child=_after_fork_in_child)
+
+
+def get_cse_budget() -> CSEBudget:
+    """Process-wide budget, configured from the environment"""
+    global _budget
+    if _budget is None:
+        with _budget_lock:
+            if _budget is None:
+                _budget = CSEBudget.from_env()
+    return _budget
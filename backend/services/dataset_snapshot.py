@@ -0,0 +1,300 @@
+#!/usr/bin/env python3
+# ========================
+# COMPILED DATASET SNAPSHOT
+# Builds and opens the read-only snapshot of the validation datasets
+# ========================
+
+import sys
+import os
+import json
+import mmap
+import struct
+import argparse
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Tuple
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from services.company_index import AhoCorasick
+from services.fuzzy_index import FuzzyNameIndex
+
+DEFAULT_SNAPSHOT_PATH = os.path.join(os.path.dirname(__file__), '..', 'data', 'datasets.snapshot')
+
+MAGIC = b'ICPSNAP'
+VERSION = 2
+
+# magic, version, then (offset, length) of the legitimate names, scam names,
+# pattern, legitimate fuzzy index and scam fuzzy index sections; all
+# integers little-endian. Version 1 files lack the fuzzy index sections.
+_PREFIX = struct.Struct('<7sB')
+_HEADERS = {1: struct.Struct('<7sB6Q'), 2: struct.Struct('<7sB10Q')}
+_HEADER = _HEADERS[VERSION]
+_COUNT = struct.Struct('<I')
+_OFFSET = struct.Struct('<I')
+# Fuzzy index section: byte lengths of its names and keys tables, then its
+# key count and delete-index size; the arrays that follow are 8-byte aligned
+_FUZZY = struct.Struct('<4Q')
+
+
+def normalize_entry(name: str) -> str:
+    """Form names are stored and looked up in (DatasetValidator lowercases and strips)"""
+    return str(name).lower().strip()
+
+
+class StringTable:
+    """
+    Purpose: Read-only list of strings in a snapshot section
+    Allowed: Decoding by position
+    Forbidden: Loading sources, normalization
+
+    Entries are addressed through an offset table, so reading one decodes
+    only its bytes from the mapped file.
+    """
+
+    def __init__(self, buffer, offset: int):
+        self._buffer = buffer
+        (self._count,) = _COUNT.unpack_from(buffer, offset)
+        self._offsets = offset + _COUNT.size
+        self._blob = self._offsets + (self._count + 1) * _OFFSET.size
+
+    def __len__(self) -> int:
+        return self._count
+
+    def __getitem__(self, i: int) -> str:
+        if not 0 <= i < self._count:
+            raise IndexError(i)
+        return self._entry(i).decode('utf-8')
+
+    def _entry(self, i: int) -> bytes:
+        (start,) = _OFFSET.unpack_from(self._buffer, self._offsets + i * _OFFSET.size)
+        (end,) = _OFFSET.unpack_from(self._buffer, self._offsets + (i + 1) * _OFFSET.size)
+        return self._buffer[self._blob + start:self._blob + end]
+
+
+class NameTable(StringTable):
+    """
+    Purpose: Set-like membership over a sorted name section of a snapshot
+    Allowed: Binary search, decoding
+    Forbidden: Loading sources, normalization beyond exact bytes
+
+    Names are sorted by their UTF-8 bytes, so lookups binary-search the
+    mapped file without materializing a Python set. The pages stay shared
+    between processes mapping it.
+    """
+
+    def __contains__(self, name) -> bool:
+        if not isinstance(name, str):
+            return False
+        key = name.encode('utf-8')
+        lo, hi = 0, self._count
+        while lo < hi:
+            mid = (lo + hi) // 2
+            entry = self._entry(mid)
+            if entry < key:
+                lo = mid + 1
+            elif entry > key:
+                hi = mid
+            else:
+                return True
+        return False
+
+    def __iter__(self) -> Iterator[str]:
+        for i in range(self._count):
+            yield self._entry(i).decode('utf-8')
+
+
+class KeyLookup:
+    """
+    Purpose: Canonical key -> entry number of a mapped fuzzy index
+    Allowed: Binary search
+    Forbidden: Normalization
+
+    order lists entry numbers sorted by key, so get() binary-searches keys
+    through it; stands in for FuzzyNameIndex.exact.
+    """
+
+    def __init__(self, keys: StringTable, order: Sequence[int]):
+        self._keys = keys
+        self._order = order
+
+    def get(self, key: str, default=None) -> Optional[int]:
+        lo, hi = 0, len(self._order)
+        while lo < hi:
+            mid = (lo + hi) // 2
+            entry = self._keys[int(self._order[mid])]
+            if entry < key:
+                lo = mid + 1
+            elif entry > key:
+                hi = mid
+            else:
+                return int(self._order[mid])
+        return default
+
+
+def _sorted_names(names) -> List[bytes]:
+    """Sorted, deduplicated, normalized names as stored in a name section"""
+    return sorted({normalize_entry(name).encode('utf-8') for name in names if name} - {b''})
+
+
+def _pack_strings(encoded: List[bytes]) -> bytes:
+    """String table section of UTF-8 entries, in the given order"""
+    offsets = [0]
+    for entry in encoded:
+        offsets.append(offsets[-1] + len(entry))
+    return (
+        _COUNT.pack(len(encoded))
+        + b''.join(_OFFSET.pack(offset) for offset in offsets)
+        + b''.join(encoded)
+    )
+
+
+def _pack_patterns(patterns: List[dict]) -> bytes:
+    """Pattern payloads plus the pure-Python automaton tables, as JSON"""
+    patterns = [
+        {
+            'pattern': item.get('pattern'),
+            'severity': item.get('severity', 'medium'),
+            'description': item.get('description', '')
+        }
+        for item in patterns
+    ]
+    automaton = AhoCorasick(
+        ((str(item.get('pattern') or '').lower(), i) for i, item in enumerate(patterns)),
+        native=False
+    )
+    return json.dumps({'patterns': patterns, 'automaton': automaton.tables()}).encode('utf-8')
+
+
+def _pack_fuzzy(names: List[str]) -> bytes:
+    """
+    FuzzyNameIndex section over one name section's names, in its order
+
+    Holds the index's names, canonical keys, entry numbers sorted by key
+    and the sorted delete-index arrays, so open_snapshot maps the index
+    instead of building it in every process.
+    """
+    import numpy as np
+
+    tables = FuzzyNameIndex(names).tables()
+    names_section = _pack_strings([name.encode('utf-8') for name in tables['names']])
+    keys_section = _pack_strings([key.encode('utf-8') for key in tables['keys']])
+    order = np.array(sorted(range(len(tables['keys'])), key=tables['keys'].__getitem__), dtype='<i4')
+    head = (
+        _FUZZY.pack(len(names_section), len(keys_section), len(tables['keys']), len(tables['hashes']))
+        + names_section + keys_section
+    )
+    return (
+        head + b'\0' * (-len(head) % 8)
+        + order.tobytes() + tables['hashes'].astype('<u4').tobytes() + tables['ids'].astype('<i4').tobytes()
+    )
+
+
+def _open_fuzzy(buffer, offset: int, min_similarity: float) -> FuzzyNameIndex:
+    """FuzzyNameIndex over a mapped _pack_fuzzy section"""
+    import numpy as np
+
+    names_length, keys_length, count, entries = _FUZZY.unpack_from(buffer, offset)
+    names = StringTable(buffer, offset + _FUZZY.size)
+    keys = StringTable(buffer, offset + _FUZZY.size + names_length)
+    arrays = offset + _FUZZY.size + names_length + keys_length
+    arrays += -arrays % 8
+    order = np.frombuffer(buffer, dtype='<i4', count=count, offset=arrays)
+    hashes = np.frombuffer(buffer, dtype='<u4', count=entries, offset=arrays + 4 * count)
+    ids = np.frombuffer(buffer, dtype='<i4', count=entries, offset=arrays + 4 * (count + entries))
+    return FuzzyNameIndex.from_tables(names, keys, KeyLookup(keys, order), hashes, ids,
+                                      min_similarity=min_similarity)
+
+
+def write_snapshot(path: str, datasets: Dict[str, Any]):
+    """
+    Write a snapshot of staged datasets
+
+    Args:
+        path: Output file; replaced atomically
+        datasets: legitimate_companies, scam_companies and scam_patterns, as
+            filled by DatasetValidator's loaders
+    """
+    legitimate = _sorted_names(datasets['legitimate_companies'])
+    scam_companies = _sorted_names(datasets['scam_companies'])
+    sections = [
+        _pack_strings(legitimate),
+        _pack_strings(scam_companies),
+        _pack_patterns(datasets['scam_patterns']),
+        _pack_fuzzy([name.decode('utf-8') for name in legitimate]),
+        _pack_fuzzy([name.decode('utf-8') for name in scam_companies]),
+    ]
+    layout = []
+    offset = _HEADER.size
+    for section in sections:
+        # Fuzzy index arrays are aligned within their section, so sections start aligned
+        offset += -offset % 8
+        layout += [offset, len(section)]
+        offset += len(section)
+
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    tmp_path = f'{path}.tmp'
+    with open(tmp_path, 'wb') as f:
+        f.write(_HEADER.pack(MAGIC, VERSION, *layout))
+        for section_offset, section in zip(layout[::2], sections):
+            f.write(b'\0' * (section_offset - f.tell()))
+            f.write(section)
+    # Processes that already mapped the old file keep reading it
+    os.replace(tmp_path, path)
+
+
+def open_snapshot(path: str, min_similarity: float = 0.85) -> Tuple[
+        NameTable, NameTable, List[dict], AhoCorasick, Optional[FuzzyNameIndex], Optional[FuzzyNameIndex]]:
+    """
+    Map a snapshot read-only
+
+    Args:
+        path: Snapshot file
+        min_similarity: Passed to the mapped FuzzyNameIndexes
+
+    Returns:
+        tuple: (legitimate names, scam names, scam patterns, pattern automaton,
+        legitimate fuzzy index, scam fuzzy index); the fuzzy indexes are None
+        in version 1 snapshots
+    """
+    with open(path, 'rb') as f:
+        buffer = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+    magic, version = _PREFIX.unpack_from(buffer, 0)
+    if magic != MAGIC or version not in _HEADERS:
+        buffer.close()
+        raise ValueError(f'{path} is not a version {VERSION} dataset snapshot')
+
+    layout = _HEADERS[version].unpack_from(buffer, 0)[2:]
+    legit_offset, _, scam_offset, _, pattern_offset, pattern_length = layout[:6]
+    compiled = json.loads(buffer[pattern_offset:pattern_offset + pattern_length])
+    fuzzy = (None, None)
+    if version >= 2:
+        fuzzy = tuple(_open_fuzzy(buffer, offset, min_similarity) for offset in layout[6::2])
+    return (
+        NameTable(buffer, legit_offset),
+        NameTable(buffer, scam_offset),
+        compiled['patterns'],
+        AhoCorasick.from_tables(compiled['automaton']),
+        *fuzzy
+    )
+
+
+def build_snapshot(path: str = DEFAULT_SNAPSHOT_PATH) -> Dict[str, int]:
+    """Load every configured source (HuggingFace, Kaggle, local) and write the snapshot"""
+    from services.dataset_validator import DatasetValidator
+
+    validator = DatasetValidator(autoload=False)
+    datasets, sources = validator.collect_datasets()
+    write_snapshot(path, datasets)
+
+    counts = {name: len(values) for name, values in datasets.items()}
+    print(f"Wrote {path} from {', '.join(sources)}: {counts}")
+    return counts
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Compile validation datasets into a snapshot')
+    parser.add_argument('--output', default=os.getenv('DATASET_SNAPSHOT_PATH', DEFAULT_SNAPSHOT_PATH),
+                        help='Snapshot file to write')
+    args = parser.parse_args()
+    build_snapshot(args.output)
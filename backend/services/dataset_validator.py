@@ -3,47 +3,216 @@
 # ========================
 
 import os
-from typing import Dict, Any, List, Tuple
+import threading
+import time
+from typing import Dict, Any, List, Optional, Tuple
 import json
 
+from preprocessing.document_context import DocumentContext
+from services.company_index import AhoCorasick
+from services.dataset_snapshot import DEFAULT_SNAPSHOT_PATH, open_snapshot
+from services.fuzzy_index import FuzzyNameIndex
+
+SEVERITY_WEIGHTS = {
+    'critical': 0.3,
+    'high': 0.2,
+    'medium': 0.1,
+    'low': 0.05
+}
+
 class DatasetValidator:
     """
     Validates user data against HuggingFace and Kaggle datasets.
     Checks against known legitimate companies and scam patterns.
+    
+    Datasets load on a background thread. Requests are served from whatever
+    has been published so far: local JSON files first, then the combined
+    HuggingFace/Kaggle/local sets once downloads finish. Each publish swaps
+    the whole snapshot at once.
+    
+    When a compiled snapshot file exists (see services/dataset_snapshot.py)
+    it is mapped instead and no source is loaded.
     """
     
-    def __init__(self):
+    def __init__(self, background: bool = True, autoload: bool = True, snapshot_path: str = None):
+        """
+        Args:
+            background: Load datasets on a background thread; False blocks until loaded
+            autoload: Start loading immediately; False leaves the datasets empty
+            snapshot_path: Compiled snapshot to map (default: DATASET_SNAPSHOT_PATH
+                or backend/data/datasets.snapshot)
+        """
         self.hf_api_key = os.getenv("HUGGINGFACE_API_KEY", "")
         self.kaggle_username = os.getenv("KAGGLE_USERNAME", "")
         self.kaggle_key = os.getenv("KAGGLE_KEY", "")
+        self.snapshot_path = snapshot_path or os.getenv('DATASET_SNAPSHOT_PATH', DEFAULT_SNAPSHOT_PATH)
+        
+        self.fuzzy_min_similarity = float(os.getenv('DATASET_FUZZY_MIN_SIMILARITY', '0.85'))
         
-        # Cached datasets
-        self.legitimate_companies = set()
-        self.scam_companies = set()
-        self.scam_patterns = []
+        # (legitimate companies, scam companies, scam patterns, automaton over
+        # the patterns' lowercase text, fuzzy legitimate index, fuzzy scam
+        # index), replaced as a whole so a request never sees one set updated
+        # and another not. Fuzzy indexes are None until built.
+        self._state = (set(), set(), [], AhoCorasick(), None, None)
+        self._published = threading.Event()
+        
+        self._loader = None
+        self._loader_lock = threading.Lock()
+        self._readiness = {
+            'state': 'loading',
+            'sources': [],
+            'started_at': None,
+            'finished_at': None,
+            'error': None
+        }
         
-        self._initialize_datasets()
+        if autoload:
+            self.refresh_datasets(wait=not background)
+            # Mapping a snapshot (fuzzy indexes included) is cheap, so it is
+            # served from the first request
+            if background and os.path.exists(self.snapshot_path):
+                self._published.wait(timeout=10)
+    
+    @property
+    def legitimate_companies(self) -> set:
+        return self._state[0]
+    
+    @property
+    def scam_companies(self) -> set:
+        return self._state[1]
+    
+    @property
+    def scam_patterns(self) -> list:
+        return self._state[2]
     
     def _initialize_datasets(self):
-        """Initialize datasets from HuggingFace and Kaggle"""
+        """Initialize datasets from a snapshot, or from HuggingFace and Kaggle"""
         print("[INFO] Initializing dataset validation...")
         
-        # Try to load from HuggingFace
+        try:
+            if os.path.exists(self.snapshot_path):
+                (legitimate, scam_companies, patterns, automaton,
+                 legitimate_fuzzy, scam_fuzzy) = open_snapshot(self.snapshot_path, self.fuzzy_min_similarity)
+                print(f"[SUCCESS] Mapped dataset snapshot {self.snapshot_path}")
+                if legitimate_fuzzy is not None:
+                    # The fuzzy indexes are mapped too, so nothing is built per process
+                    self._swap((legitimate, scam_companies, patterns, automaton, legitimate_fuzzy, scam_fuzzy),
+                               ['snapshot'], 'ready')
+                    return
+                # Version 1 snapshots have no fuzzy indexes; build them here
+                self._swap((legitimate, scam_companies, patterns, automaton, None, None), ['snapshot'], 'partial')
+                self._swap(
+                    (legitimate, scam_companies, patterns, automaton,
+                     self._fuzzy_index(legitimate), self._fuzzy_index(scam_companies)),
+                    ['snapshot'],
+                    'ready'
+                )
+                return
+            
+            remote = self._remote_sources()
+            
+            with self._loader_lock:
+                serving_remote = any(source != 'local' for source in self._readiness['sources'])
+            
+            # Local files need no download, so they are served while remote sets
+            # load - unless a refresh is already serving remote sets
+            if not remote or not serving_remote:
+                staged = self._empty_datasets()
+                self._load_local_datasets(staged)
+                self._publish(staged, ['local'], 'partial' if remote else 'ready')
+            
+            if not remote:
+                return
+            
+            staged, sources = self.collect_datasets()
+            self._publish(staged, sources, 'ready')
+        
+        except Exception as e:
+            print(f"[ERROR] Dataset initialization failed: {e}")
+            with self._loader_lock:
+                self._readiness.update(state='failed', error=str(e), finished_at=time.time())
+    
+    def _remote_sources(self) -> List[str]:
+        """Remote sources with credentials configured"""
+        remote = []
         if self.hf_api_key:
-            self._load_huggingface_datasets()
+            remote.append('huggingface')
         else:
             print("[WARNING] HUGGINGFACE_API_KEY not set. Skipping HF dataset validation.")
-        
-        # Try to load from Kaggle
         if self.kaggle_username and self.kaggle_key:
-            self._load_kaggle_datasets()
+            remote.append('kaggle')
         else:
             print("[WARNING] KAGGLE credentials not set. Skipping Kaggle dataset validation.")
+        return remote
+    
+    def collect_datasets(self) -> Tuple[Dict[str, Any], List[str]]:
+        """
+        Load every configured source without publishing
         
-        # Load local dataset if available
-        self._load_local_datasets()
+        Returns:
+            tuple: (staged datasets, sources loaded)
+        """
+        remote = self._remote_sources()
+        staged = self._empty_datasets()
+        
+        # Try to load from HuggingFace
+        if 'huggingface' in remote:
+            self._load_huggingface_datasets(staged)
+        
+        # Try to load from Kaggle
+        if 'kaggle' in remote:
+            self._load_kaggle_datasets(staged)
+        
+        # Local datasets take precedence, as before
+        self._load_local_datasets(staged)
+        
+        return staged, remote + ['local']
+    
+    @staticmethod
+    def _empty_datasets() -> Dict[str, Any]:
+        """Staging area the loaders fill before a snapshot is published"""
+        return {'legitimate_companies': set(), 'scam_companies': set(), 'scam_patterns': []}
     
-    def _load_huggingface_datasets(self):
+    def _publish(self, staged: Dict[str, Any], sources: List[str], state: str = 'ready'):
+        """Build the scam-pattern automaton and swap in the staged datasets"""
+        patterns = list(staged['scam_patterns'])
+        automaton = AhoCorasick(
+            (str(item.get('pattern') or '').lower(), i) for i, item in enumerate(patterns)
+        )
+        legitimate = set(staged['legitimate_companies'])
+        scam_companies = set(staged['scam_companies'])
+        self._swap(
+            (legitimate, scam_companies, patterns, automaton,
+             self._fuzzy_index(legitimate), self._fuzzy_index(scam_companies)),
+            sources,
+            state
+        )
+    
+    def _fuzzy_index(self, names) -> FuzzyNameIndex:
+        """Fuzzy index over one company list"""
+        return FuzzyNameIndex(names, min_similarity=self.fuzzy_min_similarity)
+    
+    def _swap(self, datasets: Tuple, sources: List[str], state: str):
+        """Replace the served datasets and record where they came from"""
+        self._state = datasets
+        self._published.set()
+        with self._loader_lock:
+            self._readiness.update(state=state, sources=list(sources), error=None)
+            if state == 'ready':
+                self._readiness['finished_at'] = time.time()
+    
+    def readiness(self) -> Dict[str, Any]:
+        """Loading state and sizes of the datasets currently served"""
+        legitimate, scam_companies, scam_patterns = self._state[:3]
+        with self._loader_lock:
+            status = dict(self._readiness)
+        status['ready'] = status['state'] == 'ready'
+        status['legitimate_companies'] = len(legitimate)
+        status['scam_companies'] = len(scam_companies)
+        status['scam_patterns'] = len(scam_patterns)
+        return status
+    
+    def _load_huggingface_datasets(self, staged: Dict[str, Any]):
         """Load datasets from HuggingFace Hub"""
         try:
             from datasets import load_dataset
@@ -58,10 +227,10 @@ class DatasetValidator:
                     split="train",
                     use_auth_token=self.hf_api_key
                 )
-                self.legitimate_companies = set(
+                staged['legitimate_companies'] = set(
                     [item['company_name'].lower() for item in legitimate_ds if 'company_name' in item]
                 )
-                print(f"[SUCCESS] Loaded {len(self.legitimate_companies)} legitimate companies from HuggingFace")
+                print(f"[SUCCESS] Loaded {len(staged['legitimate_companies'])} legitimate companies from HuggingFace")
             except Exception as e:
                 print(f"[WARNING] Could not load legitimate companies dataset: {e}")
             
@@ -72,7 +241,7 @@ class DatasetValidator:
                     split="train",
                     use_auth_token=self.hf_api_key
                 )
-                self.scam_patterns = [
+                staged['scam_patterns'] = [
                     {
                         'pattern': item.get('scam_indicator'),
                         'severity': item.get('severity', 'medium'),
@@ -80,7 +249,7 @@ class DatasetValidator:
                     }
                     for item in scam_ds if 'scam_indicator' in item
                 ]
-                print(f"[SUCCESS] Loaded {len(self.scam_patterns)} scam patterns from HuggingFace")
+                print(f"[SUCCESS] Loaded {len(staged['scam_patterns'])} scam patterns from HuggingFace")
             except Exception as e:
                 print(f"[WARNING] Could not load scam patterns dataset: {e}")
         
@@ -89,7 +258,7 @@ class DatasetValidator:
         except Exception as e:
             print(f"[ERROR] Failed to load HuggingFace datasets: {e}")
     
-    def _load_kaggle_datasets(self):
+    def _load_kaggle_datasets(self, staged: Dict[str, Any]):
         """Load datasets from Kaggle"""
         try:
             import kaggle
@@ -112,7 +281,7 @@ class DatasetValidator:
                 print("[SUCCESS] Downloaded Kaggle internship datasets")
                 
                 # Parse downloaded data
-                self._parse_kaggle_data()
+                self._parse_kaggle_data(staged)
             except Exception as e:
                 print(f"[WARNING] Could not download Kaggle dataset: {e}")
         
@@ -121,7 +290,7 @@ class DatasetValidator:
         except Exception as e:
             print(f"[ERROR] Failed to load Kaggle datasets: {e}")
     
-    def _parse_kaggle_data(self):
+    def _parse_kaggle_data(self, staged: Dict[str, Any]):
         """Parse downloaded Kaggle data"""
         try:
             import csv
@@ -138,7 +307,7 @@ class DatasetValidator:
                         
                         # Look for company and scam information
                         if 'company_name' in df.columns:
-                            self.scam_companies.update(
+                            staged['scam_companies'].update(
                                 df[df['is_scam'] == True]['company_name'].str.lower().tolist()
                             )
                         
@@ -149,7 +318,7 @@ class DatasetValidator:
         except Exception as e:
             print(f"[WARNING] Error parsing Kaggle data: {e}")
     
-    def _load_local_datasets(self):
+    def _load_local_datasets(self, staged: Dict[str, Any]):
         """Load local JSON datasets if available"""
         try:
             local_paths = [
@@ -164,26 +333,27 @@ class DatasetValidator:
                         data = json.load(f)
                         
                         if 'legitimate_companies' in path:
-                            self.legitimate_companies = set(
+                            staged['legitimate_companies'] = set(
                                 [c.lower() for c in data.get('companies', [])]
                             )
-                            print(f"[SUCCESS] Loaded {len(self.legitimate_companies)} local companies")
+                            print(f"[SUCCESS] Loaded {len(staged['legitimate_companies'])} local companies")
                         
                         elif 'scam_companies' in path:
-                            self.scam_companies = set(
+                            staged['scam_companies'] = set(
                                 [c.lower() for c in data.get('companies', [])]
                             )
-                            print(f"[SUCCESS] Loaded {len(self.scam_companies)} known scam companies")
+                            print(f"[SUCCESS] Loaded {len(staged['scam_companies'])} known scam companies")
                         
                         elif 'scam_patterns' in path:
-                            self.scam_patterns = data.get('patterns', [])
-                            print(f"[SUCCESS] Loaded {len(self.scam_patterns)} scam patterns")
+                            staged['scam_patterns'] = data.get('patterns', [])
+                            print(f"[SUCCESS] Loaded {len(staged['scam_patterns'])} scam patterns")
         
         except Exception as e:
             print(f"[WARNING] Error loading local datasets: {e}")
     
     def validate_against_datasets(self, company_name: str, email: str = "", 
-                                 job_desc: str = "") -> Dict[str, Any]:
+                                 job_desc: str = "",
+                                 document: DocumentContext = None) -> Dict[str, Any]:
         """
         Validate user data against datasets
         
@@ -191,6 +361,7 @@ class DatasetValidator:
             company_name (str): Company name to validate
             email (str): Contact email
             job_desc (str): Job description
+            document (DocumentContext): Shared views of job_desc, if already built
         
         Returns:
             dict: Validation results
@@ -199,6 +370,8 @@ class DatasetValidator:
             'company_validated': False,
             'in_legitimate_dataset': False,
             'in_scam_dataset': False,
+            'legitimate_match': None,
+            'scam_match': None,
             'matching_patterns': [],
             'dataset_confidence_score': 0.5,
             'checks_performed': [],
@@ -206,55 +379,64 @@ class DatasetValidator:
         }
         
         company_lower = company_name.lower().strip()
+        (legitimate_companies, scam_companies, scam_patterns, automaton,
+         legitimate_fuzzy, scam_fuzzy) = self._state
         
         try:
             # Check against legitimate companies
-            if self.legitimate_companies:
+            if legitimate_companies:
                 results['checks_performed'].append('legitimate_company_check')
                 
-                if company_lower in self.legitimate_companies:
+                match = self._match(company_lower, legitimate_companies, legitimate_fuzzy)
+                results['legitimate_match'] = match
+                if match and match['similarity'] == 1.0:
                     results['in_legitimate_dataset'] = True
                     results['dataset_confidence_score'] += 0.3
                     results['warnings'].append(f"✓ {company_name} found in verified companies dataset")
                     print(f"[DEBUG] {company_name} verified in legitimate dataset")
+                elif match:
+                    # A near miss of a verified name earns no credit: it is how impersonators name themselves
+                    results['warnings'].append(
+                        f"⚠️ {company_name} closely resembles verified company {match['name']} "
+                        f"({match['similarity']:.0%} similar) - check for impersonation"
+                    )
             
             # Check against known scam companies
-            if self.scam_companies:
+            if scam_companies:
                 results['checks_performed'].append('scam_company_check')
                 
-                if company_lower in self.scam_companies:
+                match = self._match(company_lower, scam_companies, scam_fuzzy)
+                results['scam_match'] = match
+                if match:
                     results['in_scam_dataset'] = True
-                    results['dataset_confidence_score'] -= 0.4
-                    results['warnings'].append(f"⚠️ {company_name} found in known scam companies dataset")
+                    results['dataset_confidence_score'] -= 0.4 * match['similarity']
+                    if match['similarity'] == 1.0:
+                        results['warnings'].append(f"⚠️ {company_name} found in known scam companies dataset")
+                    else:
+                        results['warnings'].append(
+                            f"⚠️ {company_name} closely matches known scam company {match['name']} "
+                            f"({match['similarity']:.0%} similar)"
+                        )
                     print(f"[WARNING] {company_name} found in scam dataset!")
             
             # Check job description against scam patterns
-            if self.scam_patterns and job_desc:
+            if scam_patterns and job_desc:
                 results['checks_performed'].append('scam_pattern_check')
                 
-                job_desc_lower = job_desc.lower()
+                job_desc_lower = (document or DocumentContext(job_desc)).lower
                 
-                for pattern_item in self.scam_patterns:
-                    pattern = pattern_item.get('pattern', '').lower()
-                    
-                    if pattern and pattern in job_desc_lower:
-                        results['matching_patterns'].append({
-                            'pattern': pattern,
-                            'severity': pattern_item.get('severity', 'medium'),
-                            'description': pattern_item.get('description', '')
-                        })
-                        
-                        severity_weight = {
-                            'critical': 0.3,
-                            'high': 0.2,
-                            'medium': 0.1,
-                            'low': 0.05
-                        }
-                        
-                        weight = severity_weight.get(
-                            pattern_item.get('severity', 'medium'), 0.1
-                        )
-                        results['dataset_confidence_score'] -= weight
+                # One pass over the text finds every pattern; report them in dataset order
+                matched = sorted({i for _, _, i in automaton.iter_matches(job_desc_lower)})
+                
+                for i in matched:
+                    pattern_item = scam_patterns[i]
+                    severity = pattern_item.get('severity', 'medium')
+                    results['matching_patterns'].append({
+                        'pattern': str(pattern_item.get('pattern')).lower(),
+                        'severity': severity,
+                        'description': pattern_item.get('description', '')
+                    })
+                    results['dataset_confidence_score'] -= SEVERITY_WEIGHTS.get(severity, 0.1)
             
             # Check email domain against dataset
             if email and '@' in email:
@@ -290,10 +472,87 @@ class DatasetValidator:
         
         return results
     
-    def refresh_datasets(self):
-        """Refresh all datasets"""
-        print("[INFO] Refreshing datasets...")
-        self.legitimate_companies = set()
-        self.scam_companies = set()
-        self.scam_patterns = []
-        self._initialize_datasets()
+    @staticmethod
+    def _match(company_lower: str, names, fuzzy: FuzzyNameIndex = None) -> Optional[Dict[str, Any]]:
+        """Exact lookup, then the fuzzy index if it has been built"""
+        if company_lower in names:
+            return {'name': company_lower, 'similarity': 1.0, 'distance': 0}
+        return fuzzy.lookup(company_lower) if fuzzy is not None else None
+    
+    def refresh_datasets(self, wait: bool = False) -> threading.Thread:
+        """
+        Reload all datasets on a background thread
+        
+        The current datasets keep serving until the new ones are published.
+        A refresh requested while a load is running joins that load.
+        
+        Args:
+            wait: Block until loading finishes
+        
+        Returns:
+            threading.Thread: The loader thread
+        """
+        with self._loader_lock:
+            if self._loader is None or not self._loader.is_alive():
+                print("[INFO] Loading datasets in the background...")
+                self._loader = threading.Thread(
+                    target=self._initialize_datasets, name='dataset-loader', daemon=True
+                )
+                self._readiness.update(state='loading', started_at=time.time(), finished_at=None, error=None)
+                self._loader.start()
+            loader = self._loader
+        if wait:
+            loader.join()
+        return loader
+    
+    def wait_until_loaded(self, timeout: Optional[float] = None) -> bool:
+        """
+        Block until the running load, if any, finishes
+        
+        Args:
+            timeout: Seconds to wait; None waits indefinitely
+        
+        Returns:
+            bool: True if no load is running any more
+        """
+        with self._loader_lock:
+            loader = self._loader
+        if loader is None:
+            return True
+        loader.join(timeout)
+        return not loader.is_alive()
+    
+    def restart_after_fork(self):
+        """
+        Resume in a forked child a load that was still running in the parent
+        
+        The loader thread does not survive fork, so a child forked mid-load
+        would otherwise serve partial datasets forever.
+        """
+        self._loader_lock = threading.Lock()
+        interrupted = self._loader is not None and self._readiness['state'] in ('loading', 'partial')
+        self._loader = None
+        if interrupted:
+            self.refresh_datasets()
+
+
+_default_validator = None
+_default_validator_lock = threading.Lock()
+
+
+def _after_fork_in_child():
+    if _default_validator is not None:
+        _default_validator.restart_after_fork()
+
+
+os.register_at_fork(after_in_child=_after_fork_in_child)
+
+
+def get_dataset_validator() -> DatasetValidator:
+    """Shared validator, so datasets are loaded once per process"""
+    global _default_validator
+    if _default_validator is None:
+        with _default_validator_lock:
+            if _default_validator is None:
+                _default_validator = DatasetValidator()
+    return _default_validator
@@ -0,0 +1,223 @@
+# ========================
+# FUZZY COMPANY NAME INDEX
+# ========================
+
+import zlib
+from array import array
+from typing import TYPE_CHECKING, Dict, Iterable, List, Optional, Sequence
+
+if TYPE_CHECKING:
+    import numpy as np
+
+from services.company_index import normalize_name
+
+# Legal forms and filler words that scammers add, drop or swap freely
+LEGAL_SUFFIXES = {
+    'pvt', 'private', 'ltd', 'limited', 'inc', 'incorporated', 'llc', 'llp',
+    'corp', 'corporation', 'co', 'company', 'plc', 'gmbh', 'pte', 'opc'
+}
+STOPWORDS = {'the', 'and', 'of'}
+
+# Only the first PREFIX_LENGTH characters of a key feed the delete index,
+# which keeps it to about PREFIX_LENGTH + 1 entries per name
+PREFIX_LENGTH = 7
+
+
+def canonical_name(name: str) -> str:
+    """
+    Matching key for a company name
+
+    Lowercases, drops punctuation, legal suffixes and stopwords, then removes
+    spaces, so 'Tata-Consultancy Pvt. Ltd' and 'The TataConsultancy Limited'
+    share one key. Names made only of such words keep them.
+    """
+    tokens = normalize_name(name).split()
+    kept = [t for t in tokens if t not in LEGAL_SUFFIXES and t not in STOPWORDS]
+    return ''.join(kept or tokens)
+
+
+def _deletes(prefix: str) -> set:
+    """The prefix and every string one deletion away from it"""
+    return {prefix} | {prefix[:i] + prefix[i + 1:] for i in range(len(prefix))}
+
+
+def _variant_hash(variant: str) -> int:
+    """
+    Delete-index hash of a variant; stable across processes (unlike hash())
+    so a snapshot can store the index. Collisions only add candidates,
+    which the edit distance then rejects.
+    """
+    return zlib.crc32(variant.encode('utf-8'))
+
+
+def bounded_distance(a: str, b: str, bound: int) -> int:
+    """
+    Optimal string alignment distance (edits plus adjacent transpositions),
+    or bound + 1 as soon as it must exceed bound
+
+    Only the diagonal band of width 2 * bound + 1 is computed.
+    """
+    if abs(len(a) - len(b)) > bound:
+        return bound + 1
+    over = bound + 1
+    prev2 = None
+    prev = [j if j <= bound else over for j in range(len(b) + 1)]
+    for i in range(1, len(a) + 1):
+        cur = [over] * (len(b) + 1)
+        if i <= bound:
+            cur[0] = i
+        ca = a[i - 1]
+        lo = max(1, i - bound)
+        hi = min(len(b), i + bound)
+        row_min = cur[0]
+        for j in range(lo, hi + 1):
+            value = prev[j - 1] + (ca != b[j - 1])
+            if prev[j] + 1 < value:
+                value = prev[j] + 1
+            if cur[j - 1] + 1 < value:
+                value = cur[j - 1] + 1
+            # Adjacent transposition
+            if prev2 is not None and j > 1 and ca == b[j - 2] and a[i - 2] == b[j - 1]:
+                value = min(value, prev2[j - 2] + 1)
+            cur[j] = value
+            if value < row_min:
+                row_min = value
+        if row_min > bound:
+            return over
+        prev2, prev = prev, cur
+    return prev[-1] if prev[-1] <= bound else over
+
+
+class FuzzyNameIndex:
+    """
+    Purpose: Approximate company-name lookups against a fixed list
+    Allowed: Normalization, candidate generation, edit distance
+    Forbidden: Scoring policy, loading sources
+
+    Names are reduced to canonical keys (see canonical_name). Equal keys
+    match with similarity 1.0. Otherwise candidates come from a SymSpell
+    style index of single deletions of each key's prefix, held as sorted
+    numpy hash arrays (which a dataset snapshot stores, see tables()), and are verified with a bounded edit distance. The
+    allowed distance grows with key length: none below 5 characters, 1 up
+    to 9, then max_distance. Two edits both inside the prefix are missed;
+    that is the price of the compact index.
+    """
+
+    def __init__(self, names: Iterable[str], max_distance: int = 2, min_similarity: float = 0.85):
+        """
+        Args:
+            names: Company names; the first name seen for each key is reported
+            max_distance: Largest edit distance accepted for long names
+            min_similarity: Smallest 1 - distance / key length accepted
+        """
+        self.max_distance = max_distance
+        self.min_similarity = min_similarity
+        self.names: List[str] = []
+        self.keys: List[str] = []
+        self.exact: Dict[str, int] = {}
+
+        import numpy as np
+
+        hashes = array('I')
+        ids = array('i')
+        for name in names:
+            key = canonical_name(name)
+            if not key or key in self.exact:
+                continue
+            idx = len(self.names)
+            self.names.append(name)
+            self.keys.append(key)
+            self.exact[key] = idx
+            for variant in _deletes(key[:PREFIX_LENGTH]):
+                hashes.append(_variant_hash(variant))
+                ids.append(idx)
+
+        hashes = np.frombuffer(hashes, dtype=np.uint32) if hashes else np.empty(0, dtype=np.uint32)
+        ids = np.frombuffer(ids, dtype=np.int32) if ids else np.empty(0, dtype=np.int32)
+        order = np.argsort(hashes, kind='stable')
+        self._hashes = hashes[order]
+        self._ids = ids[order]
+
+    @classmethod
+    def from_tables(cls, names: Sequence[str], keys: Sequence[str], exact, hashes: 'np.ndarray',
+                    ids: 'np.ndarray', max_distance: int = 2, min_similarity: float = 0.85) -> 'FuzzyNameIndex':
+        """
+        Index over tables() output, skipping construction
+
+        Args:
+            names, keys: Name and canonical key of each entry, by entry number
+            exact: Key -> entry number lookup with a get() method
+            hashes, ids: Sorted delete-index hashes and their entry numbers
+        """
+        index = cls.__new__(cls)
+        index.max_distance = max_distance
+        index.min_similarity = min_similarity
+        index.names = names
+        index.keys = keys
+        index.exact = exact
+        index._hashes = hashes
+        index._ids = ids
+        return index
+
+    def tables(self) -> dict:
+        """Names, keys and delete-index arrays, as from_tables() takes them"""
+        return {'names': self.names, 'keys': self.keys, 'hashes': self._hashes, 'ids': self._ids}
+
+    def __len__(self) -> int:
+        return len(self.names)
+
+    def allowed_distance(self, key: str) -> int:
+        """Edit distance accepted for a key of this length"""
+        if len(key) < 5:
+            return 0
+        if len(key) < 10:
+            return min(1, self.max_distance)
+        return self.max_distance
+
+    def lookup(self, name: str) -> Optional[dict]:
+        """
+        Closest indexed name within the allowed distance
+
+        Args:
+            name: Company name as submitted
+
+        Returns:
+            dict: name, similarity (0-1) and distance of the best match, or None
+        """
+        key = canonical_name(name)
+        if not key:
+            return None
+
+        idx = self.exact.get(key)
+        if idx is not None:
+            return {'name': self.names[idx], 'similarity': 1.0, 'distance': 0}
+
+        bound = self.allowed_distance(key)
+        if bound == 0 or not len(self._hashes):
+            return None
+
+        import numpy as np
+
+        probes = np.array([_variant_hash(v) for v in _deletes(key[:PREFIX_LENGTH])], dtype=np.uint32)
+        starts = np.searchsorted(self._hashes, probes, side='left')
+        ends = np.searchsorted(self._hashes, probes, side='right')
+        candidates = set()
+        for start, end in zip(starts, ends):
+            if end > start:
+                candidates.update(self._ids[start:end].tolist())
+
+        # Highest similarity wins; ties go to the name indexed first
+        best = None
+        for idx in candidates:
+            other = self.keys[idx]
+            distance = bounded_distance(key, other, bound)
+            if distance > bound:
+                continue
+            similarity = 1.0 - distance / max(len(key), len(other))
+            if similarity >= self.min_similarity and (best is None or (similarity, -idx) > best[:2]):
+                best = (similarity, -idx, distance)
+
+        if best is None:
+            return None
+        similarity, neg_idx, distance = best
+        return {'name': self.names[-neg_idx], 'similarity': round(similarity, 4), 'distance': distance}
@@ -0,0 +1,149 @@
+# ========================
+# GOOGLE CUSTOM SEARCH CLIENT
+# ========================
+
+import asyncio
+import os
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import TYPE_CHECKING, Optional
+
+if TYPE_CHECKING:
+    import httpx
+    import requests
+
+from services.async_http import get_async_client
+from services.cse_budget import get_cse_budget
+from services.http_session import get_session
+
+CSE_ENDPOINT = 'https://www.googleapis.com/customsearch/v1'
+
+# Used to fan a verification's queries out in parallel
+fanout_pool = ThreadPoolExecutor(max_workers=16, thread_name_prefix='google-cse')
+
+# Queries currently on the wire, keyed by (query, cx, num)
+_inflight = {}
+_inflight_lock = threading.Lock()
+# Async queries on the wire, keyed the same way; only event loop threads touch it
+_inflight_async = {}
+
+
+def _after_fork_in_child():
+    # A forked worker starts with no threads and nothing in flight
+    global fanout_pool, _inflight, _inflight_lock
+    fanout_pool = ThreadPoolExecutor(max_workers=16, thread_name_prefix='google-cse')
+    _inflight = {}
+    _inflight_lock = threading.Lock()
+    _inflight_async.clear()
+
+
+os.register_at_fork(after_in_child=_after_fork_in_child)
+
+
+def search(query: str, api_key: str, cx: str, num: int = 5, timeout: float = 10) -> 'requests.Response':
+    """
+    Run one Google CSE query over the shared session
+
+    Identical queries issued while one is already in flight wait for that
+    call instead of sending their own, so bursts for the same company cost
+    a single unit of quota. Every query that is sent draws on the shared
+    rate limit and daily quota (see cse_budget), and its status is fed to
+    the circuit breaker.
+
+    Args:
+        query: Search query
+        api_key: Google CSE API key
+        cx: Custom search engine ID
+        num: Number of results to request
+        timeout: Request timeout in seconds
+
+    Returns:
+        requests.Response: Raw API response (shared between coalesced callers)
+
+    Raises:
+        BudgetDenied: The query was not sent (rate limit, quota or open breaker)
+    """
+    key = (query, cx, num)
+    with _inflight_lock:
+        future = _inflight.get(key)
+        owner = future is None
+        if owner:
+            future = Future()
+            _inflight[key] = future
+
+    if not owner:
+        return future.result()
+
+    try:
+        budget = get_cse_budget()
+        delay = budget.reserve()
+        if delay > 0:
+            time.sleep(delay)
+        params = {
+            'q': query,
+            'key': api_key,
+            'cx': cx,
+            'num': num
+        }
+        response = get_session().get(CSE_ENDPOINT, params=params, timeout=timeout)
+        budget.record(response.status_code)
+        future.set_result(response)
+        return response
+    except BaseException as e:
+        future.set_exception(e)
+        raise
+    finally:
+        with _inflight_lock:
+            _inflight.pop(key, None)
+
+
+async def search_async(query: str, api_key: str, cx: str, num: int = 5, timeout: float = 10) -> 'httpx.Response':
+    """
+    search() for the ASGI path, over the shared async client
+
+    Identical queries awaited at the same time share one request. A caller
+    that is cancelled stops waiting but leaves the request running for the
+    others.
+
+    Returns:
+        httpx.Response: Raw API response (shared between coalesced callers)
+
+    Raises:
+        BudgetDenied: The query was not sent (rate limit, quota or open breaker)
+    """
+    loop = asyncio.get_running_loop()
+    key = (query, cx, num)
+    task = _inflight_async.get(key)
+    if task is None or task.get_loop() is not loop:
+        params = {
+            'q': query,
+            'key': api_key,
+            'cx': cx,
+            'num': num
+        }
+        task = loop.create_task(_send_async(params, timeout))
+        _inflight_async[key] = task
+        task.add_done_callback(lambda done: _inflight_async.pop(key, None) if _inflight_async.get(key) is done else None)
+    return await asyncio.shield(task)
+
+
+async def _send_async(params: dict, timeout: float) -> 'httpx.Response':
+    # Budget calls are SQLite transactions, so they run off the event loop
+    budget = get_cse_budget()
+    delay = await asyncio.to_thread(budget.reserve)
+    if delay > 0:
+        await asyncio.sleep(delay)
+    response = await get_async_client().get(CSE_ENDPOINT, params=params, timeout=timeout)
+    await asyncio.to_thread(budget.record, response.status_code)
+    return response
+
+
+def blocked_reason() -> Optional[str]:
+    """Why no query could be sent right now ('circuit_open', 'quota_exhausted'), or None"""
+    return get_cse_budget().blocked_reason()
+
+
+async def blocked_reason_async() -> Optional[str]:
+    """blocked_reason() for the ASGI path, read off the event loop"""
+    return await asyncio.to_thread(get_cse_budget().blocked_reason)
@@ -0,0 +1,158 @@
+# ========================
+# SHARED HTTP SESSION
+# ========================
+
+import ipaddress
+import os
+import socket
+import threading
+import time
+from typing import TYPE_CHECKING, Dict, Tuple
+
+if TYPE_CHECKING:
+    import requests
+    from requests.adapters import HTTPAdapter
+
+
+class DNSCache:
+    """
+    Purpose: Remember hostname lookups for outbound connections
+    Allowed: Resolution, TTL bookkeeping
+    Forbidden: Opening connections, HTTP logic
+
+    The resolver's TTLs are not visible through getaddrinfo, so every
+    answer is kept for a fixed ttl. Only the first address is used; callers
+    forget() a host whose cached address fails to connect.
+    """
+
+    def __init__(self, ttl: float = 300, max_entries: int = 4096):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        # host -> (address, expires_at)
+        self._entries: Dict[str, Tuple[str, float]] = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def resolve(self, host: str) -> str:
+        """
+        Address to connect to for host
+
+        Raises:
+            socket.gaierror: The host does not resolve
+        """
+        try:
+            ipaddress.ip_address(host)
+            return host
+        except ValueError:
+            pass
+
+        now = time.monotonic()
+        entry = self._entries.get(host)
+        if entry is not None and entry[1] > now:
+            self.hits += 1
+            return entry[0]
+
+        self.misses += 1
+        address = socket.getaddrinfo(host, None, type=socket.SOCK_STREAM)[0][4][0]
+        with self._lock:
+            if len(self._entries) >= self.max_entries:
+                self._entries = {h: e for h, e in self._entries.items() if e[1] > now}
+                if len(self._entries) >= self.max_entries:
+                    self._entries.clear()
+            self._entries[host] = (address, now + self.ttl)
+        return address
+
+    def forget(self, host: str):
+        with self._lock:
+            self._entries.pop(host, None)
+
+    def stats(self) -> Dict[str, int]:
+        return {'entries': len(self._entries), 'hits': self.hits, 'misses': self.misses}
+
+
+dns_cache = DNSCache(ttl=float(os.getenv('DNS_CACHE_TTL', '300')))
+
+_session = None
+_session_lock = threading.Lock()
+
+
+def _after_fork_in_child():
+    # Pooled sockets must not be shared with the parent; open fresh ones lazily
+    global _session, _session_lock, dns_cache
+    _session = None
+    _session_lock = threading.Lock()
+    dns_cache = DNSCache(ttl=dns_cache.ttl, max_entries=dns_cache.max_entries)
+
+
+os.register_at_fork(after_in_child=_after_fork_in_child)
+
+
+def _dns_caching_adapter(pool_size: int) -> 'HTTPAdapter':
+    """HTTPAdapter whose new connections resolve hosts through dns_cache"""
+    from requests.adapters import HTTPAdapter
+    from urllib3.connection import HTTPConnection, HTTPSConnection
+    from urllib3.connectionpool import HTTPConnectionPool, HTTPSConnectionPool
+
+    class CachedDNSMixin:
+        def _new_conn(self):
+            # urllib3 connects to _dns_host; TLS still checks the original name
+            name = self._dns_host
+            try:
+                address = dns_cache.resolve(name)
+            except OSError:
+                # Let urllib3 resolve it again and raise its own error
+                return super()._new_conn()
+            self._dns_host = address
+            try:
+                return super()._new_conn()
+            except Exception:
+                dns_cache.forget(name)
+                raise
+            finally:
+                self._dns_host = name
+
+    class CachedHTTPConnection(CachedDNSMixin, HTTPConnection):
+        pass
+
+    class CachedHTTPSConnection(CachedDNSMixin, HTTPSConnection):
+        pass
+
+    class CachedHTTPConnectionPool(HTTPConnectionPool):
+        ConnectionCls = CachedHTTPConnection
+
+    class CachedHTTPSConnectionPool(HTTPSConnectionPool):
+        ConnectionCls = CachedHTTPSConnection
+
+    class CachedDNSAdapter(HTTPAdapter):
+        def init_poolmanager(self, *args, **kwargs):
+            super().init_poolmanager(*args, **kwargs)
+            self.poolmanager.pool_classes_by_scheme = {
+                'http': CachedHTTPConnectionPool,
+                'https': CachedHTTPSConnectionPool
+            }
+
+    return CachedDNSAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+
+
+def get_session() -> 'requests.Session':
+    """
+    Return the process-wide keep-alive session
+
+    All outbound calls (Google CSE, website checks) go through one pooled
+    session so TCP/TLS connections are reused across requests and threads,
+    and hostnames are resolved through dns_cache.
+    """
+    global _session
+    if _session is None:
+        with _session_lock:
+            if _session is None:
+                import requests
+
+                pool_size = int(os.getenv('HTTP_POOL_SIZE', '32'))
+                session = requests.Session()
+                adapter = _dns_caching_adapter(pool_size)
+                session.mount('https://', adapter)
+                session.mount('http://', adapter)
+                _session = session
+    return _session
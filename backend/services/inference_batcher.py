@@ -0,0 +1,117 @@
+# ========================
+# DYNAMIC BATCHING SCHEDULER
+# ========================
+
+import os
+import queue
+import threading
+import time
+from collections import Counter
+from concurrent.futures import Future
+from typing import Any, Callable, Dict, List
+
+
+class MicroBatcher:
+    """
+    Purpose: Group concurrent single-item inference calls into batches
+    Allowed: Queueing, batching, resolving futures
+    Forbidden: Model loading, scoring logic
+
+    Callers submit one item and get a Future. A worker thread takes the first
+    queued item, keeps collecting for up to max_wait_ms or until max_batch_size
+    items are queued, runs batch_fn once on the whole batch and resolves every
+    caller's future with its own result.
+    """
+
+    def __init__(self, batch_fn: Callable[[List[Any]], List[Any]],
+                 max_batch_size: int = 16, max_wait_ms: float = 5.0, name: str = 'inference'):
+        """
+        Args:
+            batch_fn: Maps a list of items to a list of results of the same length
+            max_batch_size: Largest batch handed to batch_fn
+            max_wait_ms: How long to hold the first item while waiting for more
+            name: Worker thread name
+        """
+        self.batch_fn = batch_fn
+        self.max_batch_size = max(1, max_batch_size)
+        self.max_wait = max(0.0, max_wait_ms) / 1000.0
+        self.name = name
+
+        self._queue = queue.Queue()
+        self._worker = None
+        self._worker_pid = None
+        self._start_lock = threading.Lock()
+        self._stats_lock = threading.Lock()
+
+        self.batches = 0
+        self.items = 0
+        self.batch_sizes = Counter()
+
+    def submit(self, item: Any) -> Future:
+        """Queue one item for batched inference"""
+        self._ensure_worker()
+        future = Future()
+        self._queue.put((item, future))
+        return future
+
+    def _ensure_worker(self):
+        """Start the worker lazily, and again in a forked child (threads do not survive fork)"""
+        if self._worker is not None and self._worker_pid == os.getpid() and self._worker.is_alive():
+            return
+        with self._start_lock:
+            if self._worker is not None and self._worker_pid == os.getpid() and self._worker.is_alive():
+                return
+            if self._worker_pid != os.getpid():
+                self._queue = queue.Queue()
+            self._worker = threading.Thread(target=self._run, name=f'{self.name}-batcher', daemon=True)
+            self._worker_pid = os.getpid()
+            self._worker.start()
+
+    def _collect(self) -> list:
+        """Block for the first item, then gather more until the batch is full or the wait expires"""
+        batch = [self._queue.get()]
+        deadline = time.monotonic() + self.max_wait
+        while len(batch) < self.max_batch_size:
+            remaining = deadline - time.monotonic()
+            try:
+                if remaining <= 0:
+                    batch.append(self._queue.get_nowait())
+                else:
+                    batch.append(self._queue.get(timeout=remaining))
+            except queue.Empty:
+                break
+        return batch
+
+    def _run(self):
+        """Worker loop"""
+        while True:
+            batch = self._collect()
+            items = [item for item, _ in batch]
+
+            with self._stats_lock:
+                self.batches += 1
+                self.items += len(items)
+                self.batch_sizes[len(items)] += 1
+
+            try:
+                results = self.batch_fn(items)
+                if len(results) != len(items):
+                    raise RuntimeError(f'batch_fn returned {len(results)} results for {len(items)} items')
+                for (_, future), result in zip(batch, results):
+                    future.set_result(result)
+            except Exception as e:
+                for _, future in batch:
+                    future.set_exception(e)
+
+    def stats(self) -> Dict[str, Any]:
+        """Queue depth, batch counts and batch-size histogram"""
+        with self._stats_lock:
+            return {
+                'queue_depth': self._queue.qsize(),
+                'batches': self.batches,
+                'items': self.items,
+                'mean_batch_size': round(self.items / self.batches, 2) if self.batches else 0.0,
+                'batch_size_histogram': dict(sorted(self.batch_sizes.items())),
+                'max_batch_size': self.max_batch_size,
+                'max_wait_ms': self.max_wait * 1000.0
+            }
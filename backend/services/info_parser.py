@@ -3,68 +3,208 @@
 # ========================
 
 import re
-from typing import Dict, Any
+from typing import Dict, Any, List, Tuple
+
+from preprocessing.document_context import DocumentContext
+
+# Red flag patterns - more specific to avoid false positives
+# Use regex with word boundaries to avoid matching legitimate phrases
+RED_FLAG_PATTERNS = {
+    'payment_required': [
+        r'\brequires\s+payment\b',
+        r'registration\s+fee',
+        r'upfront\s+(?:cost|payment|fee)',
+        r'pay\s+to\s+(?:apply|join|start)',
+        r'deposit\s+required',
+        r'upfront\s+investment',
+        r'₹\s*\d+\s*(?:fee|cost|payment)'
+    ],
+    'personal_info': [
+        r'bank\s+(?:account|details)',
+        r'aadhar',
+        r'\bpan\b',
+        r'passport',
+        r'ssn',
+        r'credit\s+card'
+    ],
+    'unrealistic_salary': [
+        r'earn\s+(?:fast|quick|money)',
+        r'quick\s+(?:money|cash|earnings)',
+        r'passive\s+income',
+        r'make\s+money\s+fast',
+        r'guaranteed\s+(?:income|earnings)',
+        r'\b(?:50000|100000|unlimited)\s+(?:per\s+month|monthly)\b'
+    ],
+    'pressure_to_decide': [
+        r'(?:only|just|just\s+)\d+\s+(?:spots|positions|seats)\s+(?:left|available)',
+        r'(?:immediate|urgent)\s+(?:decision|action|hiring)',
+        r'decide\s+(?:now|today|immediately)',
+        r'(?:limited|urgent)\s+(?:opportunity|positions)'
+    ],
+    'vague_communication': [
+        r'(?:no\s+)?(?:experience|skills?)\s+(?:required|needed)',
+        r'simple\s+tasks',
+        # NOTE: Removed 'work from home' - now a standard practice, not a red flag
+        r'(?:complete|just)\s+(?:simple|easy)\s+tasks'
+    ],
+    'no_contract': [
+        r'(?:no|without)\s+(?:written\s+)?contract',
+        r'verbal\s+agreement\s+(?:only)?',
+        r'informal\s+arrangement',
+    ],
+    'unprofessional': [
+        r'!!+',  # Multiple exclamation marks
+        r'\bclick\s+here\b',
+        r'apply\s+(?:now|today|here)',
+    ]
+}
+
+
+class RedFlagScanner:
+    """
+    Purpose: Find every red flag category with the offsets of its matches
+    Allowed: Regex matching
+    Forbidden: Scoring logic
+
+    Rules are compiled once and each is searched with finditer. A single
+    named-group alternation over the whole catalog was measured at about
+    twice the cost under CPython's re, which tries every alternative at
+    every position (see bench_red_flags in tests/run_benchmarks.py).
+
+    tests/run_red_flag_tests.py checks scan() against re.finditer per rule.
+    """
+
+    def __init__(self, catalog: Dict[str, List[str]]):
+        """
+        Args:
+            catalog: Category -> list of regex patterns
+        """
+        self.rules = [
+            (category, re.compile(pattern, re.IGNORECASE))
+            for category, patterns in catalog.items()
+            for pattern in patterns
+        ]
+
+    def scan(self, text: str) -> Dict[str, List[Tuple[int, int]]]:
+        """
+        Returns:
+            Dict: Category -> sorted (start, end) spans of every rule match
+        """
+        matches = {}
+        for category, rule in self.rules:
+            for match in rule.finditer(text):
+                matches.setdefault(category, []).append(match.span())
+        for spans in matches.values():
+            spans.sort()
+        return matches
+
 
 class InternshipInfoParser:
     """
     Parses raw internship information text and extracts structured data.
     Uses NLP patterns and keyword matching to identify key information.
     """
-    
+
+    # Patterns are compiled once at class load and shared by every instance
+    PATTERNS = {
+        'email': re.compile(r'[\w\.-]+@[\w\.-]+\.\w+'),
+        'url': re.compile(r'https?://(?:www\.)?[-a-zA-Z0-9@:%._\+~#=]{1,256}\.[a-zA-Z0-9()]{1,6}\b(?:[-a-zA-Z0-9()@:%_\+.~#?&/=]*)'),
+        'phone': re.compile(r'\+?1?\d{9,15}'),
+        'currency': re.compile(r'(?:Rs|₹|\$|€|£)\s*[\d,]+(?:\.\d{2})?'),
+    }
+
+    # Searched over the whole text, so whitespace may not cross a line break;
+    # the lookahead on possible first letters lets the engine skip ahead fast
+    COMPANY_SUFFIX_RE = re.compile(r'(?=[plic])(PRIVATE LIMITED|PVT\.?[^\S\n]*LTD|LTD|LIMITED|INC|CORP|CORPORATION)', re.IGNORECASE)
+    LABEL_SEPARATOR_RE = re.compile(r'[:–-]')
+    NON_COMPANY_LINE_RE = re.compile(r'^(about|start date|duration|stipend|salary|position|role|internship|location|apply|actively|hiring)', re.IGNORECASE)
+    NUMERIC_LINE_RE = re.compile(r'^[\d\s,/-]+$')
+    MONEY_LINE_RE = re.compile(r'[₹$€£]\s*[\d,]+|per\s+month|per\s+annum', re.IGNORECASE)
+    ABOUT_LINE_RE = re.compile(r'^about\s+(?:the\s+)?(.+?)(?:\s*:|$)', re.IGNORECASE)
+    FIELD_LABEL_RE = re.compile(r'^(role|position|location|duration|stipend):', re.IGNORECASE)
+
+    PLACEHOLDER_EMAIL_RE = re.compile(r'(example|test|sample|noreply)', re.IGNORECASE)
+    INTERNSHALA_RE = re.compile(r'internshala', re.IGNORECASE)
+    LINKEDIN_RE = re.compile(r'linkedin', re.IGNORECASE)
+    POSTING_KEYWORDS_RE = re.compile(r'(internship|intern|stipend|duration|job description)', re.IGNORECASE)
+
+    POSITION_COMPANY_RE = re.compile(r'(PRIVATE LIMITED|LTD|INC|CORP)', re.IGNORECASE)
+    POSITION_FIRST_LINE_RE = re.compile(r'(intern|admin|manager|developer|engineer|analyst|assist|coord|execut|trainee|assoc|designer|specialist)', re.IGNORECASE)
+    POSITION_LINE_RE = re.compile(r'(intern|admin|manager|developer|engineer|analyst|designer|coord|execut|trainee|assoc|specialist)', re.IGNORECASE)
+    POSITION_KEYWORD_RES = [
+        re.compile(rf'{keyword}[:\s\-–]+([^\n]+)')
+        for keyword in ['position', 'role', 'designation', 'title', 'job title', 'internship role']
+    ]
+
+    SALARY_RANGE_RE = re.compile(r'(?:stipend|salary)[:\s]*(?:₹|Rs\.?|\$)\s*([\d,]+\s*-\s*[\d,]+\s*(?:/month|per month|/month)?)', re.IGNORECASE)
+    SALARY_KEYWORD_RES = [
+        re.compile(rf'{keyword}[:\s\-–]+([\w\s₹$€£,\.]+)')
+        for keyword in ['salary', 'stipend', 'compensation', 'remuneration', 'payment', 'per month', 'pm', 'per annum', 'pa']
+    ]
+
+    DURATION_RE = re.compile(r'(\d+\s*(?:weeks?|months?|years?))')
+    DURATION_KEYWORD_RES = [
+        re.compile(rf'{keyword}[:\s\-–]+([^\n]+)')
+        for keyword in ['duration', 'period', 'length', 'timeline']
+    ]
+
+    RED_FLAG_SCANNER = RedFlagScanner(RED_FLAG_PATTERNS)
+
     def __init__(self):
-        self.patterns = {
-            'email': r'[\w\.-]+@[\w\.-]+\.\w+',
-            'url': r'https?://(?:www\.)?[-a-zA-Z0-9@:%._\+~#=]{1,256}\.[a-zA-Z0-9()]{1,6}\b(?:[-a-zA-Z0-9()@:%_\+.~#?&/=]*)',
-            'phone': r'\+?1?\d{9,15}',
-            'currency': r'(?:Rs|₹|\$|€|£)\s*[\d,]+(?:\.\d{2})?',
-        }
+        self.patterns = self.PATTERNS
     
-    def parse(self, raw_text: str) -> Dict[str, Any]:
+    def parse(self, raw_text: str, document: DocumentContext = None) -> Dict[str, Any]:
         """
         Parse raw internship information and return structured data.
         
         Args:
             raw_text (str): Raw internship information provided by user
+            document (DocumentContext): Shared views of raw_text, if already built
             
         Returns:
             Dict: Structured information with extracted fields
         """
+        document = document or DocumentContext(raw_text)
+
         # Extract company name
-        company_name = self._extract_company_name(raw_text)
+        company_name = self._extract_company_name(raw_text, document)
+        red_flag_matches = self.RED_FLAG_SCANNER.scan(document.lower)
         
         parsed_data = {
             'companyName': company_name,
             'companyWebsite': self._extract_website(raw_text),
             'contactEmail': self._extract_email(raw_text),
-            'position': self._extract_position(raw_text),
-            'salary': self._extract_salary(raw_text),
-            'duration': self._extract_duration(raw_text),
-            'workType': self._extract_work_type(raw_text),
-            'redFlags': self._extract_red_flags(raw_text),
+            'position': self._extract_position(raw_text, document),
+            'salary': self._extract_salary(raw_text, document),
+            'duration': self._extract_duration(raw_text, document),
+            'workType': self._extract_work_type(raw_text, document),
+            'redFlags': list(red_flag_matches),
+            'redFlagMatches': {flag: [list(span) for span in spans] for flag, spans in red_flag_matches.items()},
             'jobDescription': raw_text,  # Store full text as job description for analysis
             'rawText': raw_text
         }
         
         return parsed_data
     
-    def _extract_company_name(self, text: str) -> str:
+    def _extract_company_name(self, text: str, document: DocumentContext = None) -> str:
         """Extract company name from text - intelligent detection"""
-        lines = [line.strip() for line in text.split('\n') if line.strip()]
+        document = document or DocumentContext(text)
+        lines = document.lines
         
         if not lines:
             return "Unknown Company"
         
         # Strategy 0: Look for company names with PRIVATE LIMITED, LTD, INC, etc.
-        for i, line in enumerate(lines):
-            if re.search(r'(PRIVATE LIMITED|PVT\.?\s*LTD|LTD|LIMITED|INC|CORP|CORPORATION)', line, re.IGNORECASE):
-                return line
+        # One search over the whole text finds the first line containing a suffix
+        match = self.COMPANY_SUFFIX_RE.search(text)
+        if match:
+            return document.line_at(match.start())
         
         # Strategy 1: Look for explicit company/organization keywords
-        for i, line in enumerate(lines):
-            line_lower = line.lower()
+        for line, line_lower in zip(lines, document.lines_lower):
             if any(keyword in line_lower for keyword in ['company:', 'organization:', 'firm:', 'employer:']):
                 # Extract text after the keyword
-                parts = re.split(r'[:–-]', line, 1)
+                parts = self.LABEL_SEPARATOR_RE.split(line, 1)
                 if len(parts) > 1:
                     extracted = parts[1].strip()
                     if extracted:
@@ -72,12 +212,12 @@ class InternshipInfoParser:
         
         # Strategy 2: Check for lines that appear multiple times (strong indicator)
         # Company names are often repeated multiple times in job postings
-        text_lower = text.lower()
         repeated_candidates = []
+        occurrence_counts = {}
         
-        for line in lines[:15]:  # Check first 15 lines
+        for line, line_lower in zip(lines[:15], document.lines_lower[:15]):  # Check first 15 lines
             # Skip common non-company patterns
-            if re.match(r'^(about|start date|duration|stipend|salary|position|role|internship|location|apply|actively|hiring)', line, re.IGNORECASE):
+            if self.NON_COMPANY_LINE_RE.match(line):
                 continue
             
             # Skip very short lines
@@ -85,15 +225,18 @@ class InternshipInfoParser:
                 continue
             
             # Skip purely numeric lines
-            if re.match(r'^[\d\s,/-]+$', line):
+            if self.NUMERIC_LINE_RE.match(line):
                 continue
             
             # Skip lines with lots of currency/numbers
-            if re.search(r'[₹$€£]\s*[\d,]+|per\s+month|per\s+annum', line, re.IGNORECASE):
+            if self.MONEY_LINE_RE.search(line):
                 continue
             
             # Count occurrences (case-insensitive)
-            occurrences = text_lower.count(line.lower())
+            # (a line repeated near the top is only counted once)
+            occurrences = occurrence_counts.get(line_lower)
+            if occurrences is None:
+                occurrences = occurrence_counts[line_lower] = document.lower.count(line_lower)
             
             # If appears 2+ times, it's likely the company name
             if occurrences >= 2:
@@ -107,22 +250,23 @@ class InternshipInfoParser:
         # Strategy 3: Look for lines with business indicators
         for line in lines[:12]:
             # Skip common patterns
-            if re.match(r'^(about|start date|duration|stipend|salary|position|role|internship|location|apply|actively|hiring)', line, re.IGNORECASE):
+            if self.NON_COMPANY_LINE_RE.match(line):
                 continue
             
-            word_count = len(line.split())
+            words = line.split()
+            word_count = len(words)
             
             # 1-3 word proper-cased names are good candidates
             if 1 <= word_count <= 3:
                 # Check if properly capitalized (good indicator of company name)
-                if any(word[0].isupper() for word in line.split()):
+                if any(word[0].isupper() for word in words):
                     # Not pure lowercase
                     if line != line.lower():
                         return line
         
         # Strategy 4: Look for "About [Company]" section
         for line in lines:
-            match = re.match(r'^about\s+(?:the\s+)?(.+?)(?:\s*:|$)', line, re.IGNORECASE)
+            match = self.ABOUT_LINE_RE.match(line)
             if match:
                 company = match.group(1).strip()
                 if company and len(company) > 2:
@@ -131,7 +275,7 @@ class InternshipInfoParser:
         # Strategy 5: First line that looks like a proper name
         for line in lines[:5]:
             # Must be capitalized and not a label
-            if line[0].isupper() and not re.match(r'^(role|position|location|duration|stipend):', line, re.IGNORECASE):
+            if line[0].isupper() and not self.FIELD_LABEL_RE.match(line):
                 if len(line) > 2:
                     return line
         
@@ -144,57 +288,55 @@ class InternshipInfoParser:
     
     def _extract_website(self, text: str) -> str:
         """Extract website URL from text"""
-        urls = re.findall(self.patterns['url'], text)
+        urls = self.patterns['url'].findall(text)
         if urls:
             return urls[0]
         return ""
     
     def _extract_email(self, text: str) -> str:
         """Extract email address from text"""
-        emails = re.findall(self.patterns['email'], text)
+        emails = self.patterns['email'].findall(text)
         if emails:
             # Filter out common non-contact emails
-            valid_emails = [e for e in emails if not re.search(r'(example|test|sample|noreply)', e, re.IGNORECASE)]
+            valid_emails = [e for e in emails if not self.PLACEHOLDER_EMAIL_RE.search(e)]
             if valid_emails:
                 return valid_emails[0]
         
         # Check if it's from a known platform (Internshala, LinkedIn, etc.)
-        if re.search(r'internshala', text, re.IGNORECASE):
+        if self.INTERNSHALA_RE.search(text):
             return "internship@internshala.com"  # Placeholder for Internshala postings
-        if re.search(r'linkedin', text, re.IGNORECASE):
+        if self.LINKEDIN_RE.search(text):
             return "jobs@linkedin.com"  # Placeholder for LinkedIn postings
         
         # For real internship postings where email is not provided
         # Return a generic contact email to indicate it's a legitimate posting
-        if re.search(r'(internship|intern|stipend|duration|job description)', text, re.IGNORECASE):
+        if self.POSTING_KEYWORDS_RE.search(text):
             return "contact@company.com"  # Generic placeholder for real postings
         
         return ""
     
-    def _extract_position(self, text: str) -> str:
+    def _extract_position(self, text: str, document: DocumentContext = None) -> str:
         """Extract job position from text"""
-        text_lower = text.lower()
-        lines = [line.strip() for line in text.split('\n') if line.strip()]
+        document = document or DocumentContext(text)
+        text_lower = document.lower
+        lines = document.lines
         
         # Strategy 1: First line if it looks like a position (before company name)
-        if lines and len(lines[0]) < 50 and not re.search(r'(PRIVATE LIMITED|LTD|INC|CORP)', lines[0], re.IGNORECASE):
+        if lines and len(lines[0]) < 50 and not self.POSITION_COMPANY_RE.search(lines[0]):
             # Check if it contains typical position words (including partial matches)
-            if re.search(r'(intern|admin|manager|developer|engineer|analyst|assist|coord|execut|trainee|assoc|designer|specialist)', lines[0], re.IGNORECASE):
+            if self.POSITION_FIRST_LINE_RE.search(lines[0]):
                 # Clean up the line (no newlines)
                 position = lines[0].replace('\n', ' ').strip()
                 if len(position) >= 3:
                     return position
         
         # Strategy 2: Look for position-related keywords (without newlines)
-        position_keywords = ['position', 'role', 'designation', 'title', 'job title', 'internship role']
-        
-        for keyword in position_keywords:
-            pattern = rf'{keyword}[:\s\-–]+([^\n]+)'
-            match = re.search(pattern, text_lower)
+        for pattern in self.POSITION_KEYWORD_RES:
+            match = pattern.search(text_lower)
             if match:
                 # Extract from original text to preserve case
                 pos_text = match.group(1).strip()
-                idx = text.lower().find(pos_text)
+                idx = text_lower.find(pos_text)
                 if idx >= 0:
                     extracted = text[idx:idx+len(pos_text)].strip()
                     # Return only if meaningful (3+ chars), clean newlines
@@ -203,65 +345,58 @@ class InternshipInfoParser:
         
         # Look for common position titles (search line by line to avoid newlines)
         for line in lines[:10]:  # Check first 10 lines
-            if re.search(r'(intern|admin|manager|developer|engineer|analyst|designer|coord|execut|trainee|assoc|specialist)', line, re.IGNORECASE):
+            if self.POSITION_LINE_RE.search(line):
                 if len(line) >= 3 and len(line) < 100:
                     return line
         
         return ""
     
-    def _extract_salary(self, text: str) -> str:
+    def _extract_salary(self, text: str, document: DocumentContext = None) -> str:
         """Extract salary/stipend information from text"""
-        text_lower = text.lower()
+        text_lower = (document or DocumentContext(text)).lower
         
         # Strategy 1: Look for stipend/salary with range (e.g., ₹ 5,000 - 8,000 /month)
-        range_pattern = r'(?:stipend|salary)[:\s]*(?:₹|Rs\.?|\$)\s*([\d,]+\s*-\s*[\d,]+\s*(?:/month|per month|/month)?)'
-        match = re.search(range_pattern, text, re.IGNORECASE)
+        match = self.SALARY_RANGE_RE.search(text)
         if match:
             return match.group(1).strip()
         
         # Strategy 2: Look for salary keywords
-        salary_keywords = ['salary', 'stipend', 'compensation', 'remuneration', 'payment', 'per month', 'pm', 'per annum', 'pa']
-        
-        for keyword in salary_keywords:
-            pattern = rf'{keyword}[:\s\-–]+([\w\s₹$€£,\.]+)'
-            match = re.search(pattern, text_lower)
+        for pattern in self.SALARY_KEYWORD_RES:
+            match = pattern.search(text_lower)
             if match:
-                idx = text.lower().find(match.group(1))
+                idx = text_lower.find(match.group(1))
                 salary_text = text[idx:idx+len(match.group(1))].strip()
                 if salary_text:
                     return salary_text
         
         # Look for currency amounts
-        currencies = re.findall(self.patterns['currency'], text)
+        currencies = self.patterns['currency'].findall(text)
         if currencies:
             return currencies[0]
         
         return ""
     
-    def _extract_duration(self, text: str) -> str:
+    def _extract_duration(self, text: str, document: DocumentContext = None) -> str:
         """Extract internship duration from text"""
-        text_lower = text.lower()
+        text_lower = (document or DocumentContext(text)).lower
         
         # Look for duration keywords
-        duration_pattern = r'(\d+\s*(?:weeks?|months?|years?))'
-        matches = re.findall(duration_pattern, text_lower)
+        matches = self.DURATION_RE.findall(text_lower)
         if matches:
             return matches[0]
         
         # Look for specific phrases
-        duration_keywords = ['duration', 'period', 'length', 'timeline']
-        for keyword in duration_keywords:
-            pattern = rf'{keyword}[:\s\-–]+([^\n]+)'
-            match = re.search(pattern, text_lower)
+        for pattern in self.DURATION_KEYWORD_RES:
+            match = pattern.search(text_lower)
             if match:
-                idx = text.lower().find(match.group(1))
+                idx = text_lower.find(match.group(1))
                 return text[idx:idx+len(match.group(1))].strip()
         
         return ""
     
-    def _extract_work_type(self, text: str) -> str:
+    def _extract_work_type(self, text: str, document: DocumentContext = None) -> str:
         """Extract work type (remote, hybrid, onsite) from text"""
-        text_lower = text.lower()
+        text_lower = (document or DocumentContext(text)).lower
         
         work_types = {
             'remote': ['remote', 'work from home', 'wfh', 'online'],
@@ -276,67 +411,6 @@ class InternshipInfoParser:
         
         return ""
     
-    def _extract_red_flags(self, text: str) -> list:
+    def _extract_red_flags(self, text: str, document: DocumentContext = None) -> list:
         """Extract potential red flags from the text"""
-        red_flags = []
-        text_lower = text.lower()
-        
-        # Red flag patterns - more specific to avoid false positives
-        # Use regex with word boundaries to avoid matching legitimate phrases
-        suspicious_patterns = {
-            'payment_required': [
-                r'\brequires\s+payment\b',
-                r'registration\s+fee',
-                r'upfront\s+(?:cost|payment|fee)',
-                r'pay\s+to\s+(?:apply|join|start)',
-                r'deposit\s+required',
-                r'upfront\s+investment',
-                r'₹\s*\d+\s*(?:fee|cost|payment)'
-            ],
-            'personal_info': [
-                r'bank\s+(?:account|details)',
-                r'aadhar',
-                r'\bpan\b',
-                r'passport',
-                r'ssn',
-                r'credit\s+card'
-            ],
-            'unrealistic_salary': [
-                r'earn\s+(?:fast|quick|money)',
-                r'quick\s+(?:money|cash|earnings)',
-                r'passive\s+income',
-                r'make\s+money\s+fast',
-                r'guaranteed\s+(?:income|earnings)',
-                r'\b(?:50000|100000|unlimited)\s+(?:per\s+month|monthly)\b'
-            ],
-            'pressure_to_decide': [
-                r'(?:only|just|just\s+)\d+\s+(?:spots|positions|seats)\s+(?:left|available)',
-                r'(?:immediate|urgent)\s+(?:decision|action|hiring)',
-                r'decide\s+(?:now|today|immediately)',
-                r'(?:limited|urgent)\s+(?:opportunity|positions)'
-            ],
-            'vague_communication': [
-                r'(?:no\s+)?(?:experience|skills?)\s+(?:required|needed)',
-                r'simple\s+tasks',
-                # NOTE: Removed 'work from home' - now a standard practice, not a red flag
-                r'(?:complete|just)\s+(?:simple|easy)\s+tasks'
-            ],
-            'no_contract': [
-                r'(?:no|without)\s+(?:written\s+)?contract',
-                r'verbal\s+agreement\s+(?:only)?',
-                r'informal\s+arrangement',
-            ],
-            'unprofessional': [
-                r'!!+',  # Multiple exclamation marks
-                r'\bclick\s+here\b',
-                r'apply\s+(?:now|today|here)',
-            ]
-        }
-        
-        for flag_type, patterns in suspicious_patterns.items():
-            for pattern in patterns:
-                if re.search(pattern, text_lower, re.IGNORECASE):
-                    red_flags.append(flag_type)
-                    break
-        
-        return list(set(red_flags))  # Remove duplicates
+        return list(self.RED_FLAG_SCANNER.scan((document or DocumentContext(text)).lower))
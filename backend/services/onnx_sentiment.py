@@ -0,0 +1,132 @@
+# ========================
+# ONNX SENTIMENT MODEL
+# ========================
+
+import json
+import os
+from typing import Dict, List
+
+import numpy as np
+
+# Exported by models/export_onnx.py
+ONNX_MODEL_FILE = 'model.onnx'
+ONNX_QUANTIZED_MODEL_FILE = 'model.int8.onnx'
+
+
+class OnnxSentimentModel:
+    """
+    Purpose: Sentiment inference through onnxruntime
+    Allowed: Tokenization, ONNX inference, softmax
+    Forbidden: Scoring logic, network access
+
+    Drop-in for the transformers sentiment pipeline: called with a list of
+    texts, returns [{'label': ..., 'score': ...}]. predict_ids scores token
+    id windows that are already tokenized. Loads everything from a local
+    directory and never imports torch.
+    """
+
+    def __init__(self, model_dir: str, quantized: bool = True, max_length: int = 512):
+        """
+        Args:
+            model_dir: Directory with model(.int8).onnx, tokenizer.json and config.json
+            quantized: Use the dynamic int8 graph instead of the fp32 one
+            max_length: Token limit per text
+        """
+        import onnxruntime
+        from tokenizers import Tokenizer
+
+        model_file = ONNX_QUANTIZED_MODEL_FILE if quantized else ONNX_MODEL_FILE
+        model_path = os.path.join(model_dir, model_file)
+        if not os.path.exists(model_path):
+            raise FileNotFoundError(
+                f"{model_path} not found - run: python models/export_onnx.py --output {model_dir}"
+            )
+
+        with open(os.path.join(model_dir, 'config.json'), 'r', encoding='utf-8') as f:
+            config = json.load(f)
+        self.id2label = {int(k): v for k, v in config.get('id2label', {}).items()}
+
+        tokenizer_path = os.path.join(model_dir, 'tokenizer.json')
+        self.tokenizer = Tokenizer.from_file(tokenizer_path)
+        # Untruncated copy that tokenizes long texts once for windowing
+        self.window_tokenizer = Tokenizer.from_file(tokenizer_path)
+        # Special tokens around a single sequence ([CLS] and [SEP] for DistilBERT)
+        specials = self.window_tokenizer.encode('', add_special_tokens=True).ids
+        self.prefix_ids, self.suffix_ids = specials[:1], specials[1:]
+        self.tokenizer.enable_truncation(max_length)
+        self.pad_id = config.get('pad_token_id', 0)
+        self.tokenizer.enable_padding(pad_id=self.pad_id, pad_token=self.tokenizer.id_to_token(self.pad_id) or '[PAD]')
+
+        options = onnxruntime.SessionOptions()
+        options.graph_optimization_level = onnxruntime.GraphOptimizationLevel.ORT_ENABLE_ALL
+        self.session = onnxruntime.InferenceSession(
+            model_path, options, providers=['CPUExecutionProvider']
+        )
+        self.input_names = {i.name for i in self.session.get_inputs()}
+        self.model_path = model_path
+
+    def token_ids(self, texts: List[str]) -> List[List[int]]:
+        """Token ids of each text, without special tokens or truncation"""
+        return [e.ids for e in self.window_tokenizer.encode_batch(list(texts), add_special_tokens=False)]
+
+    def predict_ids(self, windows: List[List[int]], batch_size: int = None) -> List[Dict]:
+        """
+        Score token id sequences from token_ids without tokenizing again
+
+        Each window is wrapped in the special tokens and padded to the
+        longest window of its batch.
+
+        Args:
+            windows: Token ids per sequence, at most max_length - 2 each
+            batch_size: Windows per session run; None runs them all at once
+        """
+        results = []
+        batch_size = batch_size or max(1, len(windows))
+        for start in range(0, len(windows), batch_size):
+            rows = [self.prefix_ids + list(ids) + self.suffix_ids for ids in windows[start:start + batch_size]]
+            input_ids = np.full((len(rows), max(map(len, rows))), self.pad_id, dtype=np.int64)
+            attention_mask = np.zeros_like(input_ids)
+            for r, row in enumerate(rows):
+                input_ids[r, :len(row)] = row
+                attention_mask[r, :len(row)] = 1
+            feeds = {'input_ids': input_ids, 'attention_mask': attention_mask}
+            results += self._results(self.logits({n: v for n, v in feeds.items() if n in self.input_names}))
+        return results
+
+    def tokenize(self, texts: List[str]) -> Dict[str, np.ndarray]:
+        """Tokenize and pad a batch to its longest member"""
+        encodings = self.tokenizer.encode_batch(list(texts))
+        feeds = {
+            'input_ids': np.array([e.ids for e in encodings], dtype=np.int64),
+            'attention_mask': np.array([e.attention_mask for e in encodings], dtype=np.int64)
+        }
+        return {name: value for name, value in feeds.items() if name in self.input_names}
+
+    def logits(self, feeds: Dict[str, np.ndarray]) -> np.ndarray:
+        """Raw logits for tokenized input"""
+        return self.session.run(None, feeds)[0]
+
+    def __call__(self, texts, batch_size: int = None, truncation: bool = True) -> List[Dict]:
+        if isinstance(texts, str):
+            texts = [texts]
+        if not texts:
+            return []
+
+        # Run the session batch_size texts at a time, like the pipeline
+        batch_size = batch_size or len(texts)
+        results = []
+        for start in range(0, len(texts), batch_size):
+            results += self._results(self.logits(self.tokenize(texts[start:start + batch_size])))
+        return results
+
+    def _results(self, logits: np.ndarray) -> List[Dict]:
+        """Best label and its softmax probability per row of logits"""
+        # Numerically stable softmax
+        exp = np.exp(logits - logits.max(axis=-1, keepdims=True))
+        probs = exp / exp.sum(axis=-1, keepdims=True)
+
+        best = probs.argmax(axis=-1)
+        return [
+            {'label': self.id2label.get(int(i), str(int(i))), 'score': float(p[i])}
+            for i, p in zip(best, probs)
+        ]
@@ -2,7 +2,17 @@
 # SENTIMENT ANALYZER
 # ========================
 
-from typing import List, Dict
+from typing import List, Dict, Tuple
+import os
+import threading
+import time
+
+from services.inference_batcher import MicroBatcher
+from services.sentiment_cache import get_default_cache
+
+SENTIMENT_MODEL_NAME = 'distilbert-base-uncased-finetuned-sst-2-english'
+
+DEFAULT_ONNX_MODEL_DIR = os.path.join(os.path.dirname(__file__), '..', 'models', 'saved', 'sentiment_onnx')
 
 class SentimentAnalyzer:
     """
@@ -14,13 +24,203 @@ class SentimentAnalyzer:
     def __init__(self):
         # Lazy load model on first use to speed up app startup
         self.model = None
+        self._model_lock = threading.Lock()
+        self.model_memory_kb = None
+        self.model_load_ms = None
+        
+        # Inference backend: 'torch' (transformers pipeline) or 'onnx' (onnxruntime)
+        self.backend = os.getenv('SENTIMENT_BACKEND', 'torch').lower()
+        self.model_dir = os.getenv('SENTIMENT_MODEL_DIR', DEFAULT_ONNX_MODEL_DIR)
+        self.quantized = os.getenv('SENTIMENT_ONNX_QUANTIZED', '1') != '0'
+        
+        # Long texts are scored as overlapping token windows instead of
+        # being cut to the first 512 characters
+        self.chunking = os.getenv('SENTIMENT_CHUNKING', '1') != '0'
+        self.window_tokens = int(os.getenv('SENTIMENT_WINDOW_TOKENS', '510'))  # 512 minus [CLS]/[SEP]
+        self.window_overlap = min(int(os.getenv('SENTIMENT_WINDOW_OVERLAP', '64')), self.window_tokens - 1)
+        self.max_windows = max(1, int(os.getenv('SENTIMENT_MAX_WINDOWS', '8')))
+        self.aggregation = os.getenv('SENTIMENT_AGGREGATION', 'mean').lower()  # mean | min | weighted
+        self.model_batch_size = 32
+        
+        # Results are cached per (model version, text); anything that changes
+        # model output must be part of the version string
+        self.cache = get_default_cache()
+        self.model_version = (
+            f"{self.backend}:{SENTIMENT_MODEL_NAME if self.backend != 'onnx' else self.model_dir}"
+            f":{'int8' if self.backend == 'onnx' and self.quantized else 'fp32'}"
+            f":{'chunk' if self.chunking else 'trunc'}"
+            f":{self.window_tokens}/{self.window_overlap}/{self.max_windows}/{self.aggregation}"
+        )
+        
+        # Concurrent analyze() calls are grouped into padded batches
+        self.batcher = None
+        if os.getenv('SENTIMENT_BATCHING', '1') != '0':
+            self.batcher = MicroBatcher(
+                self._run_model,
+                max_batch_size=int(os.getenv('SENTIMENT_MAX_BATCH_SIZE', '16')),
+                max_wait_ms=float(os.getenv('SENTIMENT_MAX_WAIT_MS', '5')),
+                name='sentiment'
+            )
     
     def _ensure_model_loaded(self):
         """Load model if not already loaded"""
         if self.model is None:
-            from transformers import pipeline
-            self.model = pipeline('sentiment-analysis', 
-                                 model='distilbert-base-uncased-finetuned-sst-2-english')
+            with self._model_lock:
+                if self.model is None:
+                    from services.service_registry import rss_kb
+                    began = time.perf_counter()
+                    rss_before = rss_kb()
+                    if self.backend == 'onnx':
+                        # Local int8/fp32 graph exported by models/export_onnx.py
+                        from services.onnx_sentiment import OnnxSentimentModel
+                        self.model = OnnxSentimentModel(self.model_dir, quantized=self.quantized)
+                    else:
+                        from transformers import pipeline
+                        self.model = pipeline('sentiment-analysis', 
+                                             model=SENTIMENT_MODEL_NAME)
+                    self.model_load_ms = (time.perf_counter() - began) * 1000
+                    rss_after = rss_kb()
+                    if rss_before is not None and rss_after is not None:
+                        self.model_memory_kb = max(0.0, rss_after - rss_before)
+    
+    def _run_model(self, texts: List[str]) -> List[Dict]:
+        """
+        Run the model once over a list of texts
+        
+        Args:
+            texts: Input texts
+        
+        Returns:
+            List[dict]: Sentiment result per text
+        """
+        self._ensure_model_loaded()
+        
+        if not self.chunking:
+            # Truncate to model's max length
+            texts = [t[:512] if t else "" for t in texts]
+            results = self.model(texts, batch_size=len(texts))
+            return [self._format_result(r) for r in results]
+        
+        # Each text is tokenized once; every window of every text goes to the
+        # model as token ids
+        token_ids = self._token_ids([t or "" for t in texts])
+        windows = [self._split_windows(ids) for ids in token_ids]
+        flat_results = self._predict_ids([ids for text_windows in windows for ids, _ in text_windows])
+        
+        results = []
+        offset = 0
+        for text_windows in windows:
+            window_results = flat_results[offset:offset + len(text_windows)]
+            offset += len(text_windows)
+            results.append(self._aggregate_windows(window_results, [n for _, n in text_windows]))
+        return results
+    
+    def _format_result(self, result: Dict) -> Dict:
+        """Normalize a raw model output"""
+        return {
+            'label': result['label'],
+            'score': float(result['score']),
+            'sentiment_class': self._map_to_class(result['label'])
+        }
+    
+    def _token_ids(self, texts: List[str]) -> List[List[int]]:
+        """Token ids of each text, without special tokens or truncation"""
+        if hasattr(self.model, 'token_ids'):
+            return self.model.token_ids(texts)
+        return self.model.tokenizer(list(texts), add_special_tokens=False, truncation=False)['input_ids']
+    
+    def _predict_ids(self, windows: List[List[int]]) -> List[Dict]:
+        """
+        Score token id windows without tokenizing them again
+        
+        Args:
+            windows: Token ids per window, without special tokens
+        
+        Returns:
+            List[dict]: Raw {'label', 'score'} per window
+        """
+        if hasattr(self.model, 'predict_ids'):
+            return self.model.predict_ids(windows, batch_size=self.model_batch_size)
+        
+        import torch
+        tokenizer, model = self.model.tokenizer, self.model.model
+        results = []
+        for start in range(0, len(windows), self.model_batch_size):
+            batch = [tokenizer.build_inputs_with_special_tokens(list(ids))
+                     for ids in windows[start:start + self.model_batch_size]]
+            inputs = tokenizer.pad({'input_ids': batch}, return_tensors='pt')
+            with torch.no_grad():
+                logits = model(**{k: v.to(model.device) for k, v in inputs.items()}).logits
+            probs = torch.softmax(logits, dim=-1)
+            scores, labels = probs.max(dim=-1)
+            results += [{'label': model.config.id2label[int(i)], 'score': float(p)}
+                        for i, p in zip(labels, scores)]
+        return results
+    
+    def _split_windows(self, ids: List[int]) -> List[Tuple[List[int], int]]:
+        """
+        Split a tokenized text into overlapping token windows
+        
+        When there are more windows than max_windows, an evenly spaced subset
+        (always including the first and last window) is kept so latency stays
+        bounded.
+        
+        Returns:
+            List[tuple]: (window token ids, token count) pairs
+        """
+        if len(ids) <= self.window_tokens:
+            return [(ids, max(1, len(ids)))]
+        
+        step = max(1, self.window_tokens - self.window_overlap)
+        starts = list(range(0, len(ids) - self.window_overlap, step))
+        if len(starts) > self.max_windows:
+            last = len(starts) - 1
+            picks = sorted({round(i * last / (self.max_windows - 1)) for i in range(self.max_windows)}) \
+                if self.max_windows > 1 else [0]
+            starts = [starts[i] for i in picks]
+        
+        windows = []
+        for start in starts:
+            end = min(start + self.window_tokens, len(ids))
+            windows.append((ids[start:end], end - start))
+        return windows
+    
+    def _aggregate_windows(self, window_results: List[Dict], lengths: List[int]) -> Dict:
+        """
+        Combine window predictions into one result
+        
+        Each window is converted to a positive-class probability, aggregated
+        with the configured rule (mean, min or length-weighted) and mapped back
+        to a POSITIVE/NEGATIVE label.
+        """
+        if len(window_results) == 1:
+            return dict(self._format_result(window_results[0]), windows=1)
+        
+        positive = []
+        for r in window_results:
+            label = r['label'].upper()
+            if label == 'POSITIVE':
+                positive.append(float(r['score']))
+            elif label == 'NEGATIVE':
+                positive.append(1.0 - float(r['score']))
+            else:
+                positive.append(0.5)
+        
+        if self.aggregation == 'min':
+            # Most negative window decides - one scam paragraph is enough
+            p = min(positive)
+        elif self.aggregation == 'weighted':
+            p = sum(pp * n for pp, n in zip(positive, lengths)) / sum(lengths)
+        else:
+            p = sum(positive) / len(positive)
+        
+        label = 'POSITIVE' if p >= 0.5 else 'NEGATIVE'
+        return {
+            'label': label,
+            'score': p if label == 'POSITIVE' else 1.0 - p,
+            'sentiment_class': self._map_to_class(label),
+            'windows': len(window_results)
+        }
     
     def analyze(self, text: str) -> Dict:
         """
@@ -35,18 +235,18 @@ class SentimentAnalyzer:
         if not text or not isinstance(text, str):
             return {'label': 'NEUTRAL', 'score': 0.5}
         
+        key = self.cache.make_key(text, self.model_version)
+        cached = self.cache.get(key)
+        if cached is not None:
+            return cached
+        
         try:
-            self._ensure_model_loaded()
-            # Truncate to model's max length
-            text = text[:512]
-            
-            result = self.model(text)[0]
-            
-            return {
-                'label': result['label'],
-                'score': float(result['score']),
-                'sentiment_class': self._map_to_class(result['label'])
-            }
+            if self.batcher is not None:
+                result = self.batcher.submit(text).result()
+            else:
+                result = self._run_model([text])[0]
+            self.cache.set(key, result, self.model_version)
+            return result
         except Exception as e:
             # If AI model fails, use simple heuristic-based sentiment
             print(f"[WARNING] Sentiment AI model failed: {e}")
@@ -66,23 +266,43 @@ class SentimentAnalyzer:
         if not texts:
             return []
         
+        # Only texts not seen before go to the model, each distinct text once
+        keys = [self.cache.make_key(t or "", self.model_version) for t in texts]
+        results = [self.cache.get(key) for key in keys]
+        missing = {}
+        for i, r in enumerate(results):
+            if r is None:
+                missing.setdefault(keys[i], []).append(i)
+        if not missing:
+            return results
+        
         try:
-            self._ensure_model_loaded()
-            # Truncate all texts
-            texts = [t[:512] if t else "" for t in texts]
-            
-            results = self.model(texts)
-            
-            return [
-                {
-                    'label': r['label'],
-                    'score': float(r['score']),
-                    'sentiment_class': self._map_to_class(r['label'])
-                }
-                for r in results
-            ]
+            fresh = self._run_model([texts[indices[0]] for indices in missing.values()])
+            for (key, indices), result in zip(missing.items(), fresh):
+                self.cache.set(key, result, self.model_version)
+                for i in indices:
+                    results[i] = dict(result)
+            return results
         except Exception as e:
-            return [{'error': str(e)} for _ in texts]
+            # Same fallback as analyze(), so batch and single results agree
+            print(f"[WARNING] Sentiment AI model failed: {e}")
+            print(f"[INFO] Using heuristic-based sentiment analysis instead")
+            return [self._heuristic_sentiment(t or "") for t in texts]
+    
+    def get_stats(self) -> Dict:
+        """Batching scheduler and result cache metrics"""
+        stats = {'batching': False, 'backend': self.backend, 'cache': self.cache.stats()}
+        if self.batcher is not None:
+            stats.update(self.batcher.stats(), batching=True)
+        return stats
+    
+    def memory_stats(self) -> Dict:
+        """Model memory, which is loaded on first inference rather than at construction"""
+        return {
+            'model_loaded': self.model is not None,
+            'model_load_ms': round(self.model_load_ms, 1) if self.model_load_ms is not None else None,
+            'model_memory_kb': round(self.model_memory_kb, 1) if self.model_memory_kb is not None else None
+        }
     
     def _map_to_class(self, label: str) -> int:
         """Map sentiment label to numeric class"""
@@ -0,0 +1,258 @@
+# ========================
+# SENTIMENT RESULT CACHE
+# ========================
+
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Optional
+
+# Rough per-entry bookkeeping cost on top of the serialized value
+_ENTRY_OVERHEAD_BYTES = 200
+
+
+class SentimentCache:
+    """
+    Purpose: Reuse sentiment results for texts that were already scored
+    Allowed: Hashing, byte-bounded LRU, optional SQLite persistence
+    Forbidden: Model inference
+
+    Keys are a SHA-256 of the model version and the exact text sent to the
+    model, so a model or chunking change never serves stale results. The
+    optional SQLite file (WAL mode) is shared by every worker process; rows
+    from other model versions and the oldest rows past db_max_bytes are
+    pruned periodically.
+    """
+
+    # Seconds between sweeps of old-version and over-budget SQLite rows on write
+    purge_interval = 3600.0
+
+    def __init__(self, max_bytes: int = 16 * 1024 * 1024, db_path: Optional[str] = None,
+                 db_max_bytes: int = 256 * 1024 * 1024):
+        """
+        Args:
+            max_bytes: Memory budget for cached results (0 disables the memory tier)
+            db_path: Optional SQLite file shared across processes
+            db_max_bytes: Budget for the SQLite rows, oldest pruned first
+        """
+        self.max_bytes = max_bytes
+        self.db_max_bytes = db_max_bytes
+        self._entries = OrderedDict()  # key -> (value, size)
+        self._bytes = 0
+        self._lock = threading.Lock()
+
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+
+        # The connection has its own lock, so SQLite I/O never blocks the memory tier
+        self._db = None
+        self._db_lock = threading.Lock()
+        self._db_path = db_path
+        self._last_purge = 0.0
+        self._model_versions = set()
+        if db_path:
+            self._open_db(db_path)
+
+    @classmethod
+    def from_env(cls) -> 'SentimentCache':
+        """Build a cache from SENTIMENT_CACHE_* environment variables"""
+        return cls(
+            max_bytes=int(os.getenv('SENTIMENT_CACHE_MAX_BYTES', str(16 * 1024 * 1024))),
+            db_path=os.getenv('SENTIMENT_CACHE_DB') or None,
+            db_max_bytes=int(os.getenv('SENTIMENT_CACHE_DB_MAX_BYTES', str(256 * 1024 * 1024)))
+        )
+
+    @staticmethod
+    def make_key(text: str, model_version: str) -> str:
+        """Content hash of the model version and text"""
+        digest = hashlib.sha256()
+        digest.update(model_version.encode('utf-8'))
+        digest.update(b'\0')
+        digest.update(text.encode('utf-8', 'surrogatepass'))
+        return digest.hexdigest()
+
+    def _open_db(self, db_path: str):
+        """Open (and create or upgrade if needed) the shared SQLite store"""
+        try:
+            directory = os.path.dirname(db_path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            self._db = sqlite3.connect(db_path, timeout=5, check_same_thread=False)
+            self._db.execute('PRAGMA journal_mode=WAL')
+            self._db.execute(
+                'CREATE TABLE IF NOT EXISTS sentiment_cache (key TEXT PRIMARY KEY, value TEXT NOT NULL, '
+                "model_version TEXT NOT NULL DEFAULT '', stored_at REAL NOT NULL DEFAULT 0)"
+            )
+            # Files written before model_version/stored_at existed; their rows are pruned as old
+            columns = {row[1] for row in self._db.execute('PRAGMA table_info(sentiment_cache)')}
+            if 'model_version' not in columns:
+                self._db.execute("ALTER TABLE sentiment_cache ADD COLUMN model_version TEXT NOT NULL DEFAULT ''")
+            if 'stored_at' not in columns:
+                self._db.execute('ALTER TABLE sentiment_cache ADD COLUMN stored_at REAL NOT NULL DEFAULT 0')
+            self._db.commit()
+            self._purge()
+        except Exception as e:
+            print(f"[WARNING] Sentiment cache DB unavailable, using memory only: {e}")
+            self._db = None
+
+    def reopen_after_fork(self):
+        """
+        Give a forked child its own SQLite connection and locks
+
+        The inherited connection is kept referenced but never used or closed,
+        since SQLite connections must not cross fork.
+        """
+        self._lock = threading.Lock()
+        self._db_lock = threading.Lock()
+        if self._db is not None:
+            _inherited_connections.append(self._db)
+            self._db = None
+            self._open_db(self._db_path)
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        """Return a copy of the cached result, or None"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return dict(entry[0])
+
+        value = self._db_get(key) if self._db is not None else None
+
+        with self._lock:
+            if value is not None:
+                self.disk_hits += 1
+                self._store(key, value)
+                return dict(value)
+            self.misses += 1
+            return None
+
+    def set(self, key: str, value: Dict[str, Any], model_version: str = ''):
+        """
+        Cache a result in memory and, if configured, on disk
+
+        Args:
+            key: Key from make_key
+            value: Sentiment result
+            model_version: Version the key was made with; on-disk rows of
+                versions this process never writes are pruned
+        """
+        with self._lock:
+            self._store(key, dict(value))
+        if self._db is not None:
+            self._db_set(key, value, model_version)
+
+    def stats(self) -> Dict[str, Any]:
+        """Hit ratio and memory use"""
+        with self._lock:
+            lookups = self.hits + self.disk_hits + self.misses
+            return {
+                'hits': self.hits,
+                'disk_hits': self.disk_hits,
+                'misses': self.misses,
+                'hit_ratio': round((self.hits + self.disk_hits) / lookups, 4) if lookups else 0.0,
+                'entries': len(self._entries),
+                'bytes': self._bytes,
+                'max_bytes': self.max_bytes,
+                'persistent': self._db is not None
+            }
+
+    def _store(self, key: str, value: Dict[str, Any]):
+        """Insert into the LRU and evict until under the byte budget (lock held)"""
+        size = len(key) + len(json.dumps(value)) + _ENTRY_OVERHEAD_BYTES
+        if size > self.max_bytes:
+            return
+        old = self._entries.pop(key, None)
+        if old is not None:
+            self._bytes -= old[1]
+        self._entries[key] = (value, size)
+        self._bytes += size
+        while self._bytes > self.max_bytes:
+            _, (_, evicted) = self._entries.popitem(last=False)
+            self._bytes -= evicted
+
+    def _db_get(self, key: str) -> Optional[Dict[str, Any]]:
+        """Read one result from SQLite"""
+        try:
+            with self._db_lock:
+                row = self._db.execute('SELECT value FROM sentiment_cache WHERE key = ?', (key,)).fetchone()
+            return json.loads(row[0]) if row else None
+        except Exception as e:
+            print(f"[WARNING] Sentiment cache read failed: {e}")
+            return None
+
+    def _db_set(self, key: str, value: Dict[str, Any], model_version: str):
+        """Write one result to SQLite, sweeping old rows every purge_interval"""
+        now = time.time()
+        with self._db_lock:
+            self._model_versions.add(model_version)
+            try:
+                self._db.execute(
+                    'INSERT OR REPLACE INTO sentiment_cache (key, value, model_version, stored_at) '
+                    'VALUES (?, ?, ?, ?)',
+                    (key, json.dumps(value), model_version, now)
+                )
+                self._db.commit()
+            except Exception as e:
+                print(f"[WARNING] Sentiment cache write failed: {e}")
+            if now - self._last_purge >= self.purge_interval:
+                self._purge()
+
+    def _purge(self):
+        """
+        Delete rows of model versions this process does not write, then the
+        oldest rows past db_max_bytes (db lock held or not yet shared)
+        """
+        self._last_purge = time.time()
+        try:
+            deleted = 0
+            if self._model_versions:
+                versions = sorted(self._model_versions)
+                deleted += self._db.execute(
+                    'DELETE FROM sentiment_cache WHERE model_version NOT IN '
+                    f"({', '.join('?' * len(versions))})", versions
+                ).rowcount
+            cutoff = self._db.execute(
+                'SELECT stored_at FROM (SELECT stored_at, SUM(length(key) + length(value) + ?) '
+                'OVER (ORDER BY stored_at DESC, key) AS running FROM sentiment_cache) '
+                'WHERE running > ? ORDER BY stored_at DESC LIMIT 1',
+                (_ENTRY_OVERHEAD_BYTES, self.db_max_bytes)
+            ).fetchone()
+            if cutoff is not None:
+                deleted += self._db.execute(
+                    'DELETE FROM sentiment_cache WHERE stored_at <= ?', (cutoff[0],)
+                ).rowcount
+            self._db.commit()
+            if deleted:
+                print(f"[INFO] Purged {deleted} old sentiment cache rows")
+        except Exception as e:
+            print(f"[WARNING] Sentiment cache purge failed: {e}")
+
+
+_default_cache = None
+_default_cache_lock = threading.Lock()
+_inherited_connections = []
+
+
+def _after_fork_in_child():
+    if _default_cache is not None:
+        _default_cache.reopen_after_fork()
+
+
+os.register_at_fork(after_in_child=_after_fork_in_child)
+
+
+def get_default_cache() -> SentimentCache:
+    """Process-wide cache shared by every SentimentAnalyzer"""
+    global _default_cache
+    if _default_cache is None:
+        with _default_cache_lock:
+            if _default_cache is None:
+                _default_cache = SentimentCache.from_env()
+    return _default_cache
@@ -0,0 +1,184 @@
+# ========================
+# SERVICE REGISTRY
+# ========================
+
+import os
+import sys
+import threading
+import time
+from typing import Any, Callable, Dict, List, Optional
+
+
+def rss_kb() -> Optional[float]:
+    """Resident set size of this process, or None where it cannot be read"""
+    try:
+        with open('/proc/self/statm') as f:
+            return int(f.read().split()[1]) * os.sysconf('SC_PAGE_SIZE') / 1024
+    except (OSError, ValueError, AttributeError):
+        pass
+    try:
+        import resource
+        # Peak rather than current, but still grows with what a build loads
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return peak / 1024 if sys.platform == 'darwin' else float(peak)
+    except (ImportError, OSError):
+        return None
+
+
+class ServiceRegistry:
+    """
+    Purpose: Build each heavy service once per process and share it
+    Allowed: Construction, locking, build accounting
+    Forbidden: Request handling, service logic
+
+    Services are registered as factories and built on first get(). Each
+    service has its own lock, so concurrent first requests wait for one
+    build instead of racing to make duplicates, while a slow model load does
+    not hold up unrelated services. Memory is the growth in resident set
+    size while the service was built, minus services it built in turn; it
+    is approximate when other threads allocate at the same time. Services
+    that load models lazily add their own figures through memory_stats().
+    """
+
+    def __init__(self):
+        self._factories: Dict[str, Callable[[], Any]] = {}
+        self._services: Dict[str, Any] = {}
+        self._locks: Dict[str, threading.Lock] = {}
+        self._stats: Dict[str, Dict[str, Any]] = {}
+        self._lock = threading.Lock()
+        # Services being built on this thread, innermost last
+        self._building = threading.local()
+
+    def register(self, name: str, factory: Callable[[], Any]):
+        """
+        Args:
+            name: Service name passed to get()
+            factory: Builds the service; may get() other services
+        """
+        with self._lock:
+            self._factories[name] = factory
+            self._locks.setdefault(name, threading.Lock())
+
+    def get(self, name: str) -> Any:
+        """Shared instance of a service, built on first use"""
+        service = self._services.get(name)
+        if service is not None:
+            return service
+
+        if name not in self._factories:
+            raise KeyError(f"Unknown service: {name}")
+        with self._locks[name]:
+            service = self._services.get(name)
+            if service is None:
+                service = self._build(name)
+        return service
+
+    def _build(self, name: str) -> Any:
+        stack: List[dict] = getattr(self._building, 'stack', None)
+        if stack is None:
+            stack = self._building.stack = []
+        frame = {'nested_kb': 0.0}
+        stack.append(frame)
+
+        began = time.perf_counter()
+        rss_before = rss_kb()
+        try:
+            service = self._factories[name]()
+        finally:
+            stack.pop()
+        rss_after = rss_kb()
+        build_ms = (time.perf_counter() - began) * 1000
+
+        memory_kb = None
+        if rss_before is not None and rss_after is not None:
+            total_kb = max(0.0, rss_after - rss_before)
+            memory_kb = max(0.0, total_kb - frame['nested_kb'])
+            if stack:
+                stack[-1]['nested_kb'] += total_kb
+
+        self._stats[name] = {
+            'type': type(service).__name__,
+            'build_ms': round(build_ms, 1),
+            'memory_kb': round(memory_kb, 1) if memory_kb is not None else None,
+            'built_at': time.time()
+        }
+        self._services[name] = service
+        print(f"[INFO] Built {name} in {build_ms:.0f} ms")
+        return service
+
+    def report(self) -> Dict[str, Dict[str, Any]]:
+        """Build time and memory of every built service, plus the names not built yet"""
+        with self._lock:
+            names = list(self._factories)
+        report = {}
+        for name in names:
+            if name not in self._stats:
+                report[name] = {'built': False}
+                continue
+            report[name] = dict(self._stats[name], built=True)
+            memory_stats = getattr(self._services[name], 'memory_stats', None)
+            if callable(memory_stats):
+                report[name].update(memory_stats())
+        return report
+
+
+def _build_engine():
+    from services.credibility_engine import CredibilityEngine
+    return CredibilityEngine()
+
+
+def _build_url_extractor():
+    from services.url_feature_extractor import URLFeatureExtractor
+    return URLFeatureExtractor()
+
+
+def _build_sentiment_analyzer():
+    from services.sentiment_analyzer import SentimentAnalyzer
+    return SentimentAnalyzer()
+
+
+def _build_company_verifier():
+    from services.company_verifier import CompanyVerifier
+    return CompanyVerifier()
+
+
+def _build_company_searcher():
+    from services.company_search import CompanySearcher
+    return CompanySearcher()
+
+
+def _build_info_parser():
+    from services.info_parser import InternshipInfoParser
+    return InternshipInfoParser()
+
+
+def _build_dataset_validator():
+    from services.dataset_validator import get_dataset_validator
+    return get_dataset_validator()
+
+
+def _build_rf_predictor():
+    from models.random_forest_inference import RandomForestPredictor
+    return RandomForestPredictor()
+
+
+def _build_text_cleaner():
+    from preprocessing.text_cleaner import TextCleaner
+    return TextCleaner()
+
+
+registry = ServiceRegistry()
+registry.register('credibility_engine', _build_engine)
+registry.register('url_extractor', _build_url_extractor)
+registry.register('sentiment_analyzer', _build_sentiment_analyzer)
+registry.register('company_verifier', _build_company_verifier)
+registry.register('company_searcher', _build_company_searcher)
+registry.register('info_parser', _build_info_parser)
+registry.register('dataset_validator', _build_dataset_validator)
+registry.register('rf_predictor', _build_rf_predictor)
+registry.register('text_cleaner', _build_text_cleaner)
+
+
+def get_service(name: str) -> Any:
+    """Shared instance of a registered service (see ServiceRegistry)"""
+    return registry.get(name)
@@ -0,0 +1,357 @@
+# ========================
+# OFFLINE PUBLIC SUFFIX LIST
+# ========================
+
+import hashlib
+import os
+import re
+import threading
+from functools import lru_cache
+from typing import TYPE_CHECKING, Dict, List, NamedTuple, Tuple
+
+if TYPE_CHECKING:
+    import numpy as np
+
+DEFAULT_SUFFIX_LIST_PATH = os.path.join(os.path.dirname(__file__), '..', 'data', 'public_suffix_list.dat')
+
+# Host parses kept per process; a verification touches only a few hosts
+HOST_CACHE_SIZE = int(os.getenv('SUFFIX_HOST_CACHE_SIZE', '4096'))
+
+_SCHEME = re.compile(r'(?:[A-Za-z0-9+.\-]+:)?//')
+_IPV4 = re.compile(r'^(?:(?:25[0-5]|2[0-4]\d|1\d\d|[1-9]?\d)\.){3}(?:25[0-5]|2[0-4]\d|1\d\d|[1-9]?\d)$')
+_IDEOGRAPHIC_DOTS = str.maketrans({'。': '.', '．': '.', '｡': '.'})
+
+# Trie key marking that the labels on the path so far form a suffix; not a
+# string, so no label (even an empty one) can collide with it
+_END = None
+
+# Polynomial hash of byte strings mod 2**64, which lets locate_domains look
+# up the candidate suffixes of many hosts at once
+_HASH_BASE = 0x100000001B3
+_MASK64 = (1 << 64) - 1
+
+
+def _hash_bytes(data: bytes) -> int:
+    value, power = 0, 1
+    for byte in data:
+        value = (value + (byte + 1) * power) & _MASK64
+        power = (power * _HASH_BASE) & _MASK64
+    return value
+
+
+# Flags of a path in _RuleTables
+_NODE = 1       # label path present in the trie ('co.uk', 'uk')
+_RULE = 2       # path is a rule
+_WILDCARD = 4   # path has a '*' child ('ck' for *.ck)
+_EXCEPTION = 8  # exception rule without the '!' ('www.ck')
+
+# Fibonacci hashing spreads the polynomial hashes of short strings, whose
+# high bits are mostly zero, over the slots
+_SLOT_MULTIPLIER = 0x9E3779B97F4A7C15
+
+
+class _RuleTables(NamedTuple):
+    """The trie's paths as an open-addressing hash table (linear probing, 0 = empty slot)"""
+    keys: 'np.ndarray'   # path hashes
+    flags: 'np.ndarray'  # _NODE | _RULE | _WILDCARD | _EXCEPTION per slot
+    depth: int           # most labels in any rule
+
+    def lookup(self, values: 'np.ndarray') -> 'np.ndarray':
+        """Flags of each path hash, 0 for paths not in the trie"""
+        import numpy as np
+
+        bits = len(self.keys).bit_length() - 1
+        mask = len(self.keys) - 1
+        found = np.zeros(len(values), dtype=np.uint8)
+        index = np.arange(len(values))
+        slot = ((values * np.uint64(_SLOT_MULTIPLIER)) >> np.uint64(64 - bits)).astype(np.int64)
+        while len(index):
+            key = self.keys[slot]
+            hit = key == values[index]
+            found[index[hit]] = self.flags[slot[hit]]
+            probing = ~hit & (key != 0)
+            index, slot = index[probing], (slot[probing] + 1) & mask
+        return found
+
+
+class ExtractResult(NamedTuple):
+    subdomain: str
+    domain: str
+    suffix: str
+
+    @property
+    def registered_domain(self) -> str:
+        return f"{self.domain}.{self.suffix}" if self.domain and self.suffix else ''
+
+
+def _netloc(url: str) -> str:
+    """Hostname of a URL with or without scheme, without userinfo, port or root dot"""
+    scheme = _SCHEME.match(url)
+    if scheme:
+        url = url[scheme.end():]
+    host = url.partition('/')[0].partition('?')[0].partition('#')[0].rpartition('@')[-1]
+    if host.startswith('['):
+        bracketed = host.partition(']')
+        if bracketed[1]:
+            return bracketed[0] + ']'
+    return host.partition(':')[0].strip().rstrip('.。．｡')
+
+
+def _decode_label(label: str) -> str:
+    """Punycode label decoded so it matches the list's Unicode rules"""
+    try:
+        return label.encode('ascii').decode('idna')
+    except UnicodeError:
+        return label
+
+
+class SuffixList:
+    """
+    Purpose: Split hostnames into subdomain, registrable domain and public suffix
+    Allowed: Parsing the bundled list, trie lookup, memoization
+    Forbidden: Network access, URL scoring
+
+    Rules come from the ICANN section of the bundled Public Suffix List
+    (data/public_suffix_list.dat) and are compiled into a trie of labels,
+    last label first. Wildcard (*.ck) and exception (!www.ck) rules follow
+    the list's algorithm. Results agree with tldextract's defaults, which
+    leave the private section out. Parses are memoized per hostname.
+    """
+
+    def __init__(self, path: str = DEFAULT_SUFFIX_LIST_PATH, cache_size: int = HOST_CACHE_SIZE):
+        with open(path, 'rb') as f:
+            raw = f.read()
+        self.path = path
+        self.version = hashlib.sha256(raw).hexdigest()[:12]
+        self.rules = 0
+        self._trie: Dict[str, dict] = {}
+        self._tables = None
+        self._tables_lock = threading.Lock()
+
+        for line in raw.decode('utf-8').splitlines():
+            line = line.strip()
+            if line.startswith('// ===END ICANN DOMAINS==='):
+                break
+            if not line or line.startswith('//'):
+                continue
+            self._add(line.split()[0])
+
+        self.extract_host = lru_cache(maxsize=cache_size)(self._extract_host)
+
+    def _add(self, rule: str):
+        node = self._trie
+        for label in reversed(rule.lower().split('.')):
+            node = node.setdefault(label, {})
+        node[_END] = True
+        self.rules += 1
+
+    def suffix_index(self, labels: List[str]) -> int:
+        """Index of the first label of the public suffix (len(labels) if there is none)
+
+        Labels must already be lowercase.
+        """
+        node = self._trie
+        end = len(labels)
+        i = end
+        for label in reversed(labels):
+            if label.startswith('xn--'):
+                label = _decode_label(label)
+            child = node.get(label)
+            if child is not None:
+                i -= 1
+                node = child
+                if _END in node:
+                    end = i
+                continue
+            if '*' in node:
+                # The wildcard covers this label unless an exception names it
+                return i if '!' + label in node else i - 1
+            break
+        return end
+
+    def _extract_host(self, host: str) -> ExtractResult:
+        if not host.isascii():
+            host = host.translate(_IDEOGRAPHIC_DOTS)
+        if len(host) >= 4 and host[0] == '[' and host[-1] == ']':
+            return ExtractResult('', host, '')
+        labels = host.split('.')
+        index = self.suffix_index(host.lower().split('.'))
+        if index == len(labels) == 4 and _IPV4.match(host):
+            return ExtractResult('', host, '')
+        return ExtractResult(
+            '.'.join(labels[:index - 1]) if index >= 2 else '',
+            labels[index - 1] if index else '',
+            '.'.join(labels[index:])
+        )
+
+    def extract(self, url: str) -> ExtractResult:
+        """
+        Split a URL's hostname
+
+        Args:
+            url: URL, with or without scheme
+
+        Returns:
+            ExtractResult: subdomain, domain and suffix; each '' when absent
+        """
+        return self.extract_host(_netloc(url))
+
+    def _rule_tables(self) -> _RuleTables:
+        """Hash tables of the trie for locate_domains, built on first use"""
+        if self._tables is None:
+            with self._tables_lock:
+                if self._tables is None:
+                    import numpy as np
+
+                    paths: Dict[int, int] = {}
+                    depth = 0
+                    stack = [(self._trie, '', 0)]
+                    while stack:
+                        node, path, labels = stack.pop()
+                        for label, child in node.items():
+                            if label is _END:
+                                continue
+                            depth = max(depth, labels + 1)
+                            if label == '*':
+                                key, flag = _hash_bytes(path.encode('utf-8')), _WILDCARD
+                            elif label.startswith('!'):
+                                key, flag = _hash_bytes(f"{label[1:]}.{path}".encode('utf-8')), _EXCEPTION
+                            else:
+                                child_path = f"{label}.{path}" if path else label
+                                key = _hash_bytes(child_path.encode('utf-8'))
+                                flag = _NODE | (_RULE if _END in child else 0)
+                                stack.append((child, child_path, labels + 1))
+                            paths[key] = paths.get(key, 0) | flag
+
+                    # At most an eighth full, so most lookups end at the first probe
+                    bits = max(4, (len(paths) * 8).bit_length())
+                    keys = np.zeros(1 << bits, dtype=np.uint64)
+                    flags = np.zeros(1 << bits, dtype=np.uint8)
+                    for key, flag in paths.items():
+                        slot = ((key * _SLOT_MULTIPLIER) & _MASK64) >> (64 - bits)
+                        while keys[slot]:
+                            slot = (slot + 1) & ((1 << bits) - 1)
+                        keys[slot], flags[slot] = key, flag
+                    self._tables = _RuleTables(keys, flags, depth)
+        return self._tables
+
+    def locate_domains(self, lower: 'np.ndarray', starts: 'np.ndarray',
+                       ends: 'np.ndarray') -> Tuple['np.ndarray', 'np.ndarray']:
+        """
+        Split many hosts at once, as extract_host would
+
+        Every host's candidate suffixes (its last 1, 2, ... labels) are
+        hashed with NumPy and looked up in hashed copies of the trie, then
+        the trie walk is replayed on the results. Hosts must be ASCII,
+        without punycode labels, brackets or trailing dots; callers send
+        those through extract().
+
+        Args:
+            lower: Lowercased bytes (uint8) holding the hosts
+            starts: Start of each host in lower
+            ends: End of each host in lower
+
+        Returns:
+            tuple: (domain start, domain end) per host; the subdomain is
+            whatever precedes the domain, and an IPv4 host is all domain
+        """
+        import numpy as np
+
+        tables = self._rule_tables()
+        n = len(starts)
+        if not n:
+            return np.zeros(0, dtype=np.int64), np.zeros(0, dtype=np.int64)
+
+        # Hosts copied end to end, so hashing touches only host bytes and
+        # powers of the base are needed only up to the longest host
+        lengths = ends - starts
+        total = int(lengths.sum())
+        offsets = np.cumsum(lengths) - lengths
+        within = np.arange(total) - np.repeat(offsets, lengths)
+        hosts = lower[within + np.repeat(starts, lengths)]
+        shift = starts - offsets
+        starts, ends = offsets, offsets + lengths
+
+        longest = int(lengths.max())
+        base = np.uint64(_HASH_BASE)
+        powers = np.ones(longest + 1, dtype=np.uint64)
+        inverse_powers = np.ones(longest + 1, dtype=np.uint64)
+        if longest:
+            powers[1:] = np.cumprod(np.full(longest, base, dtype=np.uint64))
+            inverse = np.uint64(pow(_HASH_BASE, -1, 1 << 64))
+            inverse_powers[1:] = np.cumprod(np.full(longest, inverse, dtype=np.uint64))
+        prefix = np.zeros(total + 1, dtype=np.uint64)
+        prefix[1:] = np.cumsum((hosts.astype(np.uint64) + np.uint64(1)) * powers[within])
+
+        dots = np.flatnonzero(hosts == ord('.'))
+        padded_dots = np.append(dots, 0)
+        first_dot = np.searchsorted(dots, starts)
+        after_last_dot = np.searchsorted(dots, ends)
+        labels = after_last_dot - first_dot + 1
+
+        # label_start[d]: where the d-th label from the right begins; row 0
+        # sits one past the host so the domain end is label_start[d] - 1
+        rows = tables.depth + 2
+        label_start = np.empty((rows, n), dtype=np.int64)
+        label_start[0] = ends + 1
+        hashes = np.zeros((rows, n), dtype=np.uint64)
+        for d in range(1, rows):
+            dot = padded_dots[np.clip(after_last_dot - d, 0, len(dots))]
+            label_start[d] = np.where(d < labels, dot + 1, starts)
+            hashes[d] = (prefix[ends] - prefix[label_start[d]]) * inverse_powers[label_start[d] - starts]
+
+        # Trie walk: depth matched, deepest rule on the way, then wildcards.
+        # Suffixes longer than the host repeat the whole host; skip them.
+        flags = np.zeros((rows, n), dtype=np.uint8)
+        in_host = np.arange(rows)[:, None] <= labels
+        in_host[0] = False
+        flags[in_host] = tables.lookup(hashes[in_host])
+        matched = np.zeros(n, dtype=np.int64)
+        deepest_end = np.zeros(n, dtype=np.int64)
+        alive = np.ones(n, dtype=bool)
+        for d in range(1, rows - 1):
+            alive &= (d <= labels) & (flags[d] & _NODE > 0)
+            matched += alive
+            deepest_end = np.where(alive & (flags[d] & _RULE > 0), d, deepest_end)
+
+        columns = np.arange(n)
+        broke = matched < labels
+        wildcard = broke & (matched > 0) & (flags[matched, columns] & _WILDCARD > 0)
+        excepted = flags[np.minimum(matched + 1, rows - 1), columns] & _EXCEPTION > 0
+        suffix_labels = np.where(wildcard, np.where(excepted, matched, matched + 1), deepest_end)
+
+        has_domain = suffix_labels < labels
+        domain_start = np.where(has_domain, label_start[np.minimum(suffix_labels + 1, rows - 1), columns], starts)
+        domain_end = np.where(has_domain, label_start[suffix_labels, columns] - 1, starts)
+
+        # A dotted quad with no suffix is kept whole, as extract_host does
+        quads = np.flatnonzero((suffix_labels == 0) & (labels == 4))
+        for i in quads:
+            if _IPV4.match(hosts[starts[i]:ends[i]].tobytes().decode('ascii')):
+                domain_start[i], domain_end[i] = starts[i], ends[i]
+        return domain_start + shift, domain_end + shift
+
+    def stats(self) -> Dict[str, object]:
+        """List version and size, and host cache hit counts"""
+        info = self.extract_host.cache_info()
+        return {
+            'version': self.version,
+            'rules': self.rules,
+            'cache_hits': info.hits,
+            'cache_misses': info.misses,
+            'cache_size': info.currsize
+        }
+
+
+_default_suffix_list = None
+_default_suffix_list_lock = threading.Lock()
+
+
+def get_suffix_list() -> SuffixList:
+    """Shared suffix list, compiled on first use (SUFFIX_LIST_PATH overrides the bundled file)"""
+    global _default_suffix_list
+    if _default_suffix_list is None:
+        with _default_suffix_list_lock:
+            if _default_suffix_list is None:
+                _default_suffix_list = SuffixList(os.getenv('SUFFIX_LIST_PATH', DEFAULT_SUFFIX_LIST_PATH))
+    return _default_suffix_list
@@ -4,8 +4,25 @@
 
 import re
 from urllib.parse import urlparse
-import tldextract
 from datetime import datetime
+from typing import TYPE_CHECKING, List, Sequence
+
+from services.suffix_list import get_suffix_list
+
+if TYPE_CHECKING:
+    import numpy as np
+
+# Numeric features in model input order (see feature_matrix)
+FEATURE_NAMES = (
+    'url_length', 'domain_length', 'has_https', 'has_www', 'has_ip_address', 'has_at_symbol',
+    'has_double_slash', 'num_dots', 'num_hyphens', 'num_underscores', 'num_digits',
+    'domain_entropy', 'path_length', 'num_path_segments'
+)
+
+# URLs containing any of these bytes, whitespace or control characters take
+# the per-URL path in extract_batch: urlparse strips or treats them
+# specially, or they are trie syntax
+_IRREGULAR_BYTES = b';[]\\*!'
 
 class URLFeatureExtractor:
     """
@@ -14,6 +31,8 @@ class URLFeatureExtractor:
     Forbidden: API routing, model logic
     """
     
+    IP_PATTERN = re.compile(r'\d{1,3}\.\d{1,3}\.\d{1,3}\.\d{1,3}')
+    
     def __init__(self):
         pass
     
@@ -31,7 +50,8 @@ class URLFeatureExtractor:
         
         try:
             parsed = urlparse(url)
-            extracted = tldextract.extract(url)
+            # Bundled suffix list, memoized per hostname; never fetched
+            extracted = get_suffix_list().extract(url)
             
             # Basic features
             features['url_length'] = len(url)
@@ -67,8 +87,224 @@ class URLFeatureExtractor:
     
     def _has_ip_address(self, url: str) -> int:
         """Check if URL contains IP address"""
-        ip_pattern = r'\d{1,3}\.\d{1,3}\.\d{1,3}\.\d{1,3}'
-        return 1 if re.search(ip_pattern, url) else 0
+        return 1 if self.IP_PATTERN.search(url) else 0
+    
+    def extract_batch(self, urls: Sequence[str], chunk_size: int = 4096) -> 'np.ndarray':
+        """
+        Extract the numeric features of many URLs at once
+        
+        Each chunk of URLs is packed into one byte array; lengths, counts,
+        scheme and path bounds and domain entropy are computed with NumPy,
+        and hosts are split by SuffixList.locate_domains. URLs outside the
+        common ASCII shape (whitespace, brackets, ';', punycode hosts,
+        non-ASCII, ...) go through extract() one at a time. This measures
+        7-8x faster per URL than extract(), short of a 10x target
+        (python tests/run_benchmarks.py url_batch): no per-URL Python is
+        left on the common path, and locate_domains, the largest share,
+        replaces an uncached extract_host that alone costs more than the
+        whole batch row.
+        
+        Args:
+            urls: URLs to extract
+            chunk_size: URLs per NumPy pass; the default keeps each pass's
+                arrays in CPU cache
+        
+        Returns:
+            np.ndarray: Structured array with one row per URL and the fields
+            of FEATURE_NAMES, matching extract(); rows for URLs that
+            extract() rejects are zero
+        """
+        import numpy as np
+        
+        dtype = [(name, np.float64 if name == 'domain_entropy' else np.int32) for name in FEATURE_NAMES]
+        out = np.zeros(len(urls), dtype=dtype)
+        for begin in range(0, len(urls), chunk_size):
+            chunk = list(urls[begin:begin + chunk_size])
+            rows = np.arange(begin, begin + len(chunk))
+            fast = np.ones(len(chunk), dtype=bool)
+            if not ''.join(chunk).isascii():
+                fast = np.fromiter(map(str.isascii, chunk), dtype=bool, count=len(chunk))
+                chunk = [url for url, ok in zip(chunk, fast) if ok]
+            fallback = self._extract_packed(chunk, out, rows[fast])
+            for row in np.concatenate([rows[~fast], fallback]):
+                self._fill_row(out, row, urls[row])
+        return out
+    
+    @staticmethod
+    def feature_matrix(batch: 'np.ndarray') -> 'np.ndarray':
+        """float64 matrix of an extract_batch result, for RandomForestPredictor.batch_predict"""
+        from numpy.lib.recfunctions import structured_to_unstructured
+        return structured_to_unstructured(batch[list(FEATURE_NAMES)], dtype='float64')
+    
+    def _fill_row(self, out: 'np.ndarray', row: int, url: str):
+        features = self.extract(str(url))
+        if 'error' not in features:
+            out[row] = tuple(features[name] for name in FEATURE_NAMES)
+    
+    def _extract_packed(self, urls: List[str], out: 'np.ndarray', rows: 'np.ndarray') -> 'np.ndarray':
+        """
+        Vectorized features of ASCII URLs, written to out[rows]
+        
+        Byte classes are found with whole-buffer comparisons. First
+        occurrences come from binary searches of each class's sorted
+        positions, counts from binning those positions by URL, and domain
+        bytes are gathered end to end for entropy and character counts.
+        
+        Returns:
+            np.ndarray: Rows the packed path could not handle
+        """
+        import numpy as np
+        
+        n = len(urls)
+        if not n:
+            return rows[:0]
+        text = ''.join(urls).encode('ascii')
+        lowered = text.lower()
+        size = len(text)
+        # One zero byte past the last URL keeps every range bound a valid index
+        raw = np.frombuffer(text + b'\0', dtype=np.uint8)
+        lower = np.frombuffer(lowered + b'\0', dtype=np.uint8)
+        lengths = np.fromiter(map(len, urls), dtype=np.int64, count=n)
+        ends = np.cumsum(lengths)
+        starts = ends - lengths
+        
+        is_digit = (raw - np.uint8(ord('0'))) < 10
+        is_dot = raw == ord('.')
+        is_scheme_byte = ((lower - np.uint8(ord('a'))) < 26) | is_digit | is_dot | (raw == ord('+')) | (raw == ord('-'))
+        # Every delimiter is a non-scheme byte, and those are sparse, so one
+        # scan finds them all and byte values split them into classes
+        found = np.flatnonzero(~is_scheme_byte[:size])
+        kinds = raw[found]
+        
+        def positions(mask):
+            # Sorted positions of a class plus a sentinel past every URL
+            return np.append(found[mask], size + 1)
+        
+        def first(found, lo, hi):
+            # First position in [lo, hi) from positions(), else hi
+            return np.minimum(found[found.searchsorted(lo)], hi)
+        
+        def tally(found, lo=None, hi=None):
+            # Positions per URL, or per [lo, hi) range inside each URL
+            owner = ends.searchsorted(found, side='right')
+            if lo is not None:
+                owner = owner[(found >= lo[owner]) & (found < hi[owner])]
+            return np.bincount(owner, minlength=n)
+        
+        def byte_at(index, bound):
+            # Byte at index, or 0 where index is at or past bound
+            return np.where(index < bound, raw[np.minimum(index, size)], 0)
+        
+        is_slash = kinds == ord('/')
+        is_colon = kinds == ord(':')
+        is_query_or_fragment = (kinds == ord('?')) | (kinds == ord('#'))
+        colons = positions(is_colon)
+        netloc_delimiters = positions(is_slash | is_query_or_fragment)
+        
+        # Scheme as urlparse reads it: a letter, then scheme characters up
+        # to the first ':'
+        colon = first(colons, starts, ends)
+        other = positions(~(is_colon | is_slash | is_query_or_fragment))
+        scheme_like = (
+            (colon > starts) & (colon < ends)
+            & (first(netloc_delimiters, starts, ends) > colon) & (first(other, starts, ends) > colon)
+        )
+        has_scheme = scheme_like & ((byte_at(starts, ends) | 0x20) - ord('a') < 26)
+        https = has_scheme & (colon - starts == 5)
+        for i, byte in enumerate(b'https'):
+            https &= lower[np.minimum(starts + i, size)] == byte
+        
+        # Host as SuffixList.extract reads it: after 'scheme://' or '//',
+        # before '/?#', after the last '@', before the first ':'
+        host_start = np.where(
+            scheme_like & (byte_at(colon + 1, ends) == ord('/')) & (byte_at(colon + 2, ends) == ord('/')),
+            colon + 3,
+            np.where((byte_at(starts, ends) == ord('/')) & (byte_at(starts + 1, ends) == ord('/')), starts + 2, starts)
+        )
+        host_end = first(netloc_delimiters, host_start, ends)
+        
+        # Path: after '//netloc' if present, up to '?' or '#'. Where there
+        # is a netloc it starts where the host does, so it ends at host_end.
+        rest = np.where(has_scheme, colon + 1, starts)
+        has_netloc = (byte_at(rest, ends) == ord('/')) & (byte_at(rest + 1, ends) == ord('/'))
+        path_start = np.where(has_netloc, host_end, rest)
+        path_end = first(positions(is_query_or_fragment), path_start, ends)
+        path_first = byte_at(path_start, path_end)
+        # Bytes right after a '/': doubled slashes, and the starts of segments
+        slashes = found[is_slash]
+        double_slashes = slashes[1:][np.diff(slashes) == 1]
+        segment_starts = slashes[raw[slashes + 1] != ord('/')] + 1
+        segment_starts = segment_starts[segment_starts < size]
+        
+        ats = positions(kinds == ord('@'))
+        last_at = ats[np.maximum(ats.searchsorted(host_end) - 1, 0)]
+        host_start = np.where((last_at >= host_start) & (last_at < host_end), last_at + 1, host_start)
+        host_end = first(colons, host_start, host_end)
+        
+        irregular = (kinds <= ord(' ')) | (kinds == 0x7f)
+        for byte in _IRREGULAR_BYTES:
+            irregular |= kinds == byte
+        skip = (tally(found[irregular]) > 0) | ((host_end > host_start) & (byte_at(host_end - 1, ends) == ord('.')))
+        if b'xn--' in lowered:
+            # Punycode labels need IDNA decoding, which only extract() does
+            punycode = (lower[:-4] == ord('x')) & (lower[1:-3] == ord('n')) & (lower[2:-2] == ord('-')) & (lower[3:-1] == ord('-'))
+            skip |= tally(np.flatnonzero(punycode), host_start, host_end - 3) > 0
+        
+        domain_start, domain_end = get_suffix_list().locate_domains(lower, host_start, host_end)
+        domain_length = domain_end - domain_start
+        www = domain_start - host_start == 4
+        for i, byte in enumerate(b'www.'):
+            www &= raw[np.minimum(host_start + i, size)] == byte
+        
+        # Domain bytes end to end, tagged with their URL
+        owner = np.repeat(np.arange(n, dtype=np.int32), domain_length)
+        within = np.arange(len(owner)) - np.repeat(np.cumsum(domain_length) - domain_length, domain_length)
+        domains = raw[np.repeat(domain_start, domain_length) + within]
+        
+        def in_domain(mask):
+            return np.bincount(owner[mask], minlength=n)
+        
+        # Shannon entropy of each domain: sort (URL, byte) keys, then count runs
+        keys = np.sort(owner * 128 + domains)
+        # keys[:1] >= 0 opens the first run, and is empty when no URL has a domain
+        run_starts = np.flatnonzero(np.concatenate((keys[:1] >= 0, keys[1:] != keys[:-1])))
+        runs = np.diff(np.append(run_starts, len(keys)))
+        run_owner = keys[run_starts] // 128
+        share = runs / domain_length[run_owner]
+        entropy = np.bincount(run_owner, weights=-share * np.log2(share), minlength=n)
+        
+        # Dotted quads can only be where three digit-dot-digit runs are
+        digit_dot_digit = np.flatnonzero(is_digit[:-2] & is_dot[1:-1] & is_digit[2:]) + 1
+        has_ip = np.zeros(n, dtype=np.int32)
+        for i in np.flatnonzero(tally(digit_dot_digit) >= 3):
+            has_ip[i] = self._has_ip_address(urls[i])
+        
+        features = {
+            'url_length': lengths,
+            'domain_length': domain_length,
+            'has_https': https,
+            'has_www': www,
+            'has_ip_address': has_ip,
+            'has_at_symbol': tally(ats[:-1]) > 0,
+            'has_double_slash': tally(double_slashes, path_start + 1, path_end) > 0,
+            # Dots are too common for positions(); sum them per URL instead
+            'num_dots': np.where(lengths > 0, np.add.reduceat(is_dot.view(np.uint8), starts, dtype=np.int32), 0),
+            'num_hyphens': in_domain(domains == ord('-')),
+            'num_underscores': in_domain(domains == ord('_')),
+            'num_digits': in_domain((domains - np.uint8(ord('0'))) < 10),
+            'domain_entropy': entropy,
+            'path_length': path_end - path_start,
+            # Segments start at a non-'/' byte after a '/', or at the path's first byte
+            'num_path_segments': tally(segment_starts, path_start + 1, path_end)
+                                 + ((path_first != 0) & (path_first != ord('/'))),
+        }
+        skipped = rows[skip]
+        if len(skipped):
+            keep = ~skip
+            rows, features = rows[keep], {name: values[keep] for name, values in features.items()}
+        for name, values in features.items():
+            out[name][rows] = values
+        return skipped
     
     def _calculate_entropy(self, text: str) -> float:
         """Calculate Shannon entropy of text"""
@@ -0,0 +1,275 @@
+# ========================
+# VERIFICATION RESULT CACHE
+# ========================
+
+import json
+import os
+import re
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, Optional, Tuple
+
+
+class VerificationCache:
+    """
+    Purpose: Reuse company verification results across requests
+    Allowed: LRU/TTL bookkeeping, optional SQLite persistence
+    Forbidden: Verification logic, network calls
+    """
+
+    # Seconds between sweeps of expired SQLite rows on write
+    purge_interval = 3600.0
+
+    def __init__(self, max_entries: int = 2048, positive_ttl: float = 86400,
+                 negative_ttl: float = 3600, stale_ttl: float = 3600,
+                 db_path: Optional[str] = None):
+        """
+        Args:
+            max_entries: In-memory LRU capacity
+            positive_ttl: Seconds a SAFE/LIKELY_SAFE result stays fresh
+            negative_ttl: Seconds any other result stays fresh
+            stale_ttl: Extra seconds an expired result may be served while it is refreshed
+            db_path: Optional SQLite file so results survive restarts
+        """
+        self.max_entries = max_entries
+        self.positive_ttl = positive_ttl
+        self.negative_ttl = negative_ttl
+        self.stale_ttl = stale_ttl
+
+        # key -> (value, stored_at, ttl)
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self._refreshing = set()
+        self._refresh_pool = ThreadPoolExecutor(max_workers=2, thread_name_prefix='verification-refresh')
+
+        self.hits = 0
+        self.stale_hits = 0
+        self.misses = 0
+
+        # The connection has its own lock, so SQLite I/O never blocks the memory tier
+        self._db = None
+        self._db_lock = threading.Lock()
+        self._db_path = db_path
+        self._last_purge = 0.0
+        if db_path:
+            self._open_db(db_path)
+
+    @classmethod
+    def from_env(cls) -> 'VerificationCache':
+        """Build a cache from VERIFICATION_CACHE_* environment variables"""
+        return cls(
+            max_entries=int(os.getenv('VERIFICATION_CACHE_MAX_ENTRIES', '2048')),
+            positive_ttl=float(os.getenv('VERIFICATION_CACHE_TTL_POSITIVE', '86400')),
+            negative_ttl=float(os.getenv('VERIFICATION_CACHE_TTL_NEGATIVE', '3600')),
+            stale_ttl=float(os.getenv('VERIFICATION_CACHE_STALE', '3600')),
+            db_path=os.getenv('VERIFICATION_CACHE_DB') or None
+        )
+
+    @staticmethod
+    def make_key(company_name: str, website: Optional[str] = None) -> str:
+        """Normalize company name and website into a cache key"""
+        name = ' '.join(str(company_name or '').lower().split())
+        site = str(website or '').strip().lower()
+        site = re.sub(r'^https?://', '', site)
+        site = re.sub(r'^www\.', '', site).rstrip('/')
+        return f"{name}|{site}"
+
+    def _open_db(self, db_path: str):
+        """Open (and create if needed) the SQLite backing store"""
+        try:
+            directory = os.path.dirname(db_path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            self._db = sqlite3.connect(db_path, check_same_thread=False)
+            self._db.execute(
+                'CREATE TABLE IF NOT EXISTS verification_cache '
+                '(key TEXT PRIMARY KEY, value TEXT NOT NULL, stored_at REAL NOT NULL, ttl REAL NOT NULL)'
+            )
+            self._db.commit()
+            self._purge_expired()
+        except Exception as e:
+            print(f"[WARNING] Verification cache DB unavailable, using memory only: {e}")
+            self._db = None
+
+    def reopen_after_fork(self):
+        """
+        Give a forked child its own SQLite connection, locks and refresh threads
+
+        The inherited connection is kept referenced but never used or closed,
+        since SQLite connections must not cross fork.
+        """
+        self._lock = threading.Lock()
+        self._db_lock = threading.Lock()
+        self._refreshing = set()
+        self._refresh_pool = ThreadPoolExecutor(max_workers=2, thread_name_prefix='verification-refresh')
+        if self._db is not None:
+            _inherited_connections.append(self._db)
+            self._db = None
+            self._open_db(self._db_path)
+
+    @property
+    def persistent(self) -> bool:
+        """True if lookups and writes may go to SQLite"""
+        return self._db is not None
+
+    def get(self, key: str) -> Tuple[Optional[Dict[str, Any]], str]:
+        """
+        Look up a cached result
+
+        Returns:
+            tuple: (value or None, 'fresh' | 'stale' | 'miss')
+        """
+        now = time.time()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+
+        from_disk = entry is None and self._db is not None
+        if from_disk:
+            entry = self._db_get(key)
+
+        with self._lock:
+            if from_disk and entry is not None:
+                self._store(key, entry)
+
+            if entry is None:
+                self.misses += 1
+                return None, 'miss'
+
+            value, stored_at, ttl = entry
+            age = now - stored_at
+            if age <= ttl:
+                self.hits += 1
+                return value, 'fresh'
+            if age <= ttl + self.stale_ttl:
+                self.stale_hits += 1
+                return value, 'stale'
+
+            self._entries.pop(key, None)
+            self.misses += 1
+            return None, 'miss'
+
+    def set(self, key: str, value: Dict[str, Any], positive: bool):
+        """Store a result with the positive or negative TTL"""
+        ttl = self.positive_ttl if positive else self.negative_ttl
+        entry = (value, time.time(), ttl)
+        with self._lock:
+            self._store(key, entry)
+        if self._db is not None:
+            self._db_set(key, entry)
+
+    def refresh_async(self, key: str, loader: Callable[[], Tuple[Dict[str, Any], bool]]):
+        """
+        Recompute a stale entry in the background
+
+        Args:
+            key: Cache key
+            loader: Returns (value, positive); value None means do not cache
+        """
+        with self._lock:
+            if key in self._refreshing:
+                return
+            self._refreshing.add(key)
+
+        def _refresh():
+            try:
+                value, positive = loader()
+                if value is not None:
+                    self.set(key, value, positive)
+            except Exception as e:
+                print(f"[WARNING] Background verification refresh failed: {e}")
+            finally:
+                with self._lock:
+                    self._refreshing.discard(key)
+
+        self._refresh_pool.submit(_refresh)
+
+    def stats(self) -> Dict[str, Any]:
+        """Hit/miss counters for response metadata"""
+        with self._lock:
+            lookups = self.hits + self.stale_hits + self.misses
+            return {
+                'hits': self.hits,
+                'stale_hits': self.stale_hits,
+                'misses': self.misses,
+                'hit_ratio': round((self.hits + self.stale_hits) / lookups, 4) if lookups else 0.0,
+                'entries': len(self._entries),
+                'persistent': self._db is not None
+            }
+
+    def _store(self, key: str, entry: tuple):
+        """Insert into the LRU, evicting the oldest entries (lock held)"""
+        self._entries[key] = entry
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def _db_get(self, key: str) -> Optional[tuple]:
+        """Read one entry from SQLite"""
+        try:
+            with self._db_lock:
+                row = self._db.execute(
+                    'SELECT value, stored_at, ttl FROM verification_cache WHERE key = ?', (key,)
+                ).fetchone()
+            if row is None:
+                return None
+            return json.loads(row[0]), row[1], row[2]
+        except Exception as e:
+            print(f"[WARNING] Verification cache read failed: {e}")
+            return None
+
+    def _db_set(self, key: str, entry: tuple):
+        """Write one entry to SQLite, sweeping expired rows every purge_interval"""
+        value, stored_at, ttl = entry
+        with self._db_lock:
+            try:
+                self._db.execute(
+                    'INSERT OR REPLACE INTO verification_cache (key, value, stored_at, ttl) VALUES (?, ?, ?, ?)',
+                    (key, json.dumps(value), stored_at, ttl)
+                )
+                self._db.commit()
+            except Exception as e:
+                print(f"[WARNING] Verification cache write failed: {e}")
+            if stored_at - self._last_purge >= self.purge_interval:
+                self._purge_expired()
+
+    def _purge_expired(self):
+        """Delete SQLite rows past their TTL and stale window (db lock held or not yet shared)"""
+        now = time.time()
+        self._last_purge = now
+        try:
+            deleted = self._db.execute(
+                'DELETE FROM verification_cache WHERE stored_at + ttl + ? < ?', (self.stale_ttl, now)
+            ).rowcount
+            self._db.commit()
+            if deleted:
+                print(f"[INFO] Purged {deleted} expired verification cache rows")
+        except Exception as e:
+            print(f"[WARNING] Verification cache purge failed: {e}")
+
+
+_default_cache = None
+_default_cache_lock = threading.Lock()
+_inherited_connections = []
+
+
+def _after_fork_in_child():
+    if _default_cache is not None:
+        _default_cache.reopen_after_fork()
+
+
+os.register_at_fork(after_in_child=_after_fork_in_child)
+
+
+def get_default_cache() -> VerificationCache:
+    """Process-wide cache shared by every CompanyVerifier"""
+    global _default_cache
+    if _default_cache is None:
+        with _default_cache_lock:
+            if _default_cache is None:
+                _default_cache = VerificationCache.from_env()
+    return _default_cache
@@ -0,0 +1,343 @@
+# ========================
+# WEBSITE LIVENESS PROBER
+# ========================
+
+import asyncio
+import os
+import ssl
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import Future
+from typing import Any, Dict, List, Optional, Tuple
+from urllib.parse import urlsplit
+
+from services.async_http import get_async_client
+from services.http_session import get_session
+
+USER_AGENT = 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36'
+
+# Statuses some servers send for HEAD alone; these are retried with GET
+HEAD_REJECTED = {403, 405, 501}
+
+
+def _caused_by_tls(error: BaseException) -> bool:
+    """True if an ssl.SSLError is anywhere in error's chain of causes"""
+    while error is not None:
+        if isinstance(error, ssl.SSLError):
+            return True
+        error = error.__cause__ or error.__context__
+    return False
+
+
+def normalize_url(website: str) -> str:
+    """Website as submitted, with https:// added when no scheme is given"""
+    website = str(website or '').strip()
+    if not website.startswith(('http://', 'https://')):
+        website = 'https://' + website
+    return website
+
+
+class WebsiteProber:
+    """
+    Purpose: Check whether company websites are up
+    Allowed: HTTP probing, result caching, concurrency and rate limits
+    Forbidden: Scoring, verification policy
+
+    Probes go through the shared keep-alive session, so connections and DNS
+    answers are reused. Results are cached per origin (scheme, host and
+    port) for ttl seconds, or failure_ttl when the site could not be
+    reached. Concurrent probes of one origin share a single request. At
+    most max_concurrency probes are on the wire at once (per path: threads
+    through probe(), the event loop through probe_async()), and probes of
+    one host start at least host_interval seconds apart.
+    """
+
+    def __init__(self, max_concurrency: int = 16, host_interval: float = 1.0, ttl: float = 3600,
+                 failure_ttl: float = 300, timeout: float = 10, max_entries: int = 4096):
+        """
+        Args:
+            max_concurrency: Probes allowed on the wire at once
+            host_interval: Seconds between the starts of probes to one host
+            ttl: Seconds a reachable site's result stays cached
+            failure_ttl: Seconds an unreachable site's result stays cached
+            timeout: Connect and read timeout per request, in seconds
+            max_entries: Result cache capacity
+        """
+        self.max_concurrency = max_concurrency
+        self.host_interval = host_interval
+        self.ttl = ttl
+        self.failure_ttl = failure_ttl
+        self.timeout = timeout
+        self.max_entries = max_entries
+        self.headers = {'User-Agent': USER_AGENT}
+
+        # origin -> (result, expires_at)
+        self._results = OrderedDict()
+        # origin -> Future of the probe on the wire
+        self._inflight: Dict[str, Future] = {}
+        # host -> earliest start of its next probe
+        self._next_start: Dict[str, float] = {}
+        self._lock = threading.Lock()
+        self._slots = threading.BoundedSemaphore(max_concurrency)
+        # The async path's limit lives on its event loop; see _async_slots
+        self._async_semaphore = None
+        self._async_loop = None
+        self._tasks = set()
+
+        self.hits = 0
+        self.misses = 0
+
+    @classmethod
+    def from_env(cls) -> 'WebsiteProber':
+        """Build a prober from WEBSITE_PROBE_* environment variables"""
+        return cls(
+            max_concurrency=int(os.getenv('WEBSITE_PROBE_CONCURRENCY', '16')),
+            host_interval=float(os.getenv('WEBSITE_PROBE_HOST_INTERVAL', '1.0')),
+            ttl=float(os.getenv('WEBSITE_PROBE_TTL', '3600')),
+            failure_ttl=float(os.getenv('WEBSITE_PROBE_FAILURE_TTL', '300')),
+            timeout=float(os.getenv('WEBSITE_PROBE_TIMEOUT', '10'))
+        )
+
+    def probe(self, website: str) -> Dict[str, Any]:
+        """
+        Probe a website, or return the cached result for its origin
+
+        Args:
+            website: URL or bare hostname; https:// is assumed
+
+        Returns:
+            dict: url, final_url, status_code, accessible, tls_valid (None
+                when no TLS was involved), redirects (each hop's url and
+                status_code), method, elapsed_ms, error and cached
+        """
+        url, host, origin, failure = self._target(website)
+        if failure is not None:
+            return failure
+        cached, future, owner = self._claim(origin)
+        if cached is not None:
+            return cached
+        if not owner:
+            return dict(future.result(), cached=True)
+
+        try:
+            result = self._probe_uncached(url, host)
+        except BaseException as e:
+            self._release(origin, future, error=e)
+            raise
+        self._release(origin, future, result)
+        return dict(result, cached=False)
+
+    async def probe_async(self, website: str) -> Dict[str, Any]:
+        """
+        probe() for the ASGI path, over the shared async client
+
+        Shares the result cache and per-host pacing with probe(), and waits
+        for a probe of the same origin already running on either path. A
+        cancelled caller stops waiting; the probe still finishes and is
+        cached.
+        """
+        url, host, origin, failure = self._target(website)
+        if failure is not None:
+            return failure
+        cached, future, owner = self._claim(origin)
+        if cached is not None:
+            return cached
+        if owner:
+            task = asyncio.get_running_loop().create_task(self._probe_owned_async(url, host, origin, future))
+            # The loop only keeps weak references to tasks
+            self._tasks.add(task)
+            task.add_done_callback(self._tasks.discard)
+        result = await asyncio.shield(asyncio.wrap_future(future))
+        return dict(result, cached=not owner)
+
+    def _target(self, website: str) -> Tuple[str, str, str, Optional[Dict[str, Any]]]:
+        """(url, host, origin, None), or a failure result in place of None"""
+        url = normalize_url(website)
+        try:
+            parts = urlsplit(url)
+            host = (parts.hostname or '').lower()
+            origin = f"{parts.scheme}://{host}:{parts.port or (443 if parts.scheme == 'https' else 80)}"
+        except ValueError as e:
+            return url, '', '', self._failure(url, str(e))
+        if not host:
+            return url, host, origin, self._failure(url, 'No hostname')
+        return url, host, origin, None
+
+    def _claim(self, origin: str) -> Tuple[Optional[Dict[str, Any]], Optional[Future], bool]:
+        """
+        Cached result, or the Future of the origin's probe and whether the
+        caller owns it (and must run the probe and _release it)
+        """
+        now = time.monotonic()
+        with self._lock:
+            entry = self._results.get(origin)
+            if entry is not None and entry[1] > now:
+                self._results.move_to_end(origin)
+                self.hits += 1
+                return dict(entry[0], cached=True), None, False
+            self.misses += 1
+            future = self._inflight.get(origin)
+            owner = future is None
+            if owner:
+                future = Future()
+                self._inflight[origin] = future
+        return None, future, owner
+
+    def _release(self, origin: str, future: Future, result: Optional[Dict[str, Any]] = None,
+                 error: Optional[BaseException] = None):
+        """Cache an owned probe's result, then hand it to everyone waiting"""
+        with self._lock:
+            if error is None:
+                ttl = self.ttl if result['accessible'] else self.failure_ttl
+                self._results[origin] = (result, time.monotonic() + ttl)
+                self._results.move_to_end(origin)
+                while len(self._results) > self.max_entries:
+                    self._results.popitem(last=False)
+            self._inflight.pop(origin, None)
+        if error is None:
+            future.set_result(result)
+        else:
+            future.set_exception(error)
+
+    def _book_turn(self, host: str) -> float:
+        """Book host's next probe slot; returns seconds to wait for it"""
+        with self._lock:
+            now = time.monotonic()
+            start = max(now, self._next_start.get(host, 0.0))
+            if len(self._next_start) >= self.max_entries:
+                self._next_start = {h: t for h, t in self._next_start.items() if t > now}
+            self._next_start[host] = start + self.host_interval
+        return start - now
+
+    def _probe_uncached(self, url: str, host: str) -> Dict[str, Any]:
+        import requests
+
+        delay = self._book_turn(host)
+        if delay > 0:
+            time.sleep(delay)
+        began = time.perf_counter()
+        method = 'HEAD'
+        with self._slots:
+            try:
+                session = get_session()
+                response = session.head(url, headers=self.headers, timeout=self.timeout, allow_redirects=True)
+                if response.status_code in HEAD_REJECTED:
+                    method = 'GET'
+                    # Only the status line and headers are wanted; the body is never read
+                    with session.get(url, headers=self.headers, timeout=self.timeout,
+                                     allow_redirects=True, stream=True) as response:
+                        pass
+            except requests.exceptions.SSLError:
+                return self._failure(url, 'SSL Certificate Error', began, tls_valid=False)
+            except requests.exceptions.Timeout:
+                return self._failure(url, 'Timeout', began)
+            except requests.exceptions.RequestException as e:
+                return self._failure(url, str(e), began)
+
+        hops = [(hop.url, hop.status_code) for hop in response.history]
+        return self._success(url, response.url, response.status_code, hops, method, began)
+
+    async def _probe_owned_async(self, url: str, host: str, origin: str, future: Future):
+        try:
+            result = await self._probe_uncached_async(url, host)
+        except BaseException as e:
+            self._release(origin, future, error=e)
+            raise
+        self._release(origin, future, result)
+
+    async def _probe_uncached_async(self, url: str, host: str) -> Dict[str, Any]:
+        import httpx
+
+        delay = self._book_turn(host)
+        if delay > 0:
+            await asyncio.sleep(delay)
+        began = time.perf_counter()
+        method = 'HEAD'
+        async with self._async_slots():
+            try:
+                client = get_async_client()
+                response = await client.head(url, headers=self.headers, timeout=self.timeout, follow_redirects=True)
+                if response.status_code in HEAD_REJECTED:
+                    method = 'GET'
+                    async with client.stream('GET', url, headers=self.headers, timeout=self.timeout,
+                                             follow_redirects=True) as response:
+                        pass
+            except httpx.TimeoutException:
+                return self._failure(url, 'Timeout', began)
+            except (httpx.HTTPError, httpx.InvalidURL) as e:
+                if _caused_by_tls(e):
+                    return self._failure(url, 'SSL Certificate Error', began, tls_valid=False)
+                return self._failure(url, str(e) or type(e).__name__, began)
+
+        hops = [(str(hop.url), hop.status_code) for hop in response.history]
+        return self._success(url, str(response.url), response.status_code, hops, method, began)
+
+    def _async_slots(self) -> asyncio.Semaphore:
+        """The running loop's limit on probes awaited at once"""
+        loop = asyncio.get_running_loop()
+        if self._async_loop is not loop:
+            self._async_semaphore = asyncio.Semaphore(self.max_concurrency)
+            self._async_loop = loop
+        return self._async_semaphore
+
+    @staticmethod
+    def _success(url: str, final_url: str, status_code: int, hops: List[Tuple[str, int]],
+                 method: str, began: float) -> Dict[str, Any]:
+        redirects = [{'url': hop_url, 'status_code': hop_status} for hop_url, hop_status in hops]
+        uses_tls = final_url.startswith('https://') or any(hop_url.startswith('https://') for hop_url, _ in hops)
+        return {
+            'url': url,
+            'final_url': final_url,
+            'status_code': status_code,
+            'accessible': True,
+            # Certificates are verified on every TLS hop, so reaching here means they were valid
+            'tls_valid': True if uses_tls else None,
+            'redirects': redirects,
+            'method': method,
+            'elapsed_ms': round((time.perf_counter() - began) * 1000, 1),
+            'error': None
+        }
+
+    @staticmethod
+    def _failure(url: str, error: str, began: Optional[float] = None,
+                 tls_valid: Optional[bool] = None) -> Dict[str, Any]:
+        return {
+            'url': url,
+            'final_url': None,
+            'status_code': None,
+            'accessible': False,
+            'tls_valid': tls_valid,
+            'redirects': [],
+            'method': None,
+            'elapsed_ms': round((time.perf_counter() - began) * 1000, 1) if began is not None else 0.0,
+            'error': error
+        }
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {'entries': len(self._results), 'hits': self.hits, 'misses': self.misses}
+
+
+_prober = None
+_prober_lock = threading.Lock()
+
+
+def _after_fork_in_child():
+    # Locks and in-flight probes belong to the parent's threads
+    global _prober, _prober_lock
+    _prober = None
+    _prober_lock = threading.Lock()
+
+
+os.register_at_fork(after_in_child=_after_fork_in_child)
+
+
+def get_website_prober() -> WebsiteProber:
+    """Return the process-wide prober, configured from the environment"""
+    global _prober
+    if _prober is None:
+        with _prober_lock:
+            if _prober is None:
+                _prober = WebsiteProber.from_env()
+    return _prober
@@ -0,0 +1,1167 @@
+#!/usr/bin/env python
+# ========================
+# PERFORMANCE BENCHMARK SCRIPT
+# ========================
+
+import sys
+import os
+import json
+import time
+import random
+import string
+import tempfile
+import argparse
+import contextlib
+import io
+import tracemalloc
+import subprocess
+from typing import Callable, Dict, List
+
+# Add backend to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+
+def _timeit(func: Callable, repeat: int) -> float:
+    """Return mean seconds per call over `repeat` calls"""
+    start = time.perf_counter()
+    for _ in range(repeat):
+        func()
+    return (time.perf_counter() - start) / repeat
+
+
+def _random_company_names(count: int, seed: int = 7) -> List[str]:
+    """Generate synthetic company names like 'Qzvkd Tech Solutions 1234'"""
+    rng = random.Random(seed)
+    suffixes = ['Solutions', 'Technologies', 'Labs', 'Systems', 'Pvt Ltd', 'Inc', 'Analytics']
+    return [
+        f"{''.join(rng.choices(string.ascii_lowercase, k=rng.randint(4, 9))).title()} "
+        f"{rng.choice(suffixes)} {i}"
+        for i in range(count)
+    ]
+
+
+def bench_company_index(sizes: List[int], repeat: int = 2000) -> Dict[int, Dict[str, float]]:
+    """
+    Known-companies lookup cost as the database grows
+
+    Compares CompanyIndex against the old linear bidirectional substring scan.
+    """
+    from services.company_index import CompanyIndex
+
+    queries = ['Google LLC', 'Unknown Startup Ventures', 'Microsoft India Pvt Ltd', 'Acme']
+    results = {}
+
+    for size in sizes:
+        names = _random_company_names(size) + ['Google', 'Microsoft']
+        with tempfile.NamedTemporaryFile('w', suffix='.json', delete=False) as f:
+            json.dump({'companies': names}, f)
+            path = f.name
+
+        try:
+            index = CompanyIndex(path)
+            with contextlib.redirect_stdout(io.StringIO()):
+                build = _timeit(lambda: index._build(names), 1)
+                index.match('warmup')
+
+            def indexed():
+                for q in queries:
+                    index.match(q)
+
+            def linear():
+                for q in queries:
+                    q_lower = q.lower()
+                    for known in names:
+                        if known.lower() in q_lower or q_lower in known.lower():
+                            break
+
+            results[size] = {
+                'build_ms': build * 1000,
+                'indexed_us': _timeit(indexed, repeat) / len(queries) * 1e6,
+                'linear_us': _timeit(linear, max(1, repeat // max(1, size // 100))) / len(queries) * 1e6,
+            }
+        finally:
+            os.remove(path)
+
+    print("\n[BENCH] Known-companies lookup (per query)")
+    print(f"  {'companies':>10} {'build ms':>10} {'indexed us':>12} {'linear us':>12}")
+    for size, r in results.items():
+        print(f"  {size:>10} {r['build_ms']:>10.1f} {r['indexed_us']:>12.2f} {r['linear_us']:>12.1f}")
+    return results
+
+
+def _sentiment_backend_worker(backend: str, quantized: bool, texts: List[str], repeat: int, out):
+    """Child process: load one backend and measure memory and latency"""
+    import resource
+    os.environ['SENTIMENT_BACKEND'] = backend
+    os.environ['SENTIMENT_ONNX_QUANTIZED'] = '1' if quantized else '0'
+    os.environ['SENTIMENT_BATCHING'] = '0'
+    try:
+        from services.sentiment_analyzer import SentimentAnalyzer
+
+        rss_before = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        analyzer = SentimentAnalyzer()
+        load = _timeit(analyzer._ensure_model_loaded, 1)
+        rss_after = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+        analyzer._run_model(texts[:1])
+        single = _timeit(lambda: analyzer._run_model(texts[:1]), repeat)
+        batch = _timeit(lambda: analyzer._run_model(texts), max(1, repeat // 4))
+        out.put({
+            'load_s': load,
+            'rss_mb': (rss_after - rss_before) / 1024,
+            'single_ms': single * 1000,
+            'batch_ms_per_text': batch / len(texts) * 1000,
+        })
+    except Exception as e:
+        out.put({'error': str(e)})
+
+
+def bench_sentiment_backends(repeat: int = 40) -> Dict[str, Dict[str, float]]:
+    """
+    Latency and memory of the PyTorch, ONNX fp32 and ONNX int8 backends
+
+    Each backend runs in a fresh process so RSS numbers are not shared.
+    """
+    import multiprocessing
+    from tests.test_datasets import test_cases
+
+    texts = [case['jobDescription'][:512] for case in test_cases.values()] * 4
+    ctx = multiprocessing.get_context('spawn')
+    results = {}
+
+    for label, backend, quantized in (('torch', 'torch', False), ('onnx-fp32', 'onnx', False), ('onnx-int8', 'onnx', True)):
+        out = ctx.Queue()
+        proc = ctx.Process(target=_sentiment_backend_worker, args=(backend, quantized, texts, repeat, out))
+        proc.start()
+        results[label] = out.get()
+        proc.join()
+
+    print("\n[BENCH] Sentiment inference backends")
+    print(f"  {'backend':>10} {'load s':>8} {'RSS MB':>8} {'single ms':>10} {'batch ms/text':>14}")
+    for label, r in results.items():
+        if 'error' in r:
+            print(f"  {label:>10}  skipped: {r['error']}")
+            continue
+        print(f"  {label:>10} {r['load_s']:>8.2f} {r['rss_mb']:>8.0f} {r['single_ms']:>10.2f} {r['batch_ms_per_text']:>14.2f}")
+    return results
+
+
+def bench_red_flags(repeat: int = 200) -> Dict[str, float]:
+    """
+    Red-flag scan cost on the current rule catalog
+
+    Compares RedFlagScanner (one finditer per precompiled rule) with a single
+    pass of a named-group alternation over every rule.
+    """
+    import re
+    from services.info_parser import RED_FLAG_PATTERNS, RedFlagScanner
+    from tests.test_datasets import test_cases
+
+    text = '\n'.join(case['jobDescription'] for case in test_cases.values()).lower()
+    scanner = RedFlagScanner(RED_FLAG_PATTERNS)
+    patterns = [(category, pattern) for category, rules in RED_FLAG_PATTERNS.items() for pattern in rules]
+    combined = re.compile('|'.join(f'(?P<r{i}>{pattern})' for i, (_, pattern) in enumerate(patterns)),
+                          re.IGNORECASE)
+
+    def single_pass():
+        return {patterns[int(match.lastgroup[1:])][0] for match in combined.finditer(text)}
+
+    # The alternation reports at most one rule per position, so it can miss
+    # overlapping matches; the categories agree on this text
+    assert set(scanner.scan(text)) == single_pass()
+    results = {
+        'scanner_ms': _timeit(lambda: scanner.scan(text), repeat) * 1000,
+        'single_pass_ms': _timeit(single_pass, repeat) * 1000,
+    }
+
+    print(f"\n[BENCH] Red-flag scan ({len(patterns)} rules, {len(text)} chars)")
+    print(f"  scanner:     {results['scanner_ms']:.3f} ms")
+    print(f"  single pass: {results['single_pass_ms']:.3f} ms")
+    return results
+
+
+def _synthetic_posting(size: int, seed: int = 3) -> str:
+    """Pasted multi-page posting of roughly `size` characters built from the test cases"""
+    from tests.test_datasets import test_cases
+
+    rng = random.Random(seed)
+    descriptions = [case['jobDescription'] for case in test_cases.values()]
+    parts = ['Senior Data Analyst Intern', 'Acme Analytics', 'Acme Analytics']
+    length = sum(map(len, parts))
+    while length < size:
+        part = rng.choice(descriptions)
+        parts.append(part)
+        length += len(part) + 1
+    return '\n'.join(parts)[:size]
+
+
+def bench_company_name(sizes: List[int] = (10_000, 100_000, 1_000_000), repeat: int = 20) -> Dict[int, Dict[str, float]]:
+    """
+    Company name and position extraction cost on long pasted postings
+
+    Compares a shared DocumentContext against rebuilding the line data in
+    every extractor, on inputs with and without a company suffix line.
+    """
+    from preprocessing.document_context import DocumentContext
+    from services.info_parser import InternshipInfoParser
+
+    parser = InternshipInfoParser()
+    results = {}
+
+    for size in sizes:
+        # Strip suffix words so Strategy 0 cannot return early and every
+        # strategy walks the whole document
+        text = _synthetic_posting(size)
+        plain = ' '.join(
+            word for word in text.split(' ')
+            if not parser.COMPANY_SUFFIX_RE.search(word)
+        )
+
+        def shared(doc):
+            document = DocumentContext(doc)
+            parser._extract_company_name(doc, document)
+            parser._extract_position(doc, document)
+
+        def separate(doc):
+            parser._extract_company_name(doc)
+            parser._extract_position(doc)
+
+        results[size] = {
+            'shared_ms': _timeit(lambda: shared(text), repeat) * 1000,
+            'separate_ms': _timeit(lambda: separate(text), repeat) * 1000,
+            'no_suffix_ms': _timeit(lambda: shared(plain), repeat) * 1000,
+        }
+
+    print("\n[BENCH] Company name + position extraction")
+    print(f"  {'chars':>10} {'shared ms':>10} {'separate ms':>12} {'no suffix ms':>13}")
+    for size, r in results.items():
+        print(f"  {size:>10} {r['shared_ms']:>10.2f} {r['separate_ms']:>12.2f} {r['no_suffix_ms']:>13.2f}")
+    return results
+
+
+def _allocated_kb(steps: List[Callable]) -> float:
+    """
+    KB allocated across a sequence of calls
+
+    Each step's traced high-water mark above what was live when it started
+    is summed, so temporaries freed between steps still count.
+    """
+    total = 0
+    tracemalloc.start()
+    try:
+        for step in steps:
+            tracemalloc.reset_peak()
+            live, _ = tracemalloc.get_traced_memory()
+            step()
+            _, peak = tracemalloc.get_traced_memory()
+            total += peak - live
+    finally:
+        tracemalloc.stop()
+    return total / 1024
+
+
+def bench_document_context(sizes: List[int] = (10_000, 100_000), repeat: int = 10) -> Dict[int, Dict[str, float]]:
+    """
+    Per-request text handling cost across the parser, cleaner, dataset
+    validator and offer quality checks
+
+    Compares one shared DocumentContext against every consumer lowercasing
+    and splitting the job description itself, by time and by bytes allocated.
+    """
+    from preprocessing.document_context import DocumentContext
+    from preprocessing.text_cleaner import TextCleaner
+    from services.info_parser import InternshipInfoParser
+    from services.dataset_validator import DatasetValidator
+
+    parser = InternshipInfoParser()
+    cleaner = TextCleaner()
+    with contextlib.redirect_stdout(io.StringIO()):
+        validator = DatasetValidator(background=False)
+    offer_words = ['responsibility', 'skill', 'certificate', 'apply']
+    results = {}
+
+    def consumer_steps(text, shared):
+        document = DocumentContext(text, cleaner) if shared else None
+        return [
+            lambda: parser.parse(text, document),
+            lambda: document.cleaned if shared else cleaner.clean(text),
+            lambda: validator.validate_against_datasets('Acme', '', text, document=document),
+            lambda: any(word in (document.lower if shared else text.lower()) for word in offer_words),
+        ]
+
+    def run(text, shared):
+        for step in consumer_steps(text, shared):
+            step()
+
+    for size in sizes:
+        text = _synthetic_posting(size)
+        with contextlib.redirect_stdout(io.StringIO()):
+            results[size] = {
+                'shared_ms': _timeit(lambda: run(text, True), repeat) * 1000,
+                'separate_ms': _timeit(lambda: run(text, False), repeat) * 1000,
+                'shared_kb': _allocated_kb(consumer_steps(text, True)),
+                'separate_kb': _allocated_kb(consumer_steps(text, False)),
+            }
+
+    print("\n[BENCH] Shared document context (one request)")
+    print(f"  {'chars':>10} {'shared ms':>10} {'separate ms':>12} {'shared KB':>10} {'separate KB':>12}")
+    for size, r in results.items():
+        print(f"  {size:>10} {r['shared_ms']:>10.2f} {r['separate_ms']:>12.2f} "
+              f"{r['shared_kb']:>10.0f} {r['separate_kb']:>12.0f}")
+    return results
+
+
+def bench_scam_patterns(sizes: List[int], repeat: int = 20) -> Dict[int, Dict[str, float]]:
+    """
+    Scam-pattern check cost as the pattern set grows
+
+    Compares the DatasetValidator automaton against the old per-pattern
+    substring loop on a 10k-character posting.
+    """
+    from services.dataset_validator import DatasetValidator
+
+    with contextlib.redirect_stdout(io.StringIO()):
+        validator = DatasetValidator(background=False)
+    text = _synthetic_posting(10_000)
+    text_lower = text.lower()
+    results = {}
+
+    for size in sizes:
+        patterns = [
+            {'pattern': name, 'severity': 'medium'} for name in _random_company_names(size)
+        ] + [{'pattern': 'registration fee', 'severity': 'high'}]
+        staged = validator._empty_datasets()
+        staged['scam_patterns'] = patterns
+        validator._publish(staged, ['benchmark'])
+
+        def linear():
+            for item in validator.scam_patterns:
+                pattern = item.get('pattern', '').lower()
+                if pattern and pattern in text_lower:
+                    pass
+
+        with contextlib.redirect_stdout(io.StringIO()):
+            results[size] = {
+                'automaton_ms': _timeit(lambda: validator.validate_against_datasets('Acme', '', text), repeat) * 1000,
+                'linear_ms': _timeit(linear, repeat) * 1000,
+            }
+
+    print("\n[BENCH] Scam-pattern matching (10k-char posting)")
+    print(f"  {'patterns':>10} {'automaton ms':>13} {'linear ms':>10}")
+    for size, r in results.items():
+        print(f"  {size:>10} {r['automaton_ms']:>13.2f} {r['linear_ms']:>10.2f}")
+    return results
+
+
+def bench_dataset_snapshot(sizes: List[int], repeat: int = 2000) -> Dict[int, Dict[str, float]]:
+    """
+    Dataset startup and lookup cost, JSON + set against the mapped snapshot
+
+    Python heap usage is what each worker would hold privately; the
+    snapshot's pages are shared through the page cache instead.
+    """
+    from services.dataset_snapshot import write_snapshot, open_snapshot
+
+    results = {}
+    for size in sizes:
+        names = [name.lower() for name in _random_company_names(size)]
+        queries = names[::max(1, size // 50)] + ['unknown startup ventures']
+        with tempfile.TemporaryDirectory() as tmp:
+            json_path = os.path.join(tmp, 'legitimate_companies.json')
+            snapshot_path = os.path.join(tmp, 'datasets.snapshot')
+            with open(json_path, 'w') as f:
+                json.dump({'companies': names}, f)
+            write_snapshot(snapshot_path, {
+                'legitimate_companies': names, 'scam_companies': [], 'scam_patterns': []
+            })
+
+            def load_json():
+                with open(json_path) as f:
+                    return set(c.lower() for c in json.load(f)['companies'])
+
+            companies = load_json()
+            table = open_snapshot(snapshot_path)[0]
+            results[size] = {
+                'json_load_ms': _timeit(load_json, 3) * 1000,
+                'snapshot_open_ms': _timeit(lambda: open_snapshot(snapshot_path), 3) * 1000,
+                'json_heap_kb': _allocated_kb([load_json]),
+                'snapshot_heap_kb': _allocated_kb([lambda: open_snapshot(snapshot_path)]),
+                'set_lookup_us': _timeit(lambda: [q in companies for q in queries], repeat) * 1e6 / len(queries),
+                'snapshot_lookup_us': _timeit(lambda: [q in table for q in queries], repeat) * 1e6 / len(queries),
+            }
+
+    print("\n[BENCH] Dataset snapshot vs JSON sets")
+    print(f"  {'names':>10} {'json ms':>9} {'open ms':>9} {'json KB':>10} {'snap KB':>9} {'set us':>8} {'snap us':>8}")
+    for size, r in results.items():
+        print(f"  {size:>10} {r['json_load_ms']:>9.2f} {r['snapshot_open_ms']:>9.2f} {r['json_heap_kb']:>10.0f} "
+              f"{r['snapshot_heap_kb']:>9.0f} {r['set_lookup_us']:>8.2f} {r['snapshot_lookup_us']:>8.2f}")
+    return results
+
+
+def _misspell(name: str, rng: random.Random) -> str:
+    """Swap one letter of the first word, as a look-alike scam name would"""
+    first, _, rest = name.partition(' ')
+    i = rng.randrange(1, len(first))
+    first = first[:i] + rng.choice(string.ascii_lowercase.replace(first[i].lower(), '')) + first[i + 1:]
+    return f'{first} {rest}'
+
+
+def bench_fuzzy_index(sizes: List[int], repeat: int = 200) -> Dict[int, Dict[str, float]]:
+    """
+    Fuzzy company-name lookup cost and recall as the list grows
+
+    Queries are known names with a changed suffix ('Pvt Ltd' -> 'Inc') or a
+    one-letter spelling change, plus names that are not in the list. The
+    index is also written to a dataset snapshot and mapped, as each worker
+    process does; mapped lookups must match the built index.
+    """
+    from services.fuzzy_index import FuzzyNameIndex
+    from services.dataset_snapshot import write_snapshot, open_snapshot
+
+    rng = random.Random(11)
+    results = {}
+    for size in sizes:
+        names = _random_company_names(size)
+        start = time.perf_counter()
+        index = FuzzyNameIndex(names)
+        build_s = time.perf_counter() - start
+
+        sample = rng.sample(names, min(50, size))
+        renamed = [f"{name.rsplit(' ', 1)[0]} Inc {name.rsplit(' ', 1)[1]}" for name in sample]
+        misspelled = [_misspell(name, rng) for name in sample]
+        unknown = [f'Zzqx Unlisted Ventures {i}' for i in range(len(sample))]
+
+        def per_lookup_us(queries):
+            return _timeit(lambda: [index.lookup(q) for q in queries], repeat) * 1e6 / len(queries)
+
+        with tempfile.TemporaryDirectory() as tmp:
+            snapshot_path = os.path.join(tmp, 'datasets.snapshot')
+            write_snapshot(snapshot_path, {'legitimate_companies': names, 'scam_companies': [], 'scam_patterns': []})
+            map_ms = _timeit(lambda: open_snapshot(snapshot_path), 3) * 1000
+            built = FuzzyNameIndex(open_snapshot(snapshot_path)[0])
+            mapped = open_snapshot(snapshot_path)[4]
+            for q in renamed + misspelled + unknown:
+                assert mapped.lookup(q) == built.lookup(q), q
+            mapped_us = _timeit(lambda: [mapped.lookup(q) for q in misspelled], repeat) * 1e6 / len(misspelled)
+
+        results[size] = {
+            'build_s': build_s,
+            'map_ms': map_ms,
+            'renamed_us': per_lookup_us(renamed),
+            'misspelled_us': per_lookup_us(misspelled),
+            'mapped_misspelled_us': mapped_us,
+            'unknown_us': per_lookup_us(unknown),
+            'misspelled_recall': sum(
+                (index.lookup(q) or {}).get('name') == name for q, name in zip(misspelled, sample)
+            ) / len(sample),
+        }
+
+    print("\n[BENCH] Fuzzy company-name index (per lookup)")
+    print(f"  {'names':>10} {'build s':>8} {'map ms':>7} {'suffix us':>10} {'typo us':>8} {'mapped typo us':>15} "
+          f"{'miss us':>8} {'typo recall':>12}")
+    for size, r in results.items():
+        print(f"  {size:>10} {r['build_s']:>8.2f} {r['map_ms']:>7.2f} {r['renamed_us']:>10.1f} {r['misspelled_us']:>8.1f} "
+              f"{r['mapped_misspelled_us']:>15.1f} {r['unknown_us']:>8.1f} {r['misspelled_recall']:>12.0%}")
+    return results
+
+
+def bench_suffix_list(hosts: int = 2000, repeat: int = 20) -> Dict[str, float]:
+    """
+    Per-URL cost of URLFeatureExtractor's hostname split, cold and warm
+
+    Cold is compiling the bundled suffix list plus the first URL; uncached
+    URLs each have a new hostname, warm URLs repeat one already parsed.
+    tldextract, if installed, is timed offline on its bundled snapshot for
+    comparison.
+    """
+    from services.suffix_list import SuffixList
+
+    rng = random.Random(11)
+    suffixes = ['com', 'in', 'co.in', 'co.uk', 'org', 'io', 'com.au', 'gov.in', 'ac.in', 'net']
+    urls = [
+        f"https://{rng.choice(['', 'www.', 'careers.', 'jobs.hr.'])}"
+        f"{''.join(rng.choices(string.ascii_lowercase, k=rng.randint(4, 12)))}.{rng.choice(suffixes)}/apply?id={i}"
+        for i in range(hosts)
+    ]
+
+    began = time.perf_counter()
+    suffix_list = SuffixList()
+    suffix_list.extract(urls[0])
+    cold_ms = (time.perf_counter() - began) * 1000
+
+    began = time.perf_counter()
+    for url in urls[1:]:
+        suffix_list.extract(url)
+    uncached_us = (time.perf_counter() - began) * 1e6 / (len(urls) - 1)
+    warm_us = _timeit(lambda: [suffix_list.extract(url) for url in urls], repeat) * 1e6 / len(urls)
+
+    results = {'rules': suffix_list.rules, 'cold_ms': cold_ms, 'uncached_us': uncached_us, 'warm_us': warm_us}
+    try:
+        import tldextract
+        began = time.perf_counter()
+        extract = tldextract.TLDExtract(suffix_list_urls=(), cache_dir=None)
+        extract(urls[0])
+        results['tldextract_cold_ms'] = (time.perf_counter() - began) * 1000
+        results['tldextract_us'] = _timeit(lambda: [extract(url) for url in urls], repeat) * 1e6 / len(urls)
+    except ImportError:
+        pass
+
+    print(f"\n[BENCH] Suffix list ({results['rules']} rules, {hosts} URLs)")
+    print(f"  cold (compile + first URL) {cold_ms:.1f} ms, uncached {uncached_us:.2f} us/URL, "
+          f"warm {warm_us:.2f} us/URL")
+    if 'tldextract_us' in results:
+        print(f"  tldextract offline: cold {results['tldextract_cold_ms']:.1f} ms, "
+              f"{results['tldextract_us']:.2f} us/URL")
+    return results
+
+
+def bench_url_batch(urls: int = 20000, repeat: int = 3) -> Dict[str, float]:
+    """
+    URLFeatureExtractor.extract_batch against extract() per URL
+
+    Distinct URLs each have a new hostname, so extract() pays for an
+    uncached suffix lookup; crawl URLs repeat a few hundred hosts, as job
+    board listings do. Batch rows are checked against extract() by
+    tests/run_url_feature_tests.py.
+    """
+    from services.url_feature_extractor import URLFeatureExtractor, FEATURE_NAMES
+
+    rng = random.Random(13)
+    suffixes = ['com', 'in', 'co.in', 'co.uk', 'org', 'io', 'com.au', 'gov.in', 'ac.in', 'net']
+
+    def host():
+        return (f"{rng.choice(['', 'www.', 'careers.', 'jobs.hr.'])}"
+                f"{''.join(rng.choices(string.ascii_lowercase + '-', k=rng.randint(4, 14)))}{rng.randint(0, 99)}"
+                f".{rng.choice(suffixes)}")
+
+    def url(hostname, i):
+        return (f"{rng.choice(['https', 'http'])}://{hostname}"
+                f"/{rng.choice(['jobs', 'careers/apply', 'intern//listing', ''])}?id={i}")
+
+    hosts = [host() for _ in range(300)]
+    workloads = {
+        'distinct': [url(host(), i) for i in range(urls)],
+        'crawl': [url(rng.choice(hosts), i) for i in range(urls)],
+    }
+
+    extractor = URLFeatureExtractor()
+    # Build the suffix hash tables outside the timings
+    extractor.extract_batch(workloads['distinct'][:1])
+
+    results = {}
+    for name, workload in workloads.items():
+        per_url_us = _timeit(lambda: [extractor.extract(u) for u in workload], 1) * 1e6 / len(workload)
+        batch_us = _timeit(lambda: extractor.extract_batch(workload), repeat) * 1e6 / len(workload)
+        results[f'{name}_per_url_us'] = per_url_us
+        results[f'{name}_batch_us'] = batch_us
+        results[f'{name}_speedup'] = per_url_us / batch_us
+
+    print(f"\n[BENCH] URL features ({urls} URLs, {len(FEATURE_NAMES)} features)")
+    for name in workloads:
+        print(f"  {name:<9} extract() {results[f'{name}_per_url_us']:.2f} us/URL, "
+              f"extract_batch {results[f'{name}_batch_us']:.2f} us/URL ({results[f'{name}_speedup']:.1f}x)")
+    shortfall = [name for name in workloads if results[f'{name}_speedup'] < 10]
+    if shortfall:
+        print(f"  below the 10x target: {', '.join(shortfall)}")
+    return results
+
+
+@contextlib.contextmanager
+def _stand_in_site(delay_ms: float = 20, bind: str = '127.0.0.1'):
+    """
+    Local keep-alive HTTP server standing in for company websites
+
+    /ok answers 200, /moved redirects to /ok, /no-head rejects HEAD with
+    405 but answers GET, /missing is 404. Every response waits delay_ms,
+    roughly a nearby site's server time. Bound to 0.0.0.0 it also answers
+    on 127.x.y.z, so one server can stand in for many distinct hosts.
+    """
+    import threading
+    from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = 'HTTP/1.1'
+
+        def _respond(self, head_only: bool):
+            time.sleep(delay_ms / 1000)
+            path = self.path.split('?')[0]
+            status, headers = 404, {}
+            if path == '/ok' or (path == '/no-head' and not head_only):
+                status = 200
+            elif path == '/no-head':
+                status = 405
+            elif path == '/moved':
+                status, headers = 301, {'Location': '/ok'}
+            body = b'stand-in site'
+            self.send_response(status)
+            for name, value in headers.items():
+                self.send_header(name, value)
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            if not head_only:
+                self.wfile.write(body)
+
+        def do_HEAD(self):
+            self._respond(head_only=True)
+
+        def do_GET(self):
+            self._respond(head_only=False)
+
+        def log_message(self, *args):
+            pass
+
+    class Server(ThreadingHTTPServer):
+        request_queue_size = 1024
+
+    server = Server((bind, 0), Handler)
+    server.daemon_threads = True
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    try:
+        yield f'http://localhost:{server.server_address[1]}'
+    finally:
+        server.shutdown()
+        server.server_close()
+
+
+def bench_website_probe(probes: int = 400, clients: int = 32, delay_ms: float = 20) -> Dict[str, float]:
+    """
+    Website probe latency against a local stand-in site
+
+    `probes` uncached probes from `clients` threads are timed three ways:
+    a fresh connection and DNS lookup per probe (requests.head, as before
+    WebsiteProber), WebsiteProber with caching off (pooled connections and
+    DNS cache only), and WebsiteProber with its result cache.
+    Probe results are checked by run_website_prober_tests.py.
+    """
+    import requests
+    from concurrent.futures import ThreadPoolExecutor
+    from services.website_prober import WebsiteProber
+
+    def percentiles(samples: List[float]) -> Dict[str, float]:
+        samples = sorted(samples)
+        return {
+            'p50_ms': samples[len(samples) // 2],
+            'p95_ms': samples[min(len(samples) - 1, int(len(samples) * 0.95))],
+        }
+
+    def timed(probe: Callable, urls: List[str]) -> Dict[str, float]:
+        def one(url):
+            began = time.perf_counter()
+            probe(url)
+            return (time.perf_counter() - began) * 1000
+
+        began = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=clients) as pool:
+            samples = list(pool.map(one, urls))
+        return dict(percentiles(samples), probes_per_s=len(urls) / (time.perf_counter() - began))
+
+    results = {}
+    with _stand_in_site(delay_ms) as site:
+        # Distinct query strings keep requests.head from reusing anything
+        urls = [f'{site}/ok?id={i}' for i in range(probes)]
+        pooled = WebsiteProber(max_concurrency=clients, host_interval=0, ttl=0, failure_ttl=0)
+        cached = WebsiteProber(max_concurrency=clients, host_interval=0)
+        cached.probe(urls[0])
+        results['fresh'] = timed(lambda url: requests.head(url, timeout=10, allow_redirects=True), urls)
+        results['pooled'] = timed(pooled.probe, urls)
+        results['cached'] = timed(cached.probe, urls)
+
+    print(f"\n[BENCH] Website probes ({probes} probes, {clients} clients, {delay_ms:.0f} ms stand-in site)")
+    print(f"  {'mode':<8} {'p50 ms':>8} {'p95 ms':>8} {'probes/s':>9}")
+    for name, r in results.items():
+        print(f"  {name:<8} {r['p50_ms']:>8.2f} {r['p95_ms']:>8.2f} {r['probes_per_s']:>9.0f}")
+    return results
+
+
+def bench_cse_budget(processes: int = 4, quota: int = 200, reserves: int = 2000) -> Dict[str, float]:
+    """
+    Google CSE rate limit, daily quota and circuit breaker
+
+    Checks the bucket, quota and breaker transitions on a scratch database,
+    then that `processes` forked workers sharing one database together send
+    exactly `quota` queries. Times reserve() (one SQLite transaction), and
+    counts the queries a burst of verifications sends to a stand-in CSE
+    endpoint that answers 429, with the breaker against without it, and
+    the queries sent per verification when every answer is a scam report
+    (the fan-out stops early, before the unsent queries go out).
+    """
+    import asyncio
+    import threading
+    from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+    from urllib.parse import quote_plus
+    from services import cse_budget, google_cse
+    from services.company_verifier import CompanyVerifier
+    from services.cse_budget import BudgetDenied, CSEBudget
+
+    results = {}
+    with tempfile.TemporaryDirectory() as scratch:
+        def fresh(name: str, **kwargs) -> CSEBudget:
+            return CSEBudget(db_path=os.path.join(scratch, f'{name}.sqlite3'), **kwargs)
+
+        def reason(budget: CSEBudget) -> str:
+            try:
+                budget.reserve()
+                return 'granted'
+            except BudgetDenied as e:
+                return e.reason
+
+        bucket = fresh('bucket', rate=10, burst=3, max_wait=0)
+        assert [reason(bucket) for _ in range(4)] == ['granted'] * 3 + ['rate_limited']
+        time.sleep(0.15)
+        assert reason(bucket) == 'granted', 'bucket did not refill'
+        booked = fresh('booked', rate=20, burst=1, max_wait=1)
+        booked.reserve()
+        assert 0 < booked.reserve() <= 0.06, 'an empty bucket should book the next token'
+
+        daily = fresh('daily', daily_quota=2, rate=1000, burst=1000)
+        assert [reason(daily) for _ in range(3)] == ['granted', 'granted', 'quota_exhausted']
+        assert daily.blocked_reason() == 'quota_exhausted' and daily.report()['remaining'] == 0
+
+        breaker = fresh('breaker', rate=1000, burst=1000, cooldown=0.1, trial_timeout=0.1)
+        breaker.reserve()
+        breaker.record(429)
+        assert reason(breaker) == 'circuit_open' and breaker.blocked_reason() == 'circuit_open'
+        time.sleep(0.12)
+        assert reason(breaker) == 'granted', 'half-open breaker should let one trial through'
+        assert reason(breaker) == 'circuit_open', 'only one trial at a time'
+        breaker.record(200)
+        assert breaker.report()['breaker']['state'] == 'closed' and reason(breaker) == 'granted'
+        breaker.record(403)
+        assert breaker.report()['breaker']['open_for_s'] > 0, '403 should open until the quota day ends'
+        breaker.reset()
+        assert reason(breaker) == 'granted'
+
+        # Forked workers drawing on one database
+        shared_path = os.path.join(scratch, 'shared.sqlite3')
+        CSEBudget(db_path=shared_path)
+        pipes = []
+        for _ in range(processes):
+            read_fd, write_fd = os.pipe()
+            pid = os.fork()
+            if pid == 0:
+                os.close(read_fd)
+                worker = CSEBudget(db_path=shared_path, daily_quota=quota, rate=1e6, burst=10 ** 6, max_wait=0)
+                granted = sum(reason(worker) == 'granted' for _ in range(quota))
+                os.write(write_fd, str(granted).encode())
+                os._exit(0)
+            os.close(write_fd)
+            pipes.append((pid, read_fd))
+        granted = 0
+        for pid, read_fd in pipes:
+            os.waitpid(pid, 0)
+            with os.fdopen(read_fd) as f:
+                granted += int(f.read() or 0)
+        assert granted == quota, f'{processes} processes sent {granted} queries against a quota of {quota}'
+        results['shared_quota_granted'] = granted
+
+        timing = fresh('timing', daily_quota=10 ** 9, rate=1e9, burst=10 ** 9)
+        results['reserve_us'] = _timeit(timing.reserve, reserves) * 1e6
+        results['record_success_us'] = _timeit(lambda: timing.record(200), reserves) * 1e6
+
+        # A burst of verifications while Google CSE answers 429
+        sent = []
+        answer = {'status': 429}
+
+        class StandInCSE(BaseHTTPRequestHandler):
+            def do_GET(self):
+                sent.append(self.path)
+                if answer['status'] == 200:
+                    items = [{'title': f'Scam report {len(sent)}.{i}', 'snippet': ''} for i in range(3)]
+                    body = json.dumps({'items': items}).encode()
+                else:
+                    body = b'{"error": {"code": 429, "message": "Quota exceeded"}}'
+                self.send_response(answer['status'])
+                self.send_header('Content-Type', 'application/json')
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, *args):
+                pass
+
+        server = ThreadingHTTPServer(('127.0.0.1', 0), StandInCSE)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        endpoint, budget = google_cse.CSE_ENDPOINT, cse_budget._budget
+        google_cse.CSE_ENDPOINT = f'http://127.0.0.1:{server.server_address[1]}/customsearch/v1'
+        try:
+            verifier = CompanyVerifier()
+            verifier.google_api_key, verifier.google_cse_id = 'stand-in-key', 'stand-in-cx'
+            companies = [f'Burst Company {i}' for i in range(25)]
+            for name, settings in (('without_breaker', {'cooldown': 0, 'trial_timeout': 0}), ('with_breaker', {})):
+                cse_budget._budget = fresh(name, rate=1000, burst=1000, **settings)
+                sent.clear()
+                with contextlib.redirect_stdout(io.StringIO()):
+                    checks = [verifier._check_scam_reports(company) for company in companies]
+                results[f'{name}_queries_sent'] = len(sent)
+            assert checks[-1]['api_used'] == 'patterns_only' and checks[-1]['api_skipped'] == 'circuit_open'
+
+            # Three indicators per answer: the first answer is enough to stop
+            answer['status'] = 200
+            cse_budget._budget = fresh('early_stop', rate=1000, burst=1000)
+
+            async def verify_async(names):
+                for company in names:
+                    await verifier._search_google_cse_async(company)
+
+            for name, run in (('sync', lambda names: [verifier._search_google_cse(c) for c in names]),
+                              ('async', lambda names: asyncio.run(verify_async(names)))):
+                # Own names per run: a query already in flight when the last
+                # verification stopped may reach the stand-in after it returns
+                names = [f'Early Stop {name} {i}' for i in range(len(companies))]
+                with contextlib.redirect_stdout(io.StringIO()):
+                    run(names)
+                ours = [path for path in sent if quote_plus(f'"Early Stop {name} ') in path]
+                results[f'early_stop_{name}_queries_per_verification'] = len(ours) / len(names)
+                assert len(ours) <= verifier.max_queries_in_flight * len(names), name
+        finally:
+            google_cse.CSE_ENDPOINT, cse_budget._budget = endpoint, budget
+            server.shutdown()
+            server.server_close()
+
+    print(f"\n[BENCH] Google CSE budget ({processes} processes, quota {quota})")
+    print(f"  shared quota: {results['shared_quota_granted']} queries granted across processes")
+    print(f"  reserve() {results['reserve_us']:.0f} us, record(200) {results['record_success_us']:.2f} us")
+    print(f"  25 verifications against a 429ing endpoint: {results['without_breaker_queries_sent']} queries "
+          f"without the breaker, {results['with_breaker_queries_sent']} with it")
+    print(f"  early stop: {results['early_stop_sync_queries_per_verification']:.1f} (sync), "
+          f"{results['early_stop_async_queries_per_verification']:.1f} (async) of 4 queries sent per verification")
+    return results
+
+
+# Cold start budget: interpreter start, app import and first /health response
+COLD_START_BUDGET_MS = float(os.getenv('COLD_START_BUDGET_MS', '1500'))
+
+_STARTUP_TARGETS = {
+    # name: (directory put on sys.path, module to import, health route)
+    'app': (os.path.join(os.path.dirname(__file__), '..'), 'app', '/health'),
+    'vercel': (os.path.join(os.path.dirname(__file__), '..', '..', 'api'), 'index', '/api/health'),
+}
+
+_STARTUP_PROBE = """
+import json, sys, time, contextlib, io
+began = time.perf_counter()
+sys.path.insert(0, {path!r})
+with contextlib.redirect_stdout(io.StringIO()):
+    module = __import__({module!r})
+    imported = time.perf_counter()
+    response = module.app.test_client().get({route!r})
+    responded = time.perf_counter()
+print(json.dumps({{
+    'import_ms': (imported - began) * 1000,
+    'first_response_ms': (responded - imported) * 1000,
+    'status': response.status_code,
+    'heavy_loaded': sorted(m for m in {heavy!r} if m in sys.modules),
+}}))
+"""
+
+# Imported only when first used; loading any of these at startup is a regression
+_HEAVY_MODULES = ['torch', 'transformers', 'tensorflow', 'sklearn', 'joblib', 'requests', 'numpy']
+
+
+def _summarize_importtime(stderr: str, top: int = 10) -> Dict[str, List]:
+    """Self time per top-level package and the slowest modules by cumulative time"""
+    per_package = {}
+    modules = []
+    for line in stderr.splitlines():
+        if not line.startswith('import time:') or 'self [us]' in line:
+            continue
+        self_us, cumulative_us, name = line[len('import time:'):].split('|')
+        package = name.strip().split('.')[0]
+        per_package[package] = per_package.get(package, 0) + int(self_us)
+        modules.append((int(cumulative_us), name.strip()))
+    return {
+        'packages': sorted(per_package.items(), key=lambda item: -item[1])[:top],
+        'modules': sorted(modules, reverse=True)[:top],
+    }
+
+
+def bench_startup(targets: List[str] = ('app', 'vercel')) -> Dict[str, Dict]:
+    """
+    Cold start profile of the Flask app and the Vercel handler
+
+    Each target starts in a fresh interpreter under -X importtime. Reports
+    import time per package, the slowest modules, time to the first /health
+    response and heavy dependencies loaded during startup, then checks the
+    total against COLD_START_BUDGET_MS.
+    """
+    results = {}
+    for name in targets:
+        path, module, route = _STARTUP_TARGETS[name]
+        probe = _STARTUP_PROBE.format(path=os.path.abspath(path), module=module, route=route, heavy=_HEAVY_MODULES)
+        began = time.perf_counter()
+        proc = subprocess.run(
+            [sys.executable, '-X', 'importtime', '-c', probe],
+            capture_output=True, text=True, cwd=os.path.abspath(path)
+        )
+        wall_ms = (time.perf_counter() - began) * 1000
+        if proc.returncode != 0:
+            print(f"\n[BENCH] Startup {name}: failed\n{proc.stderr.splitlines()[-1] if proc.stderr else ''}")
+            continue
+
+        result = json.loads(proc.stdout.strip().splitlines()[-1])
+        result['wall_ms'] = wall_ms
+        result.update(_summarize_importtime(proc.stderr))
+        result['within_budget'] = wall_ms <= COLD_START_BUDGET_MS
+        results[name] = result
+
+        print(f"\n[BENCH] Startup: {name} ({module}, first GET {route})")
+        print(f"  process wall {wall_ms:.0f} ms (budget {COLD_START_BUDGET_MS:.0f} ms: "
+              f"{'OK' if result['within_budget'] else 'OVER'}), import {result['import_ms']:.0f} ms, "
+              f"first response {result['first_response_ms']:.1f} ms")
+        print(f"  heavy modules loaded at startup: {', '.join(result['heavy_loaded']) or 'none'}")
+        print(f"  {'package':<24} {'self ms':>8}")
+        for package, self_us in result['packages']:
+            print(f"  {package:<24} {self_us / 1000:>8.1f}")
+        print(f"  {'module':<40} {'cumulative ms':>14}")
+        for cumulative_us, module_name in result['modules']:
+            print(f"  {module_name:<40} {cumulative_us / 1000:>14.1f}")
+    return results
+
+
+_SERVER_COMMANDS = {
+    # name: command line, given the port; 'dev' is app.py's own app.run call
+    'dev': lambda port: [sys.executable, '-c',
+                         f"import app; app.app.run(debug=False, host='127.0.0.1', port={port}, use_reloader=False)"],
+    'prod-process': lambda port: [sys.executable, 'run.py', '--prod', '--host', '127.0.0.1', '--port', str(port)],
+    'prod-thread': lambda port: [sys.executable, 'run.py', '--prod', '--host', '127.0.0.1', '--port', str(port),
+                                 '--concurrency', 'thread'],
+    'prod-async': lambda port: [sys.executable, 'run.py', '--prod', '--host', '127.0.0.1', '--port', str(port),
+                                '--concurrency', 'async'],
+}
+
+
+def _wait_for_server(port: int, timeout: float = 120) -> bool:
+    import urllib.request
+
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            urllib.request.urlopen(f'http://127.0.0.1:{port}/health', timeout=1)
+            return True
+        except OSError:
+            time.sleep(0.2)
+    return False
+
+
+def _load_test(port: int, body: bytes, requests: int, clients: int) -> Dict[str, float]:
+    """POST body to /api/parse_internship_info from concurrent clients"""
+    import http.client
+    from concurrent.futures import ThreadPoolExecutor
+
+    def one(_):
+        began = time.perf_counter()
+        conn = http.client.HTTPConnection('127.0.0.1', port, timeout=30)
+        conn.request('POST', '/api/parse_internship_info', body, {'Content-Type': 'application/json'})
+        ok = conn.getresponse().read() and True
+        conn.close()
+        return (time.perf_counter() - began) * 1000, ok
+
+    first_ms, _ = one(None)
+    began = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=clients) as pool:
+        samples = list(pool.map(one, range(requests)))
+    elapsed = time.perf_counter() - began
+    latencies = sorted(ms for ms, _ in samples)
+    return {
+        'first_ms': first_ms,
+        'requests_per_s': requests / elapsed,
+        'p50_ms': latencies[len(latencies) // 2],
+        'p99_ms': latencies[min(len(latencies) - 1, int(len(latencies) * 0.99))],
+    }
+
+
+def bench_server_throughput(servers: List[str] = ('dev', 'prod-process', 'prod-thread'),
+                            requests: int = 400, clients: int = 16, size: int = 20_000) -> Dict[str, Dict[str, float]]:
+    """
+    Throughput of the development server against the production server
+
+    Each server starts as its own process and is loaded with concurrent
+    /api/parse_internship_info requests for one pasted posting of about
+    `size` characters. The first request is timed on its own, since that is
+    what the production server's warmup saves. prod-process forks one worker per CPU, so the gap to
+    the threaded servers grows with the core count.
+    """
+    import socket
+
+    body = json.dumps({'rawInternshipInfo': _synthetic_posting(size)}).encode('utf-8')
+    backend_dir = os.path.join(os.path.dirname(__file__), '..')
+    results = {}
+    for name in servers:
+        with socket.socket() as probe:
+            probe.bind(('127.0.0.1', 0))
+            port = probe.getsockname()[1]
+        proc = subprocess.Popen(_SERVER_COMMANDS[name](port), cwd=os.path.abspath(backend_dir),
+                                stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+        try:
+            if not _wait_for_server(port):
+                print(f"\n[BENCH] Server throughput {name}: did not start")
+                continue
+            results[name] = _load_test(port, body, requests, clients)
+        finally:
+            proc.terminate()
+            proc.wait(timeout=60)
+
+    print(f"\n[BENCH] Server throughput ({requests} requests, {clients} clients, "
+          f"{size}-char posting, {os.cpu_count()} CPUs)")
+    print(f"  {'server':<14} {'first ms':>9} {'req/s':>8} {'p50 ms':>8} {'p99 ms':>8}")
+    for name, r in results.items():
+        print(f"  {name:<14} {r['first_ms']:>9.1f} {r['requests_per_s']:>8.1f} {r['p50_ms']:>8.1f} {r['p99_ms']:>8.1f}")
+    return results
+
+
+def _server_threads(pid: int) -> int:
+    """Threads of a process and its children, from /proc (0 where unavailable)"""
+    total = 0
+    pids = [pid]
+    while pids:
+        pid = pids.pop()
+        try:
+            total += len(os.listdir(f'/proc/{pid}/task'))
+            for task in os.listdir(f'/proc/{pid}/task'):
+                with open(f'/proc/{pid}/task/{task}/children') as f:
+                    pids.extend(int(child) for child in f.read().split())
+        except OSError:
+            continue
+    return total
+
+
+def bench_verify_concurrency(servers: List[str] = ('prod-process', 'prod-thread', 'prod-async'),
+                             requests: int = 400, clients: int = 200,
+                             delay_ms: float = 500) -> Dict[str, Dict[str, float]]:
+    """
+    /api/verify_company under many slow verifications at once
+
+    Every request names a different website, 127.x.y.z on a stand-in site
+    that answers after delay_ms, so no probe is cached or coalesced and
+    each one waits on the network, as a real company site does. `clients`
+    requests are kept in flight. The WSGI servers hold a worker or thread
+    for each waiting verification; the ASGI server holds a coroutine. The
+    prober's own concurrency limit is raised so it is not what is measured.
+    """
+    import asyncio
+    import socket
+    import threading
+
+    import httpx
+
+    backend_dir = os.path.join(os.path.dirname(__file__), '..')
+    env = dict(os.environ, WEBSITE_PROBE_CONCURRENCY=str(clients * 2),
+               GOOGLE_CSE_API_KEY='', GOOGLE_CSE_ENGINE_ID='')
+
+    async def load(port: int, site_port: int) -> Dict[str, float]:
+        gate = asyncio.Semaphore(clients)
+        latencies = []
+        failures = []
+
+        async def one(client, i):
+            async with gate:
+                began = time.perf_counter()
+                try:
+                    response = await client.post(f'http://127.0.0.1:{port}/api/verify_company', json={
+                        'companyName': f'Stand-in Company {i}',
+                        'website': f'http://127.0.{i // 250 + 1}.{i % 250 + 1}:{site_port}/ok',
+                    })
+                except httpx.HTTPError as e:
+                    # Connections refused or reset once the listen backlog is full
+                    failures.append(e)
+                    return
+                verification = response.json()['verification']
+                assert verification['has_official_website'], verification
+                latencies.append((time.perf_counter() - began) * 1000)
+
+        # A connection per request, as the WSGI servers close theirs anyway; httpx
+        # pools slow down with hundreds of idle connections to scan
+        limits = httpx.Limits(max_connections=clients, max_keepalive_connections=0)
+        async with httpx.AsyncClient(limits=limits, timeout=120) as client:
+            began = time.perf_counter()
+            await asyncio.gather(*(one(client, i) for i in range(requests)))
+            elapsed = time.perf_counter() - began
+        completed = len(latencies)
+        latencies = sorted(latencies) or [float('nan')]
+        return {
+            'requests_per_s': completed / elapsed,
+            'failed': len(failures),
+            'p50_ms': latencies[len(latencies) // 2],
+            'p95_ms': latencies[min(len(latencies) - 1, int(len(latencies) * 0.95))],
+        }
+
+    results = {}
+    with _stand_in_site(delay_ms, bind='0.0.0.0') as site:
+        site_port = int(site.rsplit(':', 1)[1])
+        for name in servers:
+            with socket.socket() as probe:
+                probe.bind(('127.0.0.1', 0))
+                port = probe.getsockname()[1]
+            proc = subprocess.Popen(_SERVER_COMMANDS[name](port), cwd=os.path.abspath(backend_dir), env=env,
+                                    stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+            try:
+                if not _wait_for_server(port):
+                    print(f"\n[BENCH] Verify concurrency {name}: did not start")
+                    continue
+                peak = [_server_threads(proc.pid)]
+                done = threading.Event()
+
+                def sample():
+                    while not done.wait(0.05):
+                        peak[0] = max(peak[0], _server_threads(proc.pid))
+
+                sampler = threading.Thread(target=sample, daemon=True)
+                sampler.start()
+                try:
+                    results[name] = asyncio.run(load(port, site_port))
+                finally:
+                    done.set()
+                    sampler.join()
+                results[name]['peak_threads'] = peak[0]
+            finally:
+                proc.terminate()
+                proc.wait(timeout=60)
+
+    print(f"\n[BENCH] Verify concurrency ({requests} requests, {clients} in flight, "
+          f"{delay_ms:.0f} ms stand-in sites, {os.cpu_count()} CPUs)")
+    print(f"  {'server':<14} {'req/s':>8} {'failed':>7} {'p50 ms':>8} {'p95 ms':>8} {'threads':>8}")
+    for name, r in results.items():
+        print(f"  {name:<14} {r['requests_per_s']:>8.1f} {r['failed']:>7} {r['p50_ms']:>8.1f} {r['p95_ms']:>8.1f} "
+              f"{r['peak_threads']:>8}")
+    return results
+
+
+BENCHMARKS = {
+    'company_index': lambda args: bench_company_index(args.sizes),
+    'sentiment_backends': lambda args: bench_sentiment_backends(),
+    'red_flags': lambda args: bench_red_flags(),
+    'company_name': lambda args: bench_company_name(),
+    'document_context': lambda args: bench_document_context(),
+    'scam_patterns': lambda args: bench_scam_patterns(args.sizes),
+    'dataset_snapshot': lambda args: bench_dataset_snapshot(args.sizes),
+    'fuzzy_index': lambda args: bench_fuzzy_index(args.sizes),
+    'suffix_list': lambda args: bench_suffix_list(),
+    'url_batch': lambda args: bench_url_batch(),
+    'website_probe': lambda args: bench_website_probe(),
+    'cse_budget': lambda args: bench_cse_budget(),
+    'startup': lambda args: bench_startup(),
+    'server_throughput': lambda args: bench_server_throughput(),
+    'verify_concurrency': lambda args: bench_verify_concurrency(),
+}
+
+
+def main():
+    """Main entry point"""
+    parser = argparse.ArgumentParser(description='Run backend performance benchmarks')
+    parser.add_argument('names', nargs='*',
+                        help=f"Benchmarks to run: {', '.join(BENCHMARKS)} (default: all)")
+    parser.add_argument('--sizes', type=int, nargs='+', default=[100, 10000, 100000],
+                        help='Dataset sizes for scaling benchmarks')
+    args = parser.parse_args()
+
+    unknown = [name for name in args.names if name not in BENCHMARKS]
+    if unknown:
+        parser.error(f"unknown benchmark(s): {', '.join(unknown)}")
+
+    for name in args.names or BENCHMARKS:
+        BENCHMARKS[name](args)
+
+
+if __name__ == '__main__':
+    main()
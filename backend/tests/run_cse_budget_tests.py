@@ -0,0 +1,244 @@
+#!/usr/bin/env python
+# ========================
+# GOOGLE CSE BUDGET TEST SCRIPT
+# ========================
+
+import sys
+import os
+import shutil
+import tempfile
+from datetime import datetime
+from typing import Any, Callable
+from zoneinfo import ZoneInfo
+
+# Add backend to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from services import cse_budget
+from services.cse_budget import BudgetDenied, CSEBudget
+
+PACIFIC = ZoneInfo('America/Los_Angeles')
+
+
+class FakeClock:
+    """Stands in for the time module in cse_budget; moves only when told to"""
+
+    def __init__(self, now: float):
+        self.now = now
+
+    def time(self) -> float:
+        return self.now
+
+    def advance(self, seconds: float):
+        self.now += seconds
+
+
+class CSEBudgetValidator:
+    """Checks CSEBudget quota days, token bucket and circuit breaker on a fake clock"""
+
+    def __init__(self):
+        self.failures = []
+        self.checked = 0
+        self.directory = tempfile.mkdtemp(prefix='cse_budget_tests_')
+        self.clock = FakeClock(0)
+
+    def run_all_tests(self) -> bool:
+        """Run every check and print a summary"""
+        print("\n" + "="*80)
+        print("GOOGLE CSE BUDGET VALIDATION")
+        print("="*80)
+
+        saved = cse_budget.time
+        cse_budget.time = self.clock
+        try:
+            self.test_quota_day()
+            self.test_token_bucket()
+            self.test_breaker_opens()
+            self.test_single_trial()
+            self.test_trial_outcome()
+            self.test_reads_skip_write_lock()
+        finally:
+            cse_budget.time = saved
+            shutil.rmtree(self.directory, ignore_errors=True)
+
+        print(f"\nChecks run: {self.checked}")
+        if self.failures:
+            print(f"FAILED: {len(self.failures)}")
+            for name, detail in self.failures:
+                print(f"  [{name}] {detail}")
+        else:
+            print("Budget and breaker behave as documented")
+        print("="*80 + "\n")
+        return not self.failures
+
+    def check(self, name: str, passed: bool, detail: Any = None):
+        """Record one check"""
+        self.checked += 1
+        status = "PASS" if passed else "FAIL"
+        print(f"  [{status}] {name}")
+        if not passed:
+            self.failures.append((name, detail))
+
+    def budget(self, name: str, **kwargs) -> CSEBudget:
+        """Budget on its own database; a second call with the same name shares it, like another worker"""
+        settings = dict(daily_quota=100, rate=100.0, burst=100, max_wait=2.0, cooldown=300, trial_timeout=30)
+        settings.update(kwargs)
+        return CSEBudget(db_path=os.path.join(self.directory, f'{name}.sqlite3'), **settings)
+
+    def at(self, *local: int):
+        """Set the clock to a wall time in Pacific time"""
+        self.clock.now = datetime(*local, tzinfo=PACIFIC).timestamp()
+
+    @staticmethod
+    def denial(func: Callable[[], Any]) -> BudgetDenied:
+        """The BudgetDenied func raises, or None if it returns"""
+        try:
+            func()
+        except BudgetDenied as e:
+            return e
+        return None
+
+    def test_quota_day(self):
+        """The quota is shared by workers, runs out, and resets at Pacific midnight, not UTC"""
+        # 16:59:30 PDT is 23:59:30 UTC
+        self.at(2026, 6, 10, 16, 59, 30)
+        budget, other_worker = self.budget('quota', daily_quota=3), self.budget('quota', daily_quota=3)
+        budget.reserve()
+        other_worker.reserve()
+        budget.reserve()
+        denied = self.denial(other_worker.reserve)
+        self.check('quota spent across workers', denied is not None and denied.reason == 'quota_exhausted', denied)
+        self.check('retry at Pacific midnight',
+                   denied is not None and denied.retry_at == datetime(2026, 6, 11, tzinfo=PACIFIC).timestamp(),
+                   denied and denied.retry_at)
+        self.check('blocked up front', budget.blocked_reason() == 'quota_exhausted', budget.blocked_reason())
+
+        self.clock.advance(60)
+        self.check('still spent after UTC midnight', self.denial(budget.reserve) is not None)
+
+        self.at(2026, 6, 11, 0, 0, 0)
+        self.check('new quota day at Pacific midnight', self.denial(budget.reserve) is None)
+        report = other_worker.report()
+        self.check('report counts the new day',
+                   report['quota_day'] == '2026-06-11' and report['used'] == 1 and report['remaining'] == 2, report)
+
+        # 2026-03-08 is 23 hours long in Pacific time
+        self.at(2026, 3, 8, 12, 0, 0)
+        budget = self.budget('dst', daily_quota=0)
+        denied = self.denial(budget.reserve)
+        self.check('short DST day resets at local midnight',
+                   denied is not None and denied.retry_at == datetime(2026, 3, 9, tzinfo=PACIFIC).timestamp(),
+                   denied and denied.retry_at)
+
+    def test_token_bucket(self):
+        """A burst is sent at once, later queries are booked for the next token or refused"""
+        self.at(2026, 6, 12, 9, 0, 0)
+        budget = self.budget('bucket', rate=2.0, burst=2, max_wait=1.0)
+        delays = [budget.reserve() for _ in range(4)]
+        self.check('burst then booked slots', delays == [0.0, 0.0, 0.5, 1.0], delays)
+        denied = self.denial(budget.reserve)
+        self.check('refused past max_wait',
+                   denied is not None and denied.reason == 'rate_limited' and denied.retry_at == self.clock.now + 1.5,
+                   denied)
+        self.clock.advance(2.0)
+        self.check('bucket refills', budget.reserve() == 0.0)
+        self.check('refusals counted', budget.denied == 1, budget.denied)
+
+    def test_breaker_opens(self):
+        """Only 403 and 429 trip the breaker; each trip is counted"""
+        self.at(2026, 6, 13, 9, 0, 0)
+        budget = self.budget('opens')
+        for status in (200, 404, 500, 503):
+            budget.record(status)
+        self.check('other statuses leave it closed',
+                   budget.blocked_reason() is None and budget.report()['breaker']['state'] == 'closed')
+
+        budget.reserve()
+        budget.record(429)
+        denied = self.denial(budget.reserve)
+        self.check('429 opens it for the cooldown',
+                   denied is not None and denied.reason == 'circuit_open'
+                   and denied.retry_at == self.clock.now + 300, denied)
+        self.check('blocked while open', budget.blocked_reason() == 'circuit_open', budget.blocked_reason())
+
+        budget.record(403)
+        breaker = budget.report()['breaker']
+        denied = self.denial(budget.reserve)
+        self.check('403 keeps it open until Pacific midnight',
+                   denied is not None and denied.retry_at == datetime(2026, 6, 14, tzinfo=PACIFIC).timestamp(),
+                   denied)
+        self.check('trips counted', breaker['trips'] == 2 and '403' in breaker['reason'], breaker)
+
+        budget.record(429)
+        self.check('shorter trip does not cut an open breaker short',
+                   budget.report()['breaker']['trips'] == 2, budget.report()['breaker'])
+
+    def test_single_trial(self):
+        """After the cooldown exactly one trial query is let through, across workers"""
+        self.at(2026, 6, 15, 9, 0, 0)
+        budget, other_worker = self.budget('trial'), self.budget('trial')
+        budget.record(429)
+        self.clock.advance(299)
+        self.check('open until the cooldown ends', self.denial(budget.reserve) is not None)
+
+        self.clock.advance(1)
+        self.check('one trial allowed', self.denial(budget.reserve) is None)
+        self.check('half open', budget.report()['breaker']['state'] == 'half_open', budget.report()['breaker'])
+        second = self.denial(budget.reserve)
+        self.check('second query held back', second is not None and second.reason == 'circuit_open', second)
+        self.check('other worker held back too', self.denial(other_worker.reserve) is not None)
+
+        self.clock.advance(30)
+        self.check('another trial once the first times out', self.denial(other_worker.reserve) is None)
+        self.check('and only one', self.denial(budget.reserve) is not None)
+
+    def test_trial_outcome(self):
+        """A successful trial closes the breaker; a failed one opens it again"""
+        self.at(2026, 6, 16, 9, 0, 0)
+        budget, other_worker = self.budget('outcome'), self.budget('outcome')
+        other_worker.reserve()
+        budget.record(429)
+        # A success for a query sent before the trip says nothing about now
+        other_worker.record(200)
+        self.check('early success does not close it', budget.blocked_reason() == 'circuit_open')
+
+        self.clock.advance(300)
+        budget.reserve()
+        budget.record(429)
+        breaker = budget.report()['breaker']
+        self.check('failed trial reopens it', breaker['state'] == 'open' and breaker['trips'] == 2, breaker)
+
+        self.clock.advance(300)
+        budget.reserve()
+        budget.record(200)
+        self.check('successful trial closes it', budget.report()['breaker']['state'] == 'closed',
+                   budget.report()['breaker'])
+        delays = [other_worker.reserve() for _ in range(5)]
+        self.check('queries flow again', delays == [0.0] * 5, delays)
+
+        budget.record(403)
+        budget.reset()
+        self.check('reset closes it by hand',
+                   budget.blocked_reason() is None and self.denial(budget.reserve) is None)
+
+    def test_reads_skip_write_lock(self):
+        """Status reads do not wait for another worker's write transaction"""
+        self.at(2026, 6, 16, 9, 0, 0)
+        budget, other_worker = self.budget('reads', daily_quota=1), self.budget('reads', daily_quota=1)
+        other_worker.reserve()
+        other_worker._db.execute('BEGIN IMMEDIATE')
+        try:
+            self.check('blocked_reason reads during a write', budget.blocked_reason() == 'quota_exhausted')
+            report = budget.report()
+            self.check('report reads during a write', 'error' not in report and report['used'] == 1, report)
+        finally:
+            other_worker._db.execute('ROLLBACK')
+
+
+def main():
+    """Main entry point"""
+    validator = CSEBudgetValidator()
+    sys.exit(0 if validator.run_all_tests() else 1)
+
+if __name__ == '__main__':
+    main()
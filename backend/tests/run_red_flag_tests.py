@@ -0,0 +1,111 @@
+#!/usr/bin/env python
+# ========================
+# RED FLAG SCANNER TEST SCRIPT
+# ========================
+
+import sys
+import os
+import re
+import random
+from typing import Dict, List, Tuple
+
+# Add backend to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from services.info_parser import RED_FLAG_PATTERNS, RedFlagScanner
+from tests.test_datasets import test_cases
+
+# One phrase per rule, plus variants that stress case folding and overlaps
+PHRASES = [
+    'requires payment', 'Registration  Fee', 'upfront cost', 'pay to join', 'deposit required',
+    'upfront investment', '₹ 500 fee', '₹2000payment',
+    'bank details', 'AADHAR', 'your PAN card', 'passport', 'ſsn', 'ssssn', 'credit card',
+    'earn quick', 'quick cash', 'passive income', 'make money fast', 'guaranteed earnings',
+    'unlimited per month', '100000 monthly',
+    'only 3 spots left', 'just 10 seats available', 'URGENT HIRING', 'decide today',
+    'limited opportunity',
+    'no experience required', 'skills needed', 'simple tasks', 'just easy tasks',
+    'without written contract', 'verbal agreement only', 'informal arrangement',
+    '!!!', 'Click Here', 'apply now', 'pay to pay to apply',
+    # Characters IGNORECASE equates with ASCII letters, and ones whose case
+    # folding changes length
+    'Straße passport', 'İnformal arrangement', 'ınformal arrangement', 'ﬁnal registration fee',
+    'bank detaİls', 'Kredit card', 'ſimple tasks',
+]
+
+
+class RedFlagScannerValidator:
+    """Checks RedFlagScanner.scan against one re.finditer per rule"""
+
+    def __init__(self, seed: int = 17):
+        self.rng = random.Random(seed)
+        self.failures = []
+        self.checked = 0
+
+    def run_all_tests(self) -> bool:
+        """Run every check and print a summary"""
+        print("\n" + "="*80)
+        print("RED FLAG SCANNER VALIDATION")
+        print("="*80)
+
+        texts = self._texts()
+        scanner = RedFlagScanner(RED_FLAG_PATTERNS)
+        # As parse() passes it, and as pasted
+        self.check('lowercased', scanner, [text.lower() for text in texts])
+        self.check('raw', scanner, texts)
+
+        print(f"\nTexts checked: {self.checked}")
+        if self.failures:
+            print(f"FAILED: {len(self.failures)}")
+            for name, detail in self.failures[:20]:
+                print(f"  [{name}] {detail}")
+        else:
+            print("All categories match the per-pattern search")
+        print("="*80 + "\n")
+        return not self.failures
+
+    def check(self, name: str, scanner: RedFlagScanner, texts: List[str]):
+        """Compare scan() with the reference for each text, category by category"""
+        for text in texts:
+            self.checked += 1
+            expected = self.reference(text)
+            found = scanner.scan(text)
+            for category in RED_FLAG_PATTERNS:
+                if found.get(category, []) != expected.get(category, []):
+                    self.failures.append((name, f"{category} in {text[:60]!r}: "
+                                                f"{found.get(category)} != {expected.get(category)}"))
+
+    @staticmethod
+    def reference(text: str) -> Dict[str, List[Tuple[int, int]]]:
+        """Sorted spans of re.finditer for every rule, by category"""
+        matches = {}
+        for category, patterns in RED_FLAG_PATTERNS.items():
+            for pattern in patterns:
+                for match in re.finditer(pattern, text, re.IGNORECASE):
+                    matches.setdefault(category, []).append(match.span())
+        for spans in matches.values():
+            spans.sort()
+        return matches
+
+    def _texts(self) -> List[str]:
+        """Test case descriptions, the phrases alone, and postings with phrases spliced in"""
+        descriptions = [case['jobDescription'] for case in test_cases.values()]
+        texts = descriptions + PHRASES + [' '.join(PHRASES), ''.join(PHRASES)]
+        for _ in range(200):
+            words = self.rng.choice(descriptions).split(' ')
+            for _ in range(self.rng.randint(1, 6)):
+                phrase = self.rng.choice(PHRASES)
+                if self.rng.random() < 0.3:
+                    phrase = phrase.upper()
+                words.insert(self.rng.randrange(len(words) + 1), phrase)
+            texts.append(self.rng.choice([' ', '\n', '']).join(words))
+        return texts
+
+
+def main():
+    """Main entry point"""
+    validator = RedFlagScannerValidator()
+    sys.exit(0 if validator.run_all_tests() else 1)
+
+if __name__ == '__main__':
+    main()
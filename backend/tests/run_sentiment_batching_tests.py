@@ -0,0 +1,298 @@
+#!/usr/bin/env python
+# ========================
+# SENTIMENT BATCHING AND CACHE TEST SCRIPT
+# ========================
+
+import json
+import sys
+import os
+import shutil
+import tempfile
+import threading
+import time
+from typing import Any, Dict, List
+
+# Add backend to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from services.inference_batcher import MicroBatcher
+from services.sentiment_analyzer import SentimentAnalyzer
+from services.sentiment_cache import SentimentCache, _ENTRY_OVERHEAD_BYTES
+
+# Long enough that every submit of a test lands in one batch window
+WAIT_MS = 200
+
+
+class CountingModel:
+    """Token-id model with the OnnxSentimentModel interface that records each inference call"""
+
+    def __init__(self):
+        self.calls: List[int] = []
+        self._lock = threading.Lock()
+
+    def token_ids(self, texts: List[str]) -> List[List[int]]:
+        return [[ord(c) for c in text] for text in texts]
+
+    def predict_ids(self, windows: List[List[int]], batch_size: int = 32) -> List[Dict[str, Any]]:
+        with self._lock:
+            self.calls.append(len(windows))
+        return [{'label': 'POSITIVE' if len(ids) % 2 else 'NEGATIVE', 'score': 0.9} for ids in windows]
+
+
+class SentimentBatchingValidator:
+    """Checks MicroBatcher batching and SentimentCache keys and byte budget"""
+
+    def __init__(self):
+        self.failures = []
+        self.checked = 0
+        self.directory = tempfile.mkdtemp(prefix='sentiment_tests_')
+
+    def run_all_tests(self) -> bool:
+        """Run every check and print a summary"""
+        print("\n" + "="*80)
+        print("SENTIMENT BATCHING AND CACHE VALIDATION")
+        print("="*80)
+
+        try:
+            self.test_shared_batch()
+            self.test_batch_limits()
+            self.test_batch_errors()
+            self.test_worker_after_fork()
+            self.test_analyzer_batching()
+            self.test_byte_budget()
+            self.test_model_version()
+            self.test_sqlite_tier()
+            self.test_sqlite_pruning()
+            self.test_sqlite_off_lock()
+        finally:
+            shutil.rmtree(self.directory, ignore_errors=True)
+
+        print(f"\nChecks run: {self.checked}")
+        if self.failures:
+            print(f"FAILED: {len(self.failures)}")
+            for name, detail in self.failures:
+                print(f"  [{name}] {detail}")
+        else:
+            print("Batching and caching behave as documented")
+        print("="*80 + "\n")
+        return not self.failures
+
+    def check(self, name: str, passed: bool, detail: Any = None):
+        """Record one check"""
+        self.checked += 1
+        status = "PASS" if passed else "FAIL"
+        print(f"  [{status}] {name}")
+        if not passed:
+            self.failures.append((name, detail))
+
+    @staticmethod
+    def concurrently(func, args: List[Any]) -> List[Any]:
+        """func(arg) for each arg, each on its own thread, started together"""
+        start = threading.Barrier(len(args))
+        results = [None] * len(args)
+
+        def run(i):
+            start.wait()
+            results[i] = func(args[i])
+
+        threads = [threading.Thread(target=run, args=(i,)) for i in range(len(args))]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join(10)
+        return results
+
+    def test_shared_batch(self):
+        """Concurrent submits share one batch_fn call, each caller getting its own result"""
+        calls = []
+        batcher = MicroBatcher(lambda items: calls.append(list(items)) or [item * 2 for item in items],
+                               max_batch_size=8, max_wait_ms=WAIT_MS)
+        results = self.concurrently(lambda item: batcher.submit(item).result(5), list(range(8)))
+        self.check('one call for concurrent submits', len(calls) == 1 and sorted(calls[0]) == list(range(8)), calls)
+        self.check('each caller gets its own result', results == [item * 2 for item in range(8)], results)
+        stats = batcher.stats()
+        self.check('stats count the batch',
+                   stats['batches'] == 1 and stats['items'] == 8 and stats['batch_size_histogram'] == {8: 1}, stats)
+
+    def test_batch_limits(self):
+        """No batch exceeds max_batch_size; a full batch does not wait out max_wait_ms"""
+        sizes = []
+        batcher = MicroBatcher(lambda items: sizes.append(len(items)) or list(items),
+                               max_batch_size=4, max_wait_ms=WAIT_MS)
+        futures = [batcher.submit(i) for i in range(10)]
+        results = [future.result(5) for future in futures]
+        self.check('batches capped', max(sizes) <= 4 and sum(sizes) == 10, sizes)
+        self.check('results in submit order', results == list(range(10)), results)
+
+    def test_batch_errors(self):
+        """A failing or short batch_fn fails every future of its batch, and the worker carries on"""
+        def batch_fn(items):
+            if 'boom' in items:
+                raise ValueError('model failed')
+            if 'short' in items:
+                return []
+            return list(items)
+
+        batcher = MicroBatcher(batch_fn, max_batch_size=2, max_wait_ms=WAIT_MS)
+        errors = [self.error(batcher.submit(item)) for item in ('boom', 'short')]
+        self.check('batch_fn error raised to callers', isinstance(errors[0], ValueError), errors)
+        self.check('short result list raised to callers', isinstance(errors[1], RuntimeError), errors)
+        self.check('worker survives', batcher.submit('ok').result(5) == 'ok')
+
+    @staticmethod
+    def error(future) -> BaseException:
+        try:
+            future.result(5)
+        except Exception as e:
+            return e
+        return None
+
+    def test_worker_after_fork(self):
+        """A forked child gets a new queue and worker thread"""
+        if not hasattr(os, 'fork'):
+            print("  [SKIP] fork not available")
+            return
+        batcher = MicroBatcher(lambda items: [item + 1 for item in items], max_wait_ms=1)
+        self.check('parent result', batcher.submit(1).result(5) == 2)
+        pid = os.fork()
+        if pid == 0:
+            try:
+                ok = batcher.submit(41).result(5) == 42 and batcher._worker_pid == os.getpid()
+            except BaseException:
+                ok = False
+            os._exit(0 if ok else 1)
+        _, status = os.waitpid(pid, 0)
+        self.check('child restarts the worker', os.WEXITSTATUS(status) == 0, status)
+        self.check('parent worker untouched', batcher.submit(2).result(5) == 3)
+
+    def analyzer(self, **env: str) -> SentimentAnalyzer:
+        """Analyzer on CountingModel and its own cache, built under env overrides"""
+        saved = {name: os.environ.get(name) for name in env}
+        os.environ.update(env)
+        try:
+            analyzer = SentimentAnalyzer()
+        finally:
+            for name, value in saved.items():
+                if value is None:
+                    os.environ.pop(name, None)
+                else:
+                    os.environ[name] = value
+        analyzer.model = CountingModel()
+        analyzer.cache = SentimentCache()
+        return analyzer
+
+    def test_analyzer_batching(self):
+        """Concurrent analyze() calls reach the model as one batch and are cached"""
+        analyzer = self.analyzer(SENTIMENT_BATCHING='1')
+        analyzer.batcher.max_wait = WAIT_MS / 1000.0
+        texts = [f'posting number {i}' + '!' * i for i in range(6)]
+        results = self.concurrently(analyzer.analyze, texts)
+        self.check('one model call for concurrent analyze()', analyzer.model.calls == [6], analyzer.model.calls)
+        self.check('every caller answered', all(r and r['label'] in ('POSITIVE', 'NEGATIVE') for r in results),
+                   results)
+        analyzer.analyze(texts[0])
+        self.check('repeat served from cache', analyzer.model.calls == [6] and analyzer.cache.hits == 1,
+                   analyzer.model.calls)
+
+    def test_byte_budget(self):
+        """The memory tier evicts least recently used entries past max_bytes"""
+        value = {'label': 'POSITIVE', 'score': 0.9, 'sentiment_class': 1}
+        keys = [SentimentCache.make_key(f'text {i}', 'v1') for i in range(4)]
+        entry_bytes = len(keys[0]) + len('{"label": "POSITIVE", "score": 0.9, "sentiment_class": 1}') \
+            + _ENTRY_OVERHEAD_BYTES
+        cache = SentimentCache(max_bytes=3 * entry_bytes)
+        for key in keys[:3]:
+            cache.set(key, value)
+        cache.get(keys[0])
+        cache.set(keys[3], value)
+        stats = cache.stats()
+        self.check('held within max_bytes', stats['bytes'] <= stats['max_bytes'] and stats['entries'] == 3, stats)
+        self.check('least recently used evicted',
+                   [cache.get(key) is not None for key in keys] == [True, False, True, True])
+
+        cache.set(SentimentCache.make_key('huge', 'v1'), {'label': 'x' * (3 * entry_bytes)})
+        self.check('entry over the budget not stored', cache.stats()['entries'] == 3, cache.stats())
+        returned = cache.get(keys[0])
+        returned['label'] = 'CHANGED'
+        self.check('callers get copies', cache.get(keys[0])['label'] == 'POSITIVE')
+        self.check('zero budget keeps nothing in memory',
+                   self.stored(SentimentCache(max_bytes=0), keys[0], value) is None)
+
+    @staticmethod
+    def stored(cache: SentimentCache, key: str, value: dict):
+        cache.set(key, value)
+        return cache.get(key)
+
+    def test_model_version(self):
+        """A new model version misses, even with a shared cache"""
+        text = 'Earn money from home, pay a registration fee first'
+        self.check('keys differ by version',
+                   SentimentCache.make_key(text, 'torch:a:fp32') != SentimentCache.make_key(text, 'onnx:a:int8'))
+
+        mean = self.analyzer(SENTIMENT_AGGREGATION='mean', SENTIMENT_BATCHING='0')
+        mean.analyze(text)
+        same = self.analyzer(SENTIMENT_AGGREGATION='mean', SENTIMENT_BATCHING='0')
+        same.cache = mean.cache
+        same.analyze(text)
+        self.check('same version hits', same.model.calls == [], same.model.calls)
+
+        changed = self.analyzer(SENTIMENT_AGGREGATION='min', SENTIMENT_BATCHING='0')
+        changed.cache = mean.cache
+        changed.analyze(text)
+        self.check('aggregation is part of the version', changed.model_version != mean.model_version)
+        self.check('changed version misses', changed.model.calls == [1], changed.model.calls)
+
+    def test_sqlite_tier(self):
+        """Results written by one process's cache are read back by another's"""
+        db_path = os.path.join(self.directory, 'sentiment.sqlite3')
+        key, value = SentimentCache.make_key('text', 'v1'), {'label': 'NEGATIVE', 'score': 0.7}
+        SentimentCache(db_path=db_path).set(key, value)
+        other = SentimentCache(db_path=db_path)
+        self.check('read from SQLite', other.get(key) == value and other.disk_hits == 1, other.stats())
+        other.get(key)
+        self.check('then from memory', other.hits == 1 and other.disk_hits == 1, other.stats())
+
+    def test_sqlite_pruning(self):
+        """Rows of other model versions and the oldest rows past db_max_bytes are pruned"""
+        db_path = os.path.join(self.directory, 'pruned.sqlite3')
+        value = {'label': 'POSITIVE', 'score': 0.9}
+        old_cache = SentimentCache(max_bytes=0, db_path=db_path)
+        old_key = SentimentCache.make_key('text', 'v1')
+        old_cache.set(old_key, value, 'v1')
+
+        row_bytes = len(old_key) + len(json.dumps(value)) + _ENTRY_OVERHEAD_BYTES
+        cache = SentimentCache(max_bytes=0, db_path=db_path, db_max_bytes=2 * row_bytes)
+        cache.purge_interval = 0.0
+        keys = [SentimentCache.make_key(f'text {i}', 'v2') for i in range(3)]
+        for key in keys:
+            cache.set(key, value, 'v2')
+            time.sleep(0.01)
+        self.check('old model version pruned', cache.get(old_key) is None)
+        self.check('oldest rows past the budget pruned',
+                   [cache.get(key) is not None for key in keys] == [False, True, True])
+
+    def test_sqlite_off_lock(self):
+        """A slow SQLite write does not hold up memory-tier lookups"""
+        cache = SentimentCache(db_path=os.path.join(self.directory, 'locked.sqlite3'))
+        key, value = SentimentCache.make_key('cached', 'v1'), {'label': 'POSITIVE', 'score': 0.9}
+        cache.set(key, value, 'v1')
+        cache._db_lock.acquire()
+        try:
+            writer = threading.Thread(target=cache.set, args=(SentimentCache.make_key('new', 'v1'), value, 'v1'))
+            writer.start()
+            reader = threading.Thread(target=cache.get, args=(key,))
+            reader.start()
+            reader.join(timeout=1.0)
+            self.check('memory hit during a blocked write', not reader.is_alive())
+        finally:
+            cache._db_lock.release()
+            writer.join()
+
+
+def main():
+    """Main entry point"""
+    validator = SentimentBatchingValidator()
+    sys.exit(0 if validator.run_all_tests() else 1)
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,264 @@
+#!/usr/bin/env python
+# ========================
+# CREDIBILITY STAGE TEST SCRIPT
+# ========================
+
+import asyncio
+import copy
+import sys
+import os
+import threading
+import time
+from typing import Any, Callable, Dict, Tuple
+
+# Add backend to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from services import credibility_engine
+from services.credibility_engine import CredibilityEngine, STAGE_FALLBACKS, _StagePool
+from tests.test_datasets import test_cases
+
+# Short budgets so the checks run in about a second
+DEADLINES = {
+    'dataset_validation': 0.2,
+    'company_verification': 0.4,
+    'url_features': 0.3,
+    'sentiment': 0.3
+}
+# Scheduling slack allowed on top of a budget
+SLACK = 0.15
+
+
+class StageRunnerValidator:
+    """Checks CredibilityEngine._run_stages deadlines, fallbacks and statuses"""
+
+    def __init__(self):
+        self.failures = []
+        self.checked = 0
+        # Released at the end so stages left blocking do not outlive the script
+        self.release = threading.Event()
+
+    def run_all_tests(self) -> bool:
+        """Run every check and print a summary"""
+        print("\n" + "="*80)
+        print("CREDIBILITY STAGE VALIDATION")
+        print("="*80)
+
+        try:
+            self.test_statuses()
+            self.test_latency_bound()
+            self.test_sequential()
+            self.test_queued_stage_times_out()
+            self.test_late_stages_detached()
+            self.test_batch_waves()
+            self.test_async_batch_cap()
+            self.test_malformed_batch_posting()
+        finally:
+            self.release.set()
+
+        print(f"\nChecks run: {self.checked}")
+        if self.failures:
+            print(f"FAILED: {len(self.failures)}")
+            for name, detail in self.failures:
+                print(f"  [{name}] {detail}")
+        else:
+            print("All stages met their deadlines and fallbacks")
+        print("="*80 + "\n")
+        return not self.failures
+
+    def check(self, name: str, passed: bool, detail: Any = None):
+        """Record one check"""
+        self.checked += 1
+        status = "PASS" if passed else "FAIL"
+        print(f"  [{status}] {name}")
+        if not passed:
+            self.failures.append((name, detail))
+
+    def engine(self, concurrent: bool = True) -> CredibilityEngine:
+        engine = CredibilityEngine()
+        engine.concurrent_stages = concurrent
+        engine.stage_deadlines = dict(DEADLINES)
+        return engine
+
+    def sleeper(self, seconds: float, result: dict) -> Callable[[], dict]:
+        """Stage that returns result after seconds, or when the script ends"""
+        def stage():
+            self.release.wait(seconds)
+            return result
+        return stage
+
+    @staticmethod
+    def failing() -> dict:
+        raise RuntimeError('stage failed')
+
+    def timed(self, engine: CredibilityEngine,
+              stages: Dict[str, Tuple[Callable[[], dict], str]], **kwargs) -> Tuple[dict, dict, float]:
+        began = time.monotonic()
+        results, status = engine._run_stages(stages, **kwargs)
+        return results, status, time.monotonic() - began
+
+    def test_statuses(self):
+        """ok, error and timed_out stages, each with its result or fallback, in stage order"""
+        stages = {
+            'url': (self.sleeper(10, {'url_score': 0.9}), 'url_features'),
+            'dataset': (self.failing, 'dataset_validation'),
+            'sentiment': (lambda: {'sentiment_score': 0.8}, 'sentiment'),
+        }
+        results, status, elapsed = self.timed(self.engine(), stages)
+        self.check('statuses', status == {'url': 'timed_out', 'dataset': 'error', 'sentiment': 'ok'}, status)
+        self.check('late stage gets its fallback', results['url'] == STAGE_FALLBACKS['url_features'], results)
+        self.check('failed stage gets its fallback',
+                   results['dataset'] == STAGE_FALLBACKS['dataset_validation'], results)
+        self.check('finished stage keeps its result', results['sentiment'] == {'sentiment_score': 0.8}, results)
+        self.check('results in stage order', list(results) == list(stages) == list(status), list(results))
+        self.check('late stage cut at its deadline',
+                   DEADLINES['url_features'] <= elapsed < DEADLINES['url_features'] + SLACK, f'{elapsed:.3f}s')
+
+    def test_latency_bound(self):
+        """Concurrent stages cost the largest budget, not the sum"""
+        stages = {
+            name: (self.sleeper(10, {}), stage_type) for name, stage_type in
+            [('dataset', 'dataset_validation'), ('company', 'company_verification'),
+             ('url', 'url_features'), ('sentiment', 'sentiment')]
+        }
+        _, status, elapsed = self.timed(self.engine(), stages)
+        largest = max(DEADLINES.values())
+        self.check('every slow stage timed out', set(status.values()) == {'timed_out'}, status)
+        self.check('bounded by the largest budget', elapsed < largest + SLACK,
+                   f'{elapsed:.3f}s for budgets summing to {sum(DEADLINES.values()):.1f}s')
+
+    def test_sequential(self):
+        """With concurrency off, stages run in turn and only failures fall back"""
+        stages = {
+            'dataset': (self.failing, 'dataset_validation'),
+            'url': (self.sleeper(0.05, {'url_score': 0.4}), 'url_features'),
+        }
+        results, status, _ = self.timed(self.engine(concurrent=False), stages)
+        self.check('sequential statuses', status == {'dataset': 'error', 'url': 'ok'}, status)
+        self.check('sequential results',
+                   results == {'dataset': STAGE_FALLBACKS['dataset_validation'], 'url': {'url_score': 0.4}},
+                   results)
+
+    def with_pool(self, pool: _StagePool, test: Callable[[], None]):
+        """Run test with pool as the engine's stage pool"""
+        saved = credibility_engine._stage_pool
+        credibility_engine._stage_pool = pool
+        try:
+            test()
+        finally:
+            credibility_engine._stage_pool = saved
+
+    def test_queued_stage_times_out(self):
+        """A stage queued behind a full pool times out on schedule and never runs"""
+        def test():
+            engine = self.engine()
+            engine.stage_deadlines.update(company_verification=0.2, url_features=0.4)
+            ran = threading.Event()
+            stages = {
+                'company_a': (self.sleeper(10, {}), 'company_verification'),
+                'company_b': (self.sleeper(10, {}), 'company_verification'),
+                'url': (lambda: ran.set() or {'url_score': 1.0}, 'url_features'),
+            }
+            _, status, elapsed = self.timed(engine, stages)
+            self.check('queued stage timed out', status['url'] == 'timed_out', status)
+            self.check('queued stage cut at the call limit', 0.4 <= elapsed < 0.4 + SLACK, f'{elapsed:.3f}s')
+            # The pool is still full: a later call's stage waits in the queue
+            _, status, elapsed = self.timed(engine, {'url': stages['url']})
+            self.check('later call times out on schedule',
+                       status['url'] == 'timed_out' and elapsed < 0.4 + SLACK, f'{status} in {elapsed:.3f}s')
+            self.check('cancelled stages never ran', not ran.wait(0.1))
+
+        # No detaching, so the two slow stages keep both threads
+        self.with_pool(_StagePool(2, max_detached=0), test)
+
+    def test_late_stages_detached(self):
+        """Late stages give up their threads, so queued ones still run"""
+        def test():
+            engine = self.engine()
+            engine.stage_deadlines.update(company_verification=0.2, url_features=0.4)
+            stages = {
+                'company_a': (self.sleeper(10, {}), 'company_verification'),
+                'company_b': (self.sleeper(10, {}), 'company_verification'),
+                'url': (self.sleeper(0.05, {'url_score': 1.0}), 'url_features'),
+            }
+            results, status, elapsed = self.timed(engine, stages)
+            self.check('queued stage ran after the late ones were detached',
+                       status == {'company_a': 'timed_out', 'company_b': 'timed_out', 'url': 'ok'}
+                       and results['url'] == {'url_score': 1.0}, status)
+            self.check('within the call limit', elapsed < 0.4, f'{elapsed:.3f}s')
+            _, status, elapsed = self.timed(engine, {'url': stages['url']})
+            self.check('later call is not starved', status['url'] == 'ok' and elapsed < 0.2,
+                       f'{status} in {elapsed:.3f}s')
+
+        self.with_pool(_StagePool(2), test)
+
+    def test_batch_waves(self):
+        """max_in_flight stages at a time, each wave within its budget"""
+        def test():
+            stages = {f'company_{i}': (self.sleeper(0.05, {'i': i}), 'company_verification') for i in range(40)}
+            results, status, elapsed = self.timed(self.engine(), stages, max_in_flight=8)
+            self.check('every batched stage ok', set(status.values()) == {'ok'}, status)
+            self.check('batched results in order', [r['i'] for r in results.values()] == list(range(40)))
+            self.check('batched stages overlap', elapsed < 40 * 0.05 / 4, f'{elapsed:.3f}s')
+
+        self.with_pool(_StagePool(16), test)
+
+    def test_async_batch_cap(self):
+        """analyze_batch_async verifies at most batch_company_stages companies at a time"""
+        engine = self.engine()
+        engine.batch_company_stages = 3
+        running, peak = [0], [0]
+
+        async def verify(company_name, website):
+            running[0] += 1
+            peak[0] = max(peak[0], running[0])
+            await asyncio.sleep(0.01)
+            running[0] -= 1
+            return {'company': company_name}, 'ok'
+
+        def chunk(postings, company_stages):
+            return [company_stages for _ in postings]
+
+        engine._run_company_stage_async = verify
+        engine._analyze_chunk = chunk
+        postings = [{'companyName': f'Company {i}', 'jobDescription': 'Paid internship, apply online'}
+                    for i in range(10)]
+
+        async def collect():
+            return [result async for result in engine.analyze_batch_async(postings)]
+
+        results = asyncio.run(collect())
+        self.check('every company verified', len(results) == 10 and len(results[0]) == 10, results[:1])
+        self.check('company stages capped', peak[0] == 3, peak[0])
+
+    def test_malformed_batch_posting(self):
+        """A malformed posting gets analyze()'s error result; the rest of the batch is scored"""
+        engine = self.engine()
+        fallback = STAGE_FALLBACKS['company_verification']
+        engine._run_company_stage = lambda company_name, website: copy.deepcopy(fallback)
+
+        async def verify(company_name, website):
+            return copy.deepcopy(fallback), 'ok'
+
+        engine._run_company_stage_async = verify
+        good = [dict(case) for case in list(test_cases.values())[:2]]
+        postings = [good[0], {'companyName': 'Acme', 'parsed': 'x'}, good[1]]
+
+        async def collect():
+            return [result async for result in engine.analyze_batch_async(postings)]
+
+        for name, results in (('sync', list(engine.analyze_batch(postings))), ('async', asyncio.run(collect()))):
+            levels = [result.get('credibility_level') for result in results]
+            self.check(f'{name}: malformed posting errors alone',
+                       len(results) == 3 and levels[1] == 'ERROR' and 'error' in results[1], levels)
+            self.check(f'{name}: other postings scored',
+                       all(level not in (None, 'ERROR') for level in (levels[0], levels[2])), levels)
+
+
+def main():
+    """Main entry point"""
+    validator = StageRunnerValidator()
+    sys.exit(0 if validator.run_all_tests() else 1)
+
+if __name__ == '__main__':
+    main()
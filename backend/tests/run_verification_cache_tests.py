@@ -0,0 +1,229 @@
+#!/usr/bin/env python
+# ========================
+# VERIFICATION CACHE TEST SCRIPT
+# ========================
+
+import sys
+import os
+import shutil
+import sqlite3
+import tempfile
+import threading
+import time
+from typing import Any
+
+# Add backend to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from services import verification_cache
+from services.verification_cache import VerificationCache
+from tests.run_cse_budget_tests import FakeClock
+
+SAFE = {'verdict': 'SAFE', 'risk_score': 0.1, 'flags': []}
+SCAM = {'verdict': 'HIGH_RISK', 'risk_score': 0.9, 'flags': ['reported as a scam']}
+
+
+class VerificationCacheValidator:
+    """Checks VerificationCache freshness, refreshes and SQLite persistence on a fake clock"""
+
+    def __init__(self):
+        self.failures = []
+        self.checked = 0
+        self.directory = tempfile.mkdtemp(prefix='verification_cache_tests_')
+        self.clock = FakeClock(1_800_000_000)
+
+    def run_all_tests(self) -> bool:
+        """Run every check and print a summary"""
+        print("\n" + "="*80)
+        print("VERIFICATION CACHE VALIDATION")
+        print("="*80)
+
+        saved = verification_cache.time
+        verification_cache.time = self.clock
+        try:
+            self.test_freshness()
+            self.test_lru()
+            self.test_refresh_once()
+            self.test_sqlite_round_trip()
+            self.test_purge()
+            self.test_sqlite_off_lock()
+        finally:
+            verification_cache.time = saved
+            shutil.rmtree(self.directory, ignore_errors=True)
+
+        print(f"\nChecks run: {self.checked}")
+        if self.failures:
+            print(f"FAILED: {len(self.failures)}")
+            for name, detail in self.failures:
+                print(f"  [{name}] {detail}")
+        else:
+            print("Cache states, refreshes and persistence behave as documented")
+        print("="*80 + "\n")
+        return not self.failures
+
+    def check(self, name: str, passed: bool, detail: Any = None):
+        """Record one check"""
+        self.checked += 1
+        status = "PASS" if passed else "FAIL"
+        print(f"  [{status}] {name}")
+        if not passed:
+            self.failures.append((name, detail))
+
+    def cache(self, name: str = None, **kwargs) -> VerificationCache:
+        """Cache with short TTLs, on SQLite file name if given"""
+        settings = dict(positive_ttl=100, negative_ttl=10, stale_ttl=50)
+        settings.update(kwargs)
+        db_path = os.path.join(self.directory, f'{name}.sqlite3') if name else None
+        return VerificationCache(db_path=db_path, **settings)
+
+    def rows(self, name: str) -> int:
+        """Rows in a cache's SQLite file, read outside the cache"""
+        with sqlite3.connect(os.path.join(self.directory, f'{name}.sqlite3')) as db:
+            return db.execute('SELECT COUNT(*) FROM verification_cache').fetchone()[0]
+
+    def test_freshness(self):
+        """Fresh within the TTL, stale for stale_ttl after it, then a miss"""
+        cache = self.cache()
+        self.check('unknown key misses', cache.get('acme|') == (None, 'miss'))
+        cache.set('acme|', SAFE, positive=True)
+        cache.set('scamco|', SCAM, positive=False)
+
+        self.clock.advance(10)
+        self.check('positive fresh within its TTL', cache.get('acme|') == (SAFE, 'fresh'))
+        self.check('negative fresh up to its TTL', cache.get('scamco|') == (SCAM, 'fresh'))
+        self.clock.advance(1)
+        self.check('negative stale past its TTL', cache.get('scamco|') == (SCAM, 'stale'))
+        self.check('positive still fresh', cache.get('acme|')[1] == 'fresh')
+
+        self.clock.advance(50)
+        self.check('negative miss past the stale window', cache.get('scamco|') == (None, 'miss'))
+        self.clock.advance(40)
+        self.check('positive stale past its TTL', cache.get('acme|') == (SAFE, 'stale'))
+        self.clock.advance(50)
+        self.check('positive miss past the stale window', cache.get('acme|') == (None, 'miss'))
+
+        stats = cache.stats()
+        self.check('counters', (stats['hits'], stats['stale_hits'], stats['misses']) == (3, 2, 3), stats)
+        self.check('expired entries dropped', stats['entries'] == 0, stats)
+
+    def test_lru(self):
+        """Past max_entries the least recently used entry goes"""
+        cache = self.cache(max_entries=2)
+        cache.set('a|', SAFE, positive=True)
+        cache.set('b|', SAFE, positive=True)
+        cache.get('a|')
+        cache.set('c|', SAFE, positive=True)
+        self.check('least recently used evicted',
+                   [cache.get(key)[1] for key in ('a|', 'b|', 'c|')] == ['fresh', 'miss', 'fresh'])
+
+    def test_refresh_once(self):
+        """Concurrent refreshes of one key run the loader once; other keys are not held up"""
+        cache = self.cache()
+        cache.set('acme|', SAFE, positive=True)
+        self.clock.advance(120)
+
+        release = threading.Event()
+        calls = {'acme|': 0, 'other|': 0}
+        lock = threading.Lock()
+
+        def loader(key, value):
+            def load():
+                with lock:
+                    calls[key] += 1
+                release.wait(5)
+                return value, True
+            return load
+
+        refreshed = {**SAFE, 'risk_score': 0.05}
+        for _ in range(5):
+            cache.refresh_async('acme|', loader('acme|', refreshed))
+        cache.refresh_async('other|', loader('other|', SAFE))
+        self.wait_for(lambda: calls['other|'] == 1)
+        self.check('one loader per key', calls == {'acme|': 1, 'other|': 1}, calls)
+        self.check('stale value served meanwhile', cache.get('acme|') == (SAFE, 'stale'))
+
+        release.set()
+        self.wait_for(lambda: not cache._refreshing)
+        self.check('refreshed value is fresh', cache.get('acme|') == (refreshed, 'fresh'))
+
+        cache.refresh_async('acme|', loader('acme|', refreshed))
+        self.wait_for(lambda: not cache._refreshing)
+        self.check('key refreshable again once done', calls['acme|'] == 2, calls)
+
+        def failing():
+            raise RuntimeError('search down')
+        cache.refresh_async('failing|', failing)
+        self.wait_for(lambda: not cache._refreshing)
+        self.check('failed refresh caches nothing and frees the key',
+                   cache.get('failing|') == (None, 'miss') and 'failing|' not in cache._refreshing)
+
+    @staticmethod
+    def wait_for(condition, timeout: float = 5.0):
+        """Poll for background refresh threads, which run on the real clock"""
+        deadline = time.monotonic() + timeout
+        while not condition() and time.monotonic() < deadline:
+            time.sleep(0.005)
+
+    def test_sqlite_round_trip(self):
+        """Entries survive a restart with their value, age and TTL"""
+        cache = self.cache('round_trip')
+        cache.set('acme|acme.com', SAFE, positive=True)
+        cache.set('scamco|', SCAM, positive=False)
+        self.check('persistent', cache.persistent)
+
+        self.clock.advance(20)
+        restarted = self.cache('round_trip')
+        self.check('value read back from SQLite', restarted.get('acme|acme.com') == (SAFE, 'fresh'))
+        self.check('negative TTL kept', restarted.get('scamco|') == (SCAM, 'stale'))
+        self.check('loaded into memory', restarted.stats()['entries'] == 2, restarted.stats())
+
+        restarted.set('acme|acme.com', SCAM, positive=False)
+        self.check('overwrite read back', self.cache('round_trip').get('acme|acme.com') == (SCAM, 'fresh'))
+
+        broken = self.cache(os.path.join('missing', '\0bad'))
+        self.check('unusable DB falls back to memory',
+                   not broken.persistent and broken.get('x|') == (None, 'miss'))
+
+    def test_purge(self):
+        """Rows past TTL and stale window are swept on open and every purge_interval on write"""
+        cache = self.cache('purge', positive_ttl=5000, negative_ttl=10, stale_ttl=50)
+        cache.purge_interval = 1000
+        cache.set('old|', SCAM, positive=False)
+        cache.set('kept|', SAFE, positive=True)
+
+        self.clock.advance(61)
+        cache.set('new|', SCAM, positive=False)
+        self.check('no sweep before purge_interval', self.rows('purge') == 3, self.rows('purge'))
+
+        self.clock.advance(1000)
+        cache.set('newer|', SCAM, positive=False)
+        self.check('sweep on write after purge_interval', self.rows('purge') == 2, self.rows('purge'))
+
+        self.clock.advance(100)
+        self.cache('purge', positive_ttl=5000, negative_ttl=10, stale_ttl=50)
+        self.check('sweep on open keeps live rows', self.rows('purge') == 1, self.rows('purge'))
+
+    def test_sqlite_off_lock(self):
+        """A slow SQLite write does not hold up memory-tier lookups"""
+        cache = self.cache('locked')
+        cache.set('acme|', SAFE, positive=True)
+        cache._db_lock.acquire()
+        try:
+            writer = threading.Thread(target=cache.set, args=('scamco|', SCAM, False))
+            writer.start()
+            reader = threading.Thread(target=cache.get, args=('acme|',))
+            reader.start()
+            reader.join(timeout=1.0)
+            self.check('memory hit during a blocked write', not reader.is_alive())
+        finally:
+            cache._db_lock.release()
+            writer.join()
+
+
+def main():
+    """Main entry point"""
+    validator = VerificationCacheValidator()
+    sys.exit(0 if validator.run_all_tests() else 1)
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,103 @@
+#!/usr/bin/env python
+# ========================
+# WEBSITE PROBER TEST SCRIPT
+# ========================
+
+import sys
+import os
+import time
+from typing import Any, Callable
+
+# Add backend to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from services.website_prober import WebsiteProber
+from tests.run_benchmarks import _stand_in_site
+
+
+class WebsiteProberValidator:
+    """Checks WebsiteProber results against a local stand-in site"""
+
+    def __init__(self, delay_ms: float = 20):
+        self.delay_ms = delay_ms
+        self.failures = []
+        self.checked = 0
+
+    def run_all_tests(self) -> bool:
+        """Run every check and print a summary"""
+        print("\n" + "="*80)
+        print("WEBSITE PROBER VALIDATION")
+        print("="*80)
+
+        with _stand_in_site(self.delay_ms) as site:
+            self.test_redirects(site)
+            self.test_head_fallback(site)
+            self.test_status_codes(site)
+            self.test_host_interval(site)
+
+        print(f"\nChecks run: {self.checked}")
+        if self.failures:
+            print(f"FAILED: {len(self.failures)}")
+            for name, detail in self.failures:
+                print(f"  [{name}] {detail}")
+        else:
+            print("All probe results match the stand-in site")
+        print("="*80 + "\n")
+        return not self.failures
+
+    def check(self, name: str, passed: bool, detail: Any):
+        """Record one check"""
+        self.checked += 1
+        status = "PASS" if passed else "FAIL"
+        print(f"  [{status}] {name}")
+        if not passed:
+            self.failures.append((name, detail))
+
+    def test_redirects(self, site: str):
+        """Redirect chains are followed, recorded and cached under the final host"""
+        prober = WebsiteProber(host_interval=0)
+        moved = prober.probe(f'{site}/moved')
+        self.check('redirect followed',
+                   moved['status_code'] == 200 and moved['final_url'] == f'{site}/ok', moved)
+        self.check('redirect hops recorded',
+                   [hop['status_code'] for hop in moved['redirects']] == [301], moved)
+        self.check('plain http has no TLS result and is not cached',
+                   moved['tls_valid'] is None and not moved['cached'], moved)
+        again = prober.probe(f'{site}/moved/elsewhere')
+        self.check('same host served from cache', again['cached'], again)
+
+    def test_head_fallback(self, site: str):
+        """Servers that reject HEAD are probed with GET"""
+        no_head = WebsiteProber(host_interval=0).probe(f'{site}/no-head')
+        self.check('GET fallback after 405',
+                   no_head['status_code'] == 200 and no_head['method'] == 'GET', no_head)
+
+    def test_status_codes(self, site: str):
+        """A 404 still means the site answered; a closed port does not"""
+        missing = WebsiteProber(host_interval=0).probe(f'{site}/missing')
+        self.check('404 is accessible',
+                   missing['accessible'] and missing['status_code'] == 404, missing)
+        down = WebsiteProber(host_interval=0, timeout=2).probe('http://127.0.0.1:9/')
+        self.check('closed port is not accessible',
+                   not down['accessible'] and bool(down['error']), down)
+
+    def test_host_interval(self, site: str):
+        """Probes of one host are spaced by host_interval"""
+        prober = WebsiteProber(host_interval=0.05, ttl=0, failure_ttl=0)
+        elapsed = self._elapsed(lambda: [prober.probe(f'{site}/ok') for _ in range(3)])
+        self.check('per-host interval applied', elapsed >= 0.1, f'{elapsed:.3f}s for 3 probes')
+
+    @staticmethod
+    def _elapsed(func: Callable) -> float:
+        began = time.perf_counter()
+        func()
+        return time.perf_counter() - began
+
+
+def main():
+    """Main entry point"""
+    validator = WebsiteProberValidator()
+    sys.exit(0 if validator.run_all_tests() else 1)
+
+if __name__ == '__main__':
+    main()